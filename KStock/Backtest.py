@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+from Board import Board
+
+#Seconds since midnight, Eastern
+OPENING = 9 * 3600 + 30 * 60
+TEN_FIFTEEN = 10 * 3600 + 15 * 60
+CLOSE_OUT = 15 * 3600 + 58 * 60
+
+
+class Backtest():
+    '''
+    Replays historical bars through the same buy/sell logic as Tick, for every symbol at once
+
+    Takes a frame shaped like gfc.get_prices_time_data() (a `SYM_Open`, `SYM_High`,
+    `SYM_Low`, `SYM_Close`, `SYM_Volume` column per symbol, one row per bar) and steps
+    through the bars in order. Each bar is one update cycle: the close is the current
+    price and the highest high of the day so far is Today's High. The counters of every
+    symbol are kept in the rows of a Board and stepped together, so the cost of a bar
+    barely depends on how many symbols there are.
+
+    Like MainWindow, the Price Swing strategy is used from 09:30 to 10:15, Short Trading
+    the rest of the day, and everything held is sold after 15:58. A symbol sold on a bar
+    goes back in the queue from the next bar. Unlike Tick, a sale on the sell reversal
+    resets the position the way a stop loss does, and symbols whose price is above
+    `purPrice` are never bought.
+
+    Args:
+        frame (pandas.DataFrame): bars, indexed by Eastern time (naive or tz-aware)
+        purPrice (float): how much to spend on each purchase
+        rebuy (bool): whether a sold symbol goes back in the queue
+
+    Attributes, once run():
+        trades (pandas.DataFrame): every closed trade
+        summary (pandas.DataFrame): trades, wins, profit, open profit and max drawdown per symbol
+    '''
+    def __init__(self, frame, purPrice = 1000, rebuy = True):
+        self.purPrice = purPrice
+        self.rebuy = rebuy
+        self.symbols = [col[:-len('_Close')] for col in frame.columns if col.endswith('_Close')]
+
+        index = frame.index
+        if index.tz is not None:
+            index = index.tz_convert('US/Eastern').tz_localize(None)
+        self.index = index
+
+        close = frame[[sym + '_Close' for sym in self.symbols]]
+        high = frame[[sym + '_High' for sym in self.symbols]]
+        high.columns = close.columns
+
+        self.close = close.to_numpy(dtype = float)
+        self.last = close.ffill().to_numpy(dtype = float)
+        #Today's High as the NASDAQ page would have shown it on each bar
+        self.todayHigh = high.groupby(index.normalize()).cummax().to_numpy(dtype = float)
+
+        seconds = index.hour * 3600 + index.minute * 60 + index.second
+        self.ps = np.asarray((OPENING < seconds) & (seconds < TEN_FIFTEEN))
+        self.closeOut = np.asarray(seconds > CLOSE_OUT)
+
+        self.trades, self.summary = None, None
+
+
+    def run(self):
+        '''
+        Steps every symbol through every bar
+
+        Args:
+            None
+
+        Returns:
+            (Backtest): itself, with trades and summary filled in
+        '''
+        n = len(self.symbols)
+        self._records = []
+
+        #One bare row per symbol, in the order of self.symbols
+        self.board = board = Board(max(n, 1))
+        for sym in self.symbols:
+            board.add()
+        self.held = np.zeros(board.capacity, dtype = bool)
+        self.active = np.ones(board.capacity, dtype = bool)
+        self.entry = np.zeros(board.capacity, dtype = int)
+
+        self.realized = np.zeros(board.capacity)
+        peak, drawdown = np.zeros(board.capacity), np.zeros(board.capacity)
+        fresh = np.zeros(board.capacity, dtype = bool)
+        self.price = np.full(board.capacity, np.nan)
+
+        for bar in range(len(self.index)):
+            C = self.close[bar]
+            board.C[:n] = C
+            board.TH[:n] = self.todayHigh[bar]
+            with np.errstate(invalid = 'ignore', divide = 'ignore'):
+                board.PQ[:n] = np.floor(self.purPrice / C)
+            self.price[:n] = self.last[bar]
+
+            fresh[:n] = ~np.isnan(C)
+            #Nothing gets bought once it's time to close out
+            valid = fresh & (self.held | (self.active & ~self.closeOut[bar]))
+
+            Q, AP = board.Q.copy(), board.AP.copy()
+            buys, sells = board.step('PS' if self.ps[bar] else 'ST', self.held, valid)
+
+            #Stop losses were closed by the board, the reversals are closed here
+            stopped = np.isnan(board.Q)
+            self._close(sells & stopped, bar, 'SL', Q, AP)
+            self._close(sells & ~stopped, bar, 'Reversal', Q, AP)
+            if self.closeOut[bar]:
+                self._close(self.held.copy(), bar, 'EOD', board.Q, board.AP)
+            self._open(buys, bar)
+
+            equity = self.realized + np.where(self.held, board.Q * (self.price - board.AP), 0)
+            np.maximum(peak, equity, out = peak)
+            np.maximum(drawdown, peak - equity, out = drawdown)
+
+        held = self.held[:n]
+        openProfit = np.where(held, board.Q[:n] * (self.last[-1] - board.AP[:n]), 0) if len(self.index) else np.zeros(n)
+        self.trades = pd.DataFrame(self._records, columns = [
+            'Symbol', 'Entry', 'EntryPrice', 'Exit', 'ExitPrice', 'Quantity', 'Profit', 'Reason'])
+        wins = self.trades[self.trades['Profit'] > 0].groupby('Symbol').size()
+        self.summary = pd.DataFrame({
+            'Trades' : self.trades.groupby('Symbol').size().reindex(self.symbols, fill_value = 0),
+            'Wins' : wins.reindex(self.symbols, fill_value = 0),
+            'Profit' : self.realized[:n],
+            'OpenProfit' : openProfit,
+            'MaxDrawdown' : drawdown[:n]
+        }, index = self.symbols)
+        del self._records
+
+        return self
+
+
+    def _open(self, buys, bar):
+        #Holds what the board bought, undoing purchases of 0 shares
+        board = self.board
+        broke = buys & ~(board.Q > 0)
+        board.Q[broke], board.AP[broke], board.SL[broke] = np.nan, np.nan, np.nan
+
+        bought = buys & ~broke
+        self.held[bought] = True
+        self.entry[bought] = bar
+
+
+    def _close(self, mask, bar, reason, Q, AP):
+        #Sells every position in the mask at the last known price
+        if not mask.any():
+            return
+        board = self.board
+        profit = Q[mask] * (self.price[mask] - AP[mask])
+        self.realized[mask] += profit
+
+        for i, p in zip(np.flatnonzero(mask), profit):
+            self._records.append((
+                self.symbols[i], self.index[self.entry[i]], AP[i], self.index[bar],
+                self.price[i], int(Q[i]), p, reason
+            ))
+
+        board.Q[mask], board.AP[mask], board.SL[mask] = np.nan, np.nan, np.nan
+        board.sellRev[mask] = 0
+        self.held[mask] = False
+        if not self.rebuy:
+            self.active[mask] = False
+
+
+def backtest(frame, purPrice = 1000, rebuy = True):
+    '''
+    Shortcut for Backtest(frame, purPrice, rebuy).run()
+
+    Returns:
+        (tuple): trades and summary DataFrames
+    '''
+    result = Backtest(frame, purPrice, rebuy).run()
+    return result.trades, result.summary
+
+
+if __name__ == '__main__':
+    import resources.gfc as gfc
+
+    queries = [{'q' : sym, 'x' : 'NASD'} for sym in ['NVDA', 'AMD', 'MU']]
+    trades, summary = backtest(gfc.get_prices_time_data(queries, '10d', 60))
+    print(trades)
+    print(summary)
@@ -0,0 +1,100 @@
+import logging, queue, threading
+
+
+class BatchWriter():
+    '''
+    Writes what's queued to it in batches, on a thread of its own
+
+    put() never blocks. The thread takes whatever has queued up, at least every
+    `interval` seconds, and hands it to _write() in one go. A batch that fails to be
+    written, whatever the error, is logged and dropped, the thread carries on with the
+    next one, so flush() and close() always return.
+
+    Subclasses implement _write(), and _open()/_close() for what has to be set up and
+    torn down on the writer's thread.
+
+    Args:
+        name (str): name of the thread, and of the writer in the logs
+        interval (float): max seconds an item waits before being written
+    '''
+    #What the items are called in the logs
+    ITEMS = 'records'
+
+    def __init__(self, name, interval = 1):
+        self.name = name
+        self.interval = interval
+        self.written = 0
+
+        self._queue = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target = self._run, name = name, daemon = True)
+        self._thread.start()
+
+
+    def put(self, item):
+        self._queue.put(item)
+
+
+    def flush(self):
+        #Blocks until everything put so far is written, or failed to be
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+    def _open(self):
+        pass
+
+
+    def _close(self):
+        pass
+
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+
+    def _run(self):
+        try:
+            self._open()
+        except Exception:
+            logging.exception('{} could not be opened'.format(self.name))
+
+        while True:
+            batch, events, stop = [], [], False
+            try:
+                item = self._queue.get(timeout = self.interval)
+                while True:
+                    if item is None:
+                        stop = True
+                    elif isinstance(item, threading.Event):
+                        events.append(item)
+                    else:
+                        batch.append(item)
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+
+            try:
+                if batch:
+                    self._write(batch)
+                    self.written += len(batch)
+            except Exception:
+                logging.exception('{} lost {} {}'.format(self.name, len(batch), self.ITEMS))
+            finally:
+                for event in events:
+                    event.set()
+
+            if stop:
+                try:
+                    self._close()
+                except Exception:
+                    logging.exception('{} could not be closed'.format(self.name))
+                return
@@ -0,0 +1,218 @@
+import numpy as np
+
+
+def stopLoss(price):
+    '''
+    Stop loss of a position bought at `price`, 10% under it to the cent
+
+    Always rounded with Python's round(), an array element by element: np.round scales
+    by 100 first and can land a cent off (119.55 gives 107.6 instead of 107.59), and a
+    Tick and its Board row have to stop out at the same price
+
+    Args:
+        price (float or numpy.ndarray): purchase price, or prices
+
+    Returns:
+        (float or numpy.ndarray): the stop loss of each
+    '''
+    if isinstance(price, np.ndarray):
+        return np.array([round(p - (p * 0.1), 2) for p in price.tolist()], dtype = float)
+    return round(price - (price * 0.1), 2)
+
+
+class BoardField():
+    '''
+    Attribute of a Tick that lives in a column of its Board once it's on one
+
+    Off the board the value is kept in the Tick's `_<name>` slot. On the board, a missing
+    value (None, '') is stored as NaN and given back as `empty`.
+
+    Args:
+        name (str): attribute name, also the board column
+        empty: what a missing value reads as
+        cast (type): type the value is read back as
+    '''
+    def __init__(self, name, empty = None, cast = float):
+        self.name = name
+        self.slot = '_' + name
+        self.empty = empty
+        self.cast = cast
+
+
+    def __get__(self, tick, owner):
+        if tick is None:
+            return self
+        board = tick._board
+        if board is None:
+            return getattr(tick, self.slot)
+        value = board.columns[self.name][tick._row]
+        return self.empty if value != value else self.cast(value)
+
+
+    def __set__(self, tick, value):
+        board = tick._board
+        if board is None:
+            setattr(tick, self.slot, value)
+        else:
+            board.columns[self.name][tick._row] = np.nan if value is None or value == '' else value
+
+
+class Board():
+    '''
+    Keeps the trading state of many Ticks in parallel arrays, one row per Tick: the
+    price, Today's High, the reversal counters, proposed quantity and the position
+
+    The Ticks on the board read and write their price, counters and position straight
+    from the arrays, so they still work everywhere a Tick is expected, while step()
+    runs the Tick.purchase/Tick.sell rules for every row at once.
+
+    Args:
+        capacity (int): rows to start with, doubles whenever it runs out
+    '''
+    COLUMNS = ('C', 'TH', 'pPrice', 'buyRev', 'sellRev', 'PQ', 'Q', 'AP', 'SL', 'prevProfit')
+
+    def __init__(self, capacity = 64):
+        self.capacity = capacity
+        self.columns = {name : np.full(capacity, np.nan) for name in self.COLUMNS}
+        self.ticks = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+
+
+    def __getattr__(self, name):
+        #board.C, board.Q... are the columns themselves
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+    def __len__(self):
+        return self.capacity - len(self._free)
+
+
+    def _grow(self):
+        old = self.capacity
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.full(self.capacity, np.nan)
+            grown[:old] = column
+            self.columns[name] = grown
+        self.ticks.extend([None] * old)
+        self._free.extend(range(self.capacity - 1, old - 1, -1))
+
+
+    def add(self, tick = None):
+        '''
+        Puts a Tick on the board, moving its state into the arrays
+
+        Args:
+            tick (Tick): Tick to add, or None for a bare row
+
+        Returns:
+            (int): row of the Tick
+        '''
+        if not self._free:
+            self._grow()
+        row = self._free.pop()
+        self.ticks[row] = tick
+        for column in self.columns.values():
+            column[row] = np.nan
+        for name in ('pPrice', 'buyRev', 'sellRev', 'PQ', 'prevProfit'):
+            self.columns[name][row] = 0
+
+        if tick is not None:
+            values = {name : getattr(tick, name) for name in tick._boardFields}
+            tick._board, tick._row = self, row
+            for name, value in values.items():
+                setattr(tick, name, value)
+        return row
+
+
+    def remove(self, tick):
+        '''
+        Takes a Tick off the board, moving its state back onto it
+
+        Args:
+            tick (Tick): Tick to remove
+
+        Returns:
+            None
+        '''
+        values = {name : getattr(tick, name) for name in tick._boardFields}
+        row = tick._row
+        tick._board, tick._row = None, None
+        for name, value in values.items():
+            setattr(tick, name, value)
+
+        self.ticks[row] = None
+        self._free.append(row)
+
+
+    def mask(self, ticks):
+        #Boolean mask of the rows of the Ticks
+        mask = np.zeros(self.capacity, dtype = bool)
+        mask[[tick._row for tick in ticks]] = True
+        return mask
+
+
+    def ticksAt(self, mask):
+        #Ticks of the rows set in the mask
+        return [self.ticks[row] for row in np.flatnonzero(mask)]
+
+
+    def step(self, tradeStrat, held, fresh):
+        '''
+        Runs Tick.sell on the held rows and Tick.purchase on the rest, all at once
+
+        Has the same side effects as the Tick methods: purchases open the position
+        and stop losses close it, while a sell reversal leaves it for Engine.sell
+
+        Args:
+            tradeStrat (str): current trade strategy
+            held (numpy.ndarray): mask of the rows being held
+            fresh (numpy.ndarray): mask of the rows updated this cycle, others are skipped
+
+        Returns:
+            (tuple): masks of the rows to buy and the rows to sell
+        '''
+        C, pPrice, Q, AP, SL = self.C, self.pPrice, self.Q, self.AP, self.SL
+        buyRev, sellRev = self.buyRev, self.sellRev
+
+        with np.errstate(invalid = 'ignore'):
+            #Tick.sell
+            h = held & fresh & (Q > 0)
+            stop = h & (C <= SL)
+            rising = h & ~stop & (C > AP)
+            down = rising & (C < pPrice)
+            up = rising & (C > pPrice)
+            sellRev[down] += 1
+            pPrice[up] = C[up]
+            sellRev[up] = 0
+            sells = stop | (h & (sellRev == 3))
+
+            self.prevProfit[stop] = Q[stop] * C[stop] - Q[stop] * AP[stop]
+            Q[stop], AP[stop], SL[stop] = np.nan, np.nan, np.nan
+            sellRev[stop] = 0
+
+            #Tick.purchase
+            q = ~held & fresh
+            if tradeStrat == 'PS':
+                q &= (self.TH - C) / C > 0.01
+            elif tradeStrat != 'ST':
+                q[:] = False
+
+            down = q & (C < pPrice)
+            up = q & (C > pPrice)
+            pPrice[down] = C[down]
+            buyRev[down] = 0
+            buyRev[up] += 1
+            if tradeStrat == 'PS':
+                pPrice[up] = C[up]
+            buys = q & (buyRev == (3 if tradeStrat == 'PS' else 2))
+
+            buyRev[buys] = 0
+            Q[buys] = self.PQ[buys]
+            AP[buys] = C[buys]
+            SL[buys] = stopLoss(C[buys])
+
+        return buys, sells
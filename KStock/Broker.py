@@ -0,0 +1,63 @@
+from requests.adapters import HTTPAdapter
+import logging, threading, time
+
+
+class PortfolioPoller(threading.Thread):
+    '''
+    Keeps a snapshot of the Robinhood portfolio fresh in the background
+
+    Polls portfolios() every `interval` seconds on its own thread and passes every new
+    snapshot to `onRefresh`, so readers only ever use the latest one and never wait on
+    the broker. A failed poll is logged and the previous snapshot kept.
+
+    Args:
+        trader (Robinhood): logged in client, its session gets a connection pool
+        onRefresh (function): called from this thread with every snapshot, the portfolio
+            dict plus 'time', when it was fetched
+        interval (float): seconds between polls
+    '''
+    def __init__(self, trader, onRefresh = None, interval = 5):
+        threading.Thread.__init__(self, name = 'PortfolioPoller', daemon = True)
+        self.trader = trader
+        self.onRefresh = onRefresh
+        self.interval = interval
+        self.snapshot = None
+        self._halt = threading.Event()
+
+        session = getattr(trader, 'session', None)
+        if session is not None:
+            adapter = HTTPAdapter(pool_connections = 1, pool_maxsize = 4)
+            session.mount('https://', adapter)
+
+
+    def refresh(self):
+        '''
+        Fetches a snapshot now, on the calling thread
+
+        Returns:
+            (dict): the snapshot, None if the fetch failed
+        '''
+        try:
+            snapshot = dict(self.trader.portfolios(), time = time.time())
+        except Exception as e:
+            logging.error('Portfolio not refreshed: {}'.format(e))
+            return None
+
+        #Swapped whole, readers never see half of one
+        self.snapshot = snapshot
+        if self.onRefresh is not None:
+            self.onRefresh(snapshot)
+        return snapshot
+
+
+    def run(self):
+        while not self._halt.is_set():
+            start = time.monotonic()
+            self.refresh()
+            self._halt.wait(max(0, self.interval - (time.monotonic() - start)))
+
+
+    def stop(self):
+        self._halt.set()
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,661 @@
+'''
+The trading loop, without any GUI
+
+MainWindow is one client of the Engine, it can just as well run on its own:
+    $ python Engine.py [config]
+
+The config is the same file the GUI writes (core.cfg by default), with an optional
+"Engine" section overriding SETTINGS, e.g.
+    {"API" : {"User" : "...", "Password" : "..."}, "Queue" : ["NVDA", "AMD"],
+     "Engine" : {"purPrice" : 500, "testing" : true}}
+'''
+import datetime, json, logging, sys, threading, time
+from collections import namedtuple
+import holidays, pytz
+from Tick import Tick, HISTORY
+from Board import Board, stopLoss
+from Quotes import QuoteEngine, QuoteCache
+from Journal import Journal
+from Ledger import Ledger
+from Scheduler import PollScheduler, NEAR_SL
+from Orders import OrderGateway, MockBroker
+from Broker import PortfolioPoller
+from Probes import SelfTest
+
+SETTINGS = {
+    'purPrice' : 1000,      #How much to spend on each purchase
+    'purLimit' : 1000,      #Non-margin that has to be left after a purchase
+    'margin' : 25000,       #Non-margin trading stops under
+    'rebuy' : True,         #Whether a sold ticker goes back in the queue
+    'testing' : True,       #Orders go to a mock broker and the margin isn't checked
+    'board' : False,        #Keeps the state of every Tick in a Board and steps them all at once
+    'journal' : True,       #Records every quote fetched to data/journal/<day>.bin
+    'ledger' : True,        #Records every buy and sell to data/ledger.db
+    'schedule' : True       #Polls each ticker at its own pace instead of all of them every update
+}
+#Seconds between updates, and between checks of what's due when scheduled
+UPDATE = 5
+POLL = 0.25
+#Seconds close() gives the queued orders to go out, the rest are failed
+CLOSE_WAIT = 2
+
+
+class Row(namedtuple('Row', ['T', 'C', 'PQ', 'Q', 'AP', 'SL', 'D', 'prevProfit', 'tick'])):
+    #What the tables show of a Tick at one point, `tick` is the Tick itself, to act on it
+    __slots__ = ()
+
+
+class Snapshot(namedtuple('Snapshot', ['seq', 'queue', 'holdings', 'profit', 'cost'])):
+    #Everything the tables show at one point, queue and holdings are tuples of Rows
+    __slots__ = ()
+
+
+def _row(tick):
+    return Row(tick.T, tick.C, tick.PQ, tick.Q, tick.AP, tick.SL, tick.D, tick.prevProfit, tick)
+
+
+class Engine():
+    '''
+    Holds the queue and holdings and runs the trading rules on them
+
+    Everything MainWindow shows comes from here and is announced to the listeners,
+    each called with an event name and its arguments, from whichever thread made the
+    change:
+        'added' (tick), 'removed' (tick), 'bought' (Row), 'sold' (Row, profit),
+        'rejected' (Row, side), 'trading' (bool), 'portfolio' (snapshot), 'warn' (key of the warning)
+
+    Buys and sells take effect as soon as their order is queued. An order the broker
+    rejects is undone once its Ack comes in: a failed buy goes back to the queue, a
+    failed sell back to the holdings, no longer traded automatically, since the shares
+    are still held. The ledger only records the orders that went through.
+
+    The Ticks and the lists only change under the engine's lock, which the GUI never
+    takes. Instead, every change ends with publish(), which copies what the tables show
+    into an immutable Snapshot and swaps it in as `snapshot`. Readers take the reference
+    once and get a consistent view without locking, however long they hold on to it.
+
+    update() runs every UPDATE seconds: picks the strategy, stops trading after hours
+    or under the margin and closes out at the end of the day. cycle() polls tickers
+    and buys or sells them, on every ticker each update or on the due ones if scheduled.
+
+    Args:
+        settings (dict): overrides of SETTINGS
+    '''
+    def __init__(self, settings = None):
+        settings = dict(SETTINGS, **(settings or {}))
+        self.purPrice = settings['purPrice']
+        self.purLimit = settings['purLimit']
+        self.margin = settings['margin']
+        self.rebuy = settings['rebuy']
+        self.testing = settings['testing']
+
+        self.trading = False
+        #Names of the failed connection probes, trading can't start while there are any
+        self.faults = set()
+        self.currStrat = 'ST'
+        #Kept as the same lists for good, the GUI models hold them
+        self.qTicks, self.hTicks = [], []
+        self.profit, self.cost = 0.0, 0.0
+        self.listeners = []
+        self.tz = pytz.timezone('US/Eastern')
+
+        self.trader, self.portfolio = None, None
+        self.broker, self.orders = None, None
+
+        self.journal = Journal() if settings['journal'] else None
+        #The engine's own cache, its TTL depends on how the engine polls
+        self.cache = QuoteCache(journal = self.journal)
+        #Fetches the quotes of every ticker concurrently, once per cycle
+        self.quotes = QuoteEngine(cache = self.cache)
+        #Written in the background, a cycle never waits on it
+        self.ledger = Ledger() if settings['ledger'] else None
+        self.scheduler = None
+        if settings['schedule']:
+            self.scheduler = PollScheduler()
+            #Quotes can't outlive the fastest cadence
+            self.cache.ttl = min(self.cache.ttl, NEAR_SL / 2)
+        self.board = Board() if settings['board'] else None
+        #The Ticks and lists are changed by the cycles and update(), one at a time
+        self._lock = threading.RLock()
+        self._rows = {}
+        self.snapshot = Snapshot(0, (), (), 0.0, 0.0)
+        #Ticks sold before the rejection of their buy came in
+        self._phantoms = set()
+
+
+    def emit(self, event, *args):
+        for listener in self.listeners:
+            listener(event, *args)
+
+
+    def publish(self, ticks = None):
+        '''
+        Swaps in a new Snapshot of the queue and holdings, the previous one is left as it
+        was for whoever still reads it
+
+        Args:
+            ticks (list): Ticks that changed since the last one, their Rows are rebuilt and
+                the rest reused. Every Tick changed if None
+
+        Returns:
+            (Snapshot): the new snapshot
+        '''
+        with self._lock:
+            old = self._rows
+            changed = set(ticks) if ticks is not None else None
+            rows = {}
+            for tick in self.qTicks + self.hTicks:
+                row = old.get(tick) if changed is not None and tick not in changed else None
+                rows[tick] = row if row is not None else _row(tick)
+            self._rows = rows
+            self.snapshot = Snapshot(self.snapshot.seq + 1, tuple(rows[tick] for tick in self.qTicks),
+                tuple(rows[tick] for tick in self.hTicks), self.profit, self.cost)
+            return self.snapshot
+
+
+    def setTrader(self, trader):
+        '''
+        Uses a logged in Robinhood client from now on: starts keeping the portfolio fresh
+        and sends the orders to it (to a mock broker when testing)
+
+        Args:
+            trader (Robinhood): logged in client, None for none
+
+        Returns:
+            None
+        '''
+        self.close()
+        self.trader = trader
+        self.orders = OrderGateway(MockBroker() if self.testing else trader, onAck = self.orderAck)
+        if trader is not None:
+            self.broker = PortfolioPoller(trader, self.setPortfolio, UPDATE)
+            #The first snapshot is waited for so there's something to show
+            self.broker.refresh()
+            self.broker.start()
+
+
+    def setPortfolio(self, snapshot):
+        self.portfolio = snapshot
+        self.emit('portfolio', snapshot)
+
+
+    def withdrawable(self):
+        #Non-margin amount, None until the portfolio is known
+        return float(self.portfolio['withdrawable_amount']) if self.portfolio else None
+
+
+    def orderAck(self, ack):
+        #Called from the gateway's threads once the broker answered an order, failures are logged there
+        if ack.ok:
+            logging.info('Order {} {} {} at {} placed in {:.2f}s'.format(
+                ack.order.side, ack.order.quantity, ack.order.symbol, ack.order.price, ack.latency))
+
+
+    def _bought(self, tick, row, ack):
+        #Settles a buy once its order is answered, undoing it if the broker rejected it
+        if ack.ok:
+            if self.ledger is not None:
+                self.ledger.bought(row.T, row.Q, row.AP)
+            return
+
+        with self._lock:
+            if tick in self.hTicks and tick.Q == row.Q and tick.AP == row.AP:
+                self.hTicks.remove(tick)
+                self.qTicks.append(tick)
+                self.cost += row.Q * row.AP
+                tick.Q, tick.AP, tick.SL = None, None, None
+                tick.sellRev = 0
+                self.publish([tick])
+            else:
+                #Sold since, on shares that were never bought, the sell is undone once it fails too
+                self.cost += row.Q * row.AP
+                self._phantoms.add(tick)
+                self.publish([])
+        logging.error('Buy of {} {} rejected, back in the queue'.format(row.Q, row.T))
+        self.emit('rejected', row, 'buy')
+
+
+    def _sold(self, tick, row, position, profit, ack):
+        #Settles a sell once its order is answered, putting the position back if the broker rejected it
+        Q, AP, SL = position
+        if ack.ok:
+            if self.ledger is not None:
+                self.ledger.sold(row.T, Q, row.C, profit)
+            return
+
+        with self._lock:
+            if tick in self._phantoms:
+                self._phantoms.discard(tick)
+                self.profit -= profit
+                self.cost -= Q * row.C
+                self.publish([])
+            elif tick not in self.hTicks and not tick.Q:
+                if tick in self.qTicks:
+                    self.qTicks.remove(tick)
+                else:
+                    if self.board is not None:
+                        self.board.add(tick)
+                    if self.scheduler is not None:
+                        self.scheduler.add(tick)
+                self.hTicks.append(tick)
+                tick.Q, tick.AP, tick.SL = Q, AP, SL if SL is not None else stopLoss(AP)
+                #The shares are still held, they're left for a manual sell
+                tick.tradeable = False
+                self.profit -= profit
+                self.cost -= Q * row.C
+                self.publish([tick])
+        logging.error('Sell of {} {} rejected, back in the holdings and no longer traded'.format(Q, row.T))
+        self.emit('rejected', row, 'sell')
+
+
+    def add(self, symbol, quote = None):
+        '''
+        Adds a ticker to the queue, putting it on the board and the schedule if there are
+
+        Args:
+            symbol (str): ticker symbol
+            quote (Quote): metrics already fetched for the ticker, e.g. by quotes.fetch()
+                for a whole watchlist, fetched through the engine's cache if None
+
+        Returns:
+            (Tick): the new Tick, None if the ticker is already queued or held
+        '''
+        if quote is None:
+            #Outside the lock, the cycles don't wait on the request
+            quote = self.cache.get(symbol, self.quotes.quote)
+        with self._lock:
+            if symbol in [tick.T for tick in self.qTicks + self.hTicks]:
+                return None
+            #Only the Ticks being traded keep a price history
+            tick = Tick(symbol, self.purPrice, HISTORY, quote)
+            if self.board is not None:
+                self.board.add(tick)
+            if self.scheduler is not None:
+                self.scheduler.add(tick)
+            self.qTicks.append(tick)
+            self.publish([tick])
+        logging.info('Added ' + symbol + ' to Queue')
+        self.emit('added', tick)
+        return tick
+
+
+    def remove(self, tick):
+        #Takes a ticker out of the queue for good
+        with self._lock:
+            if tick not in self.qTicks:
+                return
+            self.qTicks.remove(tick)
+            if self.board is not None:
+                self.board.remove(tick)
+            if self.scheduler is not None:
+                self.scheduler.remove(tick)
+            tick.history = None
+            self.publish([])
+        logging.info('Removed {} From Queue'.format(tick.T))
+        self.emit('removed', tick)
+
+
+    def afterHours(self):
+        '''
+        Determines whether the market is open (0930-1600, weekdays, non-federal holidays)
+
+        Args:
+            None
+
+        Returns:
+            (bool): True if market closed, else False
+        '''
+        us_holidays = holidays.US()
+        now = datetime.datetime.now(self.tz)
+        openTime = datetime.time(hour = 9, minute = 30, second = 0)
+        closeTime = datetime.time(hour = 16, minute = 0, second = 0)
+        return True if (now.strftime('%Y-%m-%d') in us_holidays or \
+            ((now.time() < openTime) or (now.time() > closeTime))) else False
+
+
+    def setTrading(self, trading):
+        '''
+        Starts or pauses trading, it can't be started after hours unless testing, nor
+        while a connection probe is failing
+
+        Args:
+            trading (bool): whether to trade
+
+        Returns:
+            (bool): whether trading now
+        '''
+        if trading and not self.testing and self.afterHours():
+            trading = False
+        if trading and self.faults:
+            logging.warning('Not trading, {} failed'.format(', '.join(sorted(self.faults))))
+            trading = False
+        if trading != self.trading:
+            self.trading = trading
+            logging.info('----Started Trading----' if trading else '----Paused Trading----')
+        self.emit('trading', self.trading)
+        return self.trading
+
+
+    def purchase(self, ticker, forced = False):
+        '''
+        Purchases the stock by removing it from the Queue, placing it on the Holdings and
+        making the Robinhood call
+
+        Args:
+            ticker (Tick): Tick object of ticker we're actually purchasing, bought already
+                unless forced
+            forced (bool): buys it now, whatever the strategy
+
+        Returns:
+            (bool): whether it was bought
+        '''
+        #Fetched outside the lock, the cycles don't wait on the request
+        quote = self.cache.get(ticker.T, self.quotes.quote) if forced else None
+        with self._lock:
+            if ticker not in self.qTicks:
+                return False
+            if forced and not ticker.purchase(self.purPrice, self.currStrat, forced = True, quote = quote):
+                return False
+
+            self.hTicks.append(ticker)
+            self.qTicks.remove(ticker)
+            self.cost -= ticker.Q * ticker.AP
+            self.publish([ticker])
+            row = self._rows[ticker]
+            if self.orders is not None:
+                #Queues the robinhood call, doesn't wait for it
+                self.orders.buy(ticker.T, ticker.Q, ticker.C).add_done_callback(
+                    lambda future, tick = ticker, row = row : self._bought(tick, row, future.result()))
+
+        logging.info(
+            '----Bought {} shares of {} at {}, SL: {}----'.format(
+                row.Q, row.T, row.AP, row.SL
+        ))
+        if self.orders is None and self.ledger is not None:
+            self.ledger.bought(row.T, row.Q, row.AP)
+        self.emit('bought', row)
+        return True
+
+
+    def sell(self, ticker, position = None):
+        '''
+        Sells the stock by removing it from the Holdings, placing it on the Queue if re-buy,
+        and making the Robinhood call. Whatever position the Tick still has is closed
+
+        Args:
+            ticker (Tick): Tick object of ticker we're actually selling
+            position (tuple): quantity and average price held, needed when a stop loss
+                already closed the Tick's position
+
+        Returns:
+            (bool): whether it was sold
+        '''
+        with self._lock:
+            if ticker not in self.hTicks:
+                return False
+            Q, AP = position if position is not None else (ticker.Q, ticker.AP)
+            SL = ticker.SL
+            profit = float(Q * ticker.C) - float(Q * AP)
+            self.profit += profit
+            self.cost += Q * ticker.C
+            if ticker.Q:
+                ticker.prevProfit = profit
+                ticker.Q, ticker.AP, ticker.SL = None, None, None
+                ticker.sellRev = 0
+
+            self.hTicks.remove(ticker)
+            if self.rebuy:
+                self.qTicks.append(ticker)
+            else:
+                if self.board is not None:
+                    self.board.remove(ticker)
+                if self.scheduler is not None:
+                    self.scheduler.remove(ticker)
+                ticker.history = None
+            self.publish([ticker])
+            row = self._rows.get(ticker) or _row(ticker)
+            if self.orders is not None:
+                #Queues the robinhood call, doesn't wait for it
+                self.orders.sell(ticker.T, Q, row.C).add_done_callback(
+                    lambda future, tick = ticker, row = row : self._sold(tick, row, (Q, AP, SL), profit, future.result()))
+
+        logging.info('----Sold {} shares of {} at {}----'.format(Q, row.T, row.C))
+        logging.info('----{} Profit: {}----'.format(row.T, round(profit, 2)))
+        if self.orders is None and self.ledger is not None:
+            self.ledger.sold(row.T, Q, row.C, profit)
+        self.emit('sold', row, profit)
+        return True
+
+
+    def _budget(self, tick):
+        #Whether buying the ticker leaves enough non-margin, always when testing
+        if self.testing:
+            return True
+        withdrawable = self.withdrawable()
+        if withdrawable is not None and withdrawable - (tick.C * tick.PQ) < self.purLimit:
+            logging.info('====Purhcase of {} will exceed budget, cancelling purchase===='.format(tick.T))
+            return False
+        return True
+
+
+    def cycle(self, ticks):
+        '''
+        Fetches the given tickers at once, then sells the held ones and buys the queued
+        ones that meet the current strategy
+
+        Args:
+            ticks (list): Ticks to poll, held or queued
+
+        Returns:
+            None
+        '''
+        try:
+            quotes = self.quotes.fetch([tick.T for tick in ticks])
+            with self._lock:
+                if self.board is not None:
+                    self._boardCycle(quotes)
+                else:
+                    self._tickCycle(quotes)
+                self.publish(ticks)
+            logging.debug('Quote cache {}'.format(self.cache.stats()))
+        finally:
+            if self.scheduler is not None:
+                self.scheduler.done(ticks)
+
+
+    def _tickCycle(self, quotes):
+        purPrice = self.purPrice
+        held = [tick for tick in self.hTicks if tick.T in quotes]
+        queued = [tick for tick in self.qTicks if tick.T in quotes]
+        if not self.trading:
+            for tick in held + queued:
+                tick.update(purPrice, quotes.get(tick.T))
+            return
+
+        for tick in held:
+            if tick.tradeable:
+                logging.info('Hold {}'.format(tick.T))
+                #A stop loss closes the position in sell(), what was held is needed to sell it
+                position = (tick.Q, tick.AP)
+                if tick.sell(purPrice, self.currStrat, quote = quotes.get(tick.T)):
+                    self.sell(tick, position)
+
+        for tick in queued:
+            logging.info('Queue {}'.format(tick.T))
+            if not tick.update(purPrice, quotes.get(tick.T)):
+                continue
+            if self._budget(tick) and tick.purchase(purPrice, self.currStrat, quote = tick._quote):
+                self.purchase(tick)
+
+
+    def _boardCycle(self, quotes):
+        #Same as _tickCycle, with the rules of every held and queued ticker run in a single step
+        board = self.board
+        fresh = board.mask(
+            tick for tick in self.hTicks + self.qTicks if tick.T in quotes and tick.update(self.purPrice, quotes.get(tick.T)))
+        if not self.trading:
+            return
+
+        held = board.mask(self.hTicks)
+        fresh &= ~board.mask(tick for tick in self.hTicks if not tick.tradeable)
+        fresh &= ~board.mask(tick for tick in self.qTicks if not self._budget(tick))
+
+        Q, AP = board.Q.copy(), board.AP.copy()
+        buys, sells = board.step(self.currStrat, held, fresh)
+        for tick in board.ticksAt(sells):
+            self.sell(tick, (int(Q[tick._row]), AP[tick._row]))
+        for tick in board.ticksAt(buys):
+            self.purchase(tick)
+
+
+    def update(self):
+        '''
+        Does everything that doesn't depend on the quotes, every UPDATE seconds
+
+        Args:
+            None
+
+        Returns:
+            (list): Ticks to cycle() now, none when scheduled
+        '''
+        #Determines the trading strategy, based on the time of day
+        now = datetime.datetime.now(self.tz).time()
+        opening = datetime.time(hour = 9, minute = 30, second = 0)
+        ten_fifteen = datetime.time(hour = 10, minute = 15, second = 0)
+        if opening < now < ten_fifteen:
+            #Price Swing Strategy
+            self.currStrat = 'PS'
+        else:
+            #Short Trading
+            self.currStrat = 'ST'
+
+        #Disable Trading aH
+        if self.trading and self.afterHours():
+            self.setTrading(False)
+
+        if self.trading:
+            #If end of day approaching, close out all positions regardless of profit
+            #To keep them until tomorrow, just turn off trading before 1658 (03:58 PM)
+            if now > datetime.time(hour = 15, minute = 58, second = 0) and self.hTicks:
+                logging.info('----Markets are about to close, selling all positions----')
+                for ticker in list(self.hTicks):
+                    if ticker.tradeable:
+                        self.sell(ticker)
+
+        withdrawable = self.withdrawable()
+        if not self.testing and withdrawable is not None:
+            #Safety-net for SEC guideline of >25000 on Non-Margin for day trading
+            if self.margin < withdrawable < self.margin + 100:
+                self.emit('warn', 'Near Thresh')
+            if withdrawable < self.margin:
+                logging.info('#### Non-Margin Fell Below Threshold ####')
+                self.emit('warn', 'Below Thresh')
+                self.setTrading(False)
+
+        if self.scheduler is None:
+            return self.hTicks + self.qTicks
+        return []
+
+
+    def poll(self):
+        #Polls the tickers that are due, when scheduled
+        due = self.scheduler.due() if self.scheduler is not None else []
+        if due:
+            self.cycle(due)
+        return due
+
+
+    def run(self):
+        '''
+        Runs the loop on the calling thread until interrupted
+
+        Args:
+            None
+
+        Returns:
+            None
+        '''
+        nextUpdate = 0
+        try:
+            while True:
+                if time.monotonic() >= nextUpdate:
+                    nextUpdate = time.monotonic() + UPDATE
+                    ticks = self.update()
+                    if ticks:
+                        self.cycle(ticks)
+                self.poll()
+                time.sleep(POLL if self.scheduler is not None else max(0, nextUpdate - time.monotonic()))
+        except KeyboardInterrupt:
+            logging.info('Stopping')
+
+
+    def close(self):
+        #Stops the portfolio thread and sends whatever orders are queued, for CLOSE_WAIT at most
+        if self.broker is not None:
+            self.broker.stop()
+            self.broker = None
+        if self.orders is not None:
+            self.orders.close(timeout = CLOSE_WAIT)
+            self.orders = None
+
+
+def load(path = 'core.cfg'):
+    '''
+    Reads a config file
+
+    Args:
+        path (str): config file
+
+    Returns:
+        (dict): the config, with 'API', 'Queue' and 'Engine' always there
+    '''
+    with open(path, 'r') as fileIn:
+        config = json.load(fileIn)
+    config.setdefault('API', {})
+    config.setdefault('Queue', [])
+    config.setdefault('Engine', {})
+    return config
+
+
+def main(path = 'core.cfg'):
+    logging.basicConfig(format = '%(asctime)s %(name)s _ %(levelname)s _ %(message)s', level = logging.INFO)
+    config = load(path)
+    engine = Engine(config['Engine'])
+    engine.listeners.append(lambda event, *args :
+        logging.warning('Warning: {}'.format(args[0])) if event == 'warn' else None)
+    #The whole watchlist in one round trip
+    quotes = engine.quotes.fetch(config['Queue'])
+    for symbol in config['Queue']:
+        engine.add(symbol, quotes[symbol])
+
+    trader = None
+    if config['API'].get('User'):
+        from Robinhood import Robinhood
+        trader = Robinhood()
+        trader.login(username = config['API']['User'], password = config['API']['Password'])
+        logging.info('Successfully Logged Into Robinhood')
+    elif not engine.testing:
+        logging.error('No API info in {}, can\'t trade without it'.format(path))
+        return 1
+    engine.setTrader(trader)
+
+    probes = SelfTest()
+    probes.start()
+    probes.wait()
+    engine.faults = probes.failed()
+    if engine.faults:
+        logging.error('Can\'t trade, {} failed'.format(', '.join(sorted(engine.faults))))
+        engine.close()
+        return 1
+    engine.setTrading(True)
+    engine.run()
+    engine.close()
+    if engine.ledger is not None:
+        engine.ledger.close()
+    if engine.journal is not None:
+        engine.journal.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(*sys.argv[1:]))
@@ -1,50 +1,83 @@
-from PyQt5 import uic, QtCore, QtGui, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
+import ui
+from Probes import SelfTest
 import json, re, os, logging
 
 
-class AddTick(*uic.loadUiType('ui/addtick.ui')[::-1]):
-    #The dialog that pops up to add a Ticker to the queue
-    def __init__(self, ticks, parent = None):
+class AddTick(QtWidgets.QDialog):
+    #The dialog that pops up to add a Ticker to the queue, its form is only loaded when it's first opened
+    #Completes what's typed from the symbols and names of the SymbolIndex, inserting the symbol
+    def __init__(self, symbols, parent = None):
         QtWidgets.QDialog.__init__(self, parent)
 
-        self.setupUi(self)
-        completer = QtWidgets.QCompleter()
-        completer.setCaseSensitivity(False)
-        self.tickEdit.setCompleter(completer)
+        ui.setupUi(self, 'addtick')
+        self.symbols = symbols
+        self.matches = QtGui.QStandardItemModel(self)
 
-        model = QtCore.QStringListModel()
-        completer.setModel(model)
-        model.setStringList(ticks)
+        completer = QtWidgets.QCompleter(self.matches, self)
+        completer.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+        completer.setCompletionRole(QtCore.Qt.UserRole)
+        self.tickEdit.setCompleter(completer)
+        self.tickEdit.textEdited.connect(self.complete)
+        completer.activated[str].connect(self.tickEdit.setText)
 
         self.okBut.clicked.connect(self.accept)
         self.cancelBut.clicked.connect(self.close)
 
 
-class InitTest(*uic.loadUiType('ui/InitTest.ui')[::-1]):
+    def complete(self, text):
+        #Lists the matches of what's been typed so far
+        self.matches.clear()
+        for symbol, name in self.symbols.search(text):
+            item = QtGui.QStandardItem('{:<6} {}'.format(symbol, name))
+            item.setData(symbol, QtCore.Qt.UserRole)
+            self.matches.appendRow(item)
+        self.tickEdit.completer().complete()
+
+
+class InitTest(QtWidgets.QDialog):
+    #Shows the connection probes as they come in, without blocking anything itself
+    #A failed probe can be retried by clicking it
+    probed = QtCore.pyqtSignal(str, bool)
+    #Names of the failed probes, every time all of them are in
+    tested = QtCore.pyqtSignal(set)
+
     def __init__(self, parent = None):
         QtWidgets.QDialog.__init__(self, parent)
 
-        self.setupUi(self)
-
-        try:
-            from resources.NASDAQ import tickCurrents
+        ui.setupUi(self, 'InitTest')
+
+        self.buttons = {'NASDAQ' : self.nState, 'Robinhood' : self.rState}
+        for name, button in self.buttons.items():
+            button.clicked.connect(lambda checked = False, name = name : self.start([name]))
+        #Results come in from the probe threads, handled in this one. Queued even when
+        #they're emitted here, a cached result would otherwise accept before show()
+        self.probed.connect(self.setResult, QtCore.Qt.QueuedConnection)
+        self.test = SelfTest(onResult = self.probed.emit)
+        #Probes started whose result hasn't been handled yet
+        self._pending = set()
+
+
+    def start(self, names = None):
+        #Runs the probes, every one if `names` is None
+        for name in (names if names is not None else self.buttons):
+            self._pending.add(name)
+            button = self.buttons[name]
+            button.setStyleSheet('')
+            button.setText('Testing...')
+            button.setEnabled(False)
+        self.test.start(names)
 
-            nTest = tickCurrents('NVDA')
-            if nTest:
-                if nTest['LTP']:
-                    self.setStates(self.nState, True)
-                else:
-                    self.setStates(self.nState, False)
-            else: self.setStates(self.nState)
-        except ImportError:
-            self.setStates(self.nState)
 
-        try:
-            from Robinhood import Robinhood
-            rTest = Robinhood()
-            self.setStates(self.rState, True)
-        except:
-            self.setStates(self.rState)
+    def setResult(self, name, ok):
+        self.setStates(self.buttons[name], ok)
+        self._pending.discard(name)
+        #Every result can be in before the first queued one is handled, only the last one ends the test
+        if not self._pending and len(self.test.results) == len(self.buttons):
+            failed = self.test.failed()
+            self.tested.emit(failed)
+            if not failed:
+                self.accept()
 
 
     def setStates(self, button, state = False):
@@ -66,18 +99,13 @@ class InitTest(*uic.loadUiType('ui/InitTest.ui')[::-1]):
             button.setStyleSheet('background-color: rgb(170, 0, 0);')
             button.setText('Failed')
             button.setEnabled(True)
-            
-
-    def closeEvent(self, event):
-           if not any(button.isEnabled() for button in [self.rState, self.nState]):
-                self.accept()
 
 
-class Api(*uic.loadUiType('ui/api.ui')[::-1]):
+class Api(QtWidgets.QDialog):
     def __init__(self, parent = None):
         QtWidgets.QDialog.__init__(self, parent)
 
-        self.setupUi(self)
+        ui.setupUi(self, 'api')
 
         self.okBut.clicked.connect(self.ok)
         self.cancelBut.clicked.connect(self.close)
@@ -112,18 +140,19 @@ class Api(*uic.loadUiType('ui/api.ui')[::-1]):
             )
 
 class TimeThread(QtCore.QThread):
-    #Threaded Timer, allows for background updates every 5 seconds
+    #Threaded Timer, allows for background updates every 5 seconds (or every `interval` ms)
     update = QtCore.pyqtSignal()
 
-    def __init__(self, parent = None):
+    def __init__(self, parent = None, interval = 5000):
         QtCore.QThread.__init__(self, parent)
         self.parent = parent
+        self.interval = interval
         
 
     def run(self):
         self.timer = QtCore.QTimer()
         self.timer.timeout.connect(self.update.emit)
-        self.timer.start(5000)
+        self.timer.start(self.interval)
         
         self.exec_()
 
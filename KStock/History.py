@@ -0,0 +1,86 @@
+import numpy as np
+
+
+class History():
+    '''
+    Fixed-size ring buffer of (timestamp, price, volume) samples
+
+    Memory is allocated once, appending is O(1) and once full the oldest sample is
+    overwritten, so it stays the same size however long the session runs. Every sample
+    is written twice, at i and i + capacity, which keeps the latest n samples contiguous
+    so last() can hand out views instead of copies.
+
+    Args:
+        capacity (int): number of samples kept
+    '''
+    def __init__(self, capacity = 1024):
+        if capacity < 1:
+            raise ValueError('History capacity must be at least 1, got {}'.format(capacity))
+        self.capacity = capacity
+        self.count = 0
+        #Rows are timestamps, prices and volumes
+        self._data = np.zeros((3, 2 * capacity))
+
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+
+    def append(self, stamp, price, volume = np.nan):
+        '''
+        Adds a sample, dropping the oldest one if full
+
+        Args:
+            stamp (float): seconds since the epoch
+            price (float): price at that time
+            volume (float): volume at that time
+
+        Returns:
+            None
+        '''
+        i = self.count % self.capacity
+        j = i + self.capacity
+        data = self._data
+        data[0, i] = data[0, j] = stamp
+        data[1, i] = data[1, j] = price
+        data[2, i] = data[2, j] = volume
+        self.count += 1
+
+
+    def last(self, n = None):
+        '''
+        The most recent samples, oldest first, as read-only views into the buffer
+
+        They change as samples are appended, copy them to keep them.
+
+        Args:
+            n (int): number of samples, all of them if None
+
+        Returns:
+            (tuple): timestamps, prices and volumes (numpy.ndarray)
+        '''
+        size = len(self)
+        n = size if n is None else max(0, min(n, size))
+        end = (self.count - 1) % self.capacity + self.capacity + 1 if self.count else 0
+        view = self._data[:, end - n:end]
+        view.flags.writeable = False
+        return view[0], view[1], view[2]
+
+
+    @property
+    def times(self):
+        return self.last()[0]
+
+
+    @property
+    def prices(self):
+        return self.last()[1]
+
+
+    @property
+    def volumes(self):
+        return self.last()[2]
+
+
+    def clear(self):
+        self.count = 0
@@ -0,0 +1,105 @@
+import datetime, os, time
+import numpy as np
+import pytz
+import Paths
+from Batch import BatchWriter
+
+#One fixed-width record per quote, packed so a day of them is one flat array
+RECORD = np.dtype([
+    ('t', '<f8'),           #Seconds since the epoch
+    ('sym', 'S8'),          #Ticker symbol
+    ('price', '<f8'),       #Last trade price
+    ('change', '<f8'),      #Change ($)
+    ('changePct', '<f8'),   #Change (%)
+    ('volume', '<f8'),
+    ('high', '<f8'),        #Today's high
+    ('low', '<f8'),         #Today's low
+    ('dir', 'i1')           #Direction, 1 green, -1 red, 0 neither
+])
+_DIRECTIONS = {'green' : 1, 'red' : -1}
+
+DIRECTORY = Paths.path('journal')
+_EASTERN = pytz.timezone('US/Eastern')
+
+
+def _day(stamp):
+    return datetime.datetime.fromtimestamp(stamp, _EASTERN).strftime('%Y-%m-%d')
+
+
+def _num(value):
+    #Metrics that couldn't be read are '' in a Quote
+    return value if type(value) == float else np.nan
+
+
+class Journal(BatchWriter):
+    '''
+    Appends every quote to a binary log, one file of RECORDs per trading day
+
+    record() only queues the quote, a background thread turns whatever has queued up
+    into one array and writes it with a single call, at least every `interval` seconds.
+    Read a day back with read().
+
+    Args:
+        directory (str): where the `<YYYY-MM-DD>.bin` files go
+        interval (float): max seconds a quote waits before being written
+    '''
+    ITEMS = 'quotes'
+
+    def __init__(self, directory = DIRECTORY, interval = 1):
+        self.directory = directory
+        os.makedirs(directory, exist_ok = True)
+        BatchWriter.__init__(self, 'Journal', interval)
+
+
+    def record(self, tick, quote, stamp = None):
+        '''
+        Queues a quote to be written, never blocks
+
+        Args:
+            tick (str): ticker symbol
+            quote (Quote): metrics of the tick
+            stamp (float): seconds since the epoch, now if None
+
+        Returns:
+            None
+        '''
+        self.put((time.time() if stamp is None else stamp, tick, quote))
+
+
+    def _write(self, batch):
+        records = np.array([
+            (stamp, tick.encode()[:8], _num(q.LTP), _num(q.C), _num(q.CP), _num(q.V), _num(q.TH), _num(q.TL),
+                _DIRECTIONS.get(q.D, 0))
+            for stamp, tick, q in batch
+        ], dtype = RECORD)
+
+        #A batch only spans two days around midnight
+        days = [_day(stamp) for stamp in (records['t'][0], records['t'][-1])]
+        if days[0] == days[1]:
+            groups = [(days[0], records)]
+        else:
+            split = np.array([_day(stamp) for stamp in records['t']])
+            groups = [(day, records[split == day]) for day in dict.fromkeys(split)]
+
+        for day, group in groups:
+            with open(os.path.join(self.directory, day + '.bin'), 'ab') as fileOut:
+                fileOut.write(group.tobytes())
+
+
+def read(day = None, directory = DIRECTORY):
+    '''
+    Maps a day of the journal into memory, nothing is copied or parsed
+
+    Args:
+        day (str): 'YYYY-MM-DD', today if None
+        directory (str): where the journal files are
+
+    Returns:
+        (numpy.recarray): RECORDs of the day in the order they were written, fields
+            read as attributes (records.price, records.sym...)
+    '''
+    path = os.path.join(directory, (day or _day(time.time())) + '.bin')
+    size = os.path.getsize(path) // RECORD.itemsize if os.path.isfile(path) else 0
+    if not size:
+        return np.recarray((0,), dtype = RECORD)
+    return np.memmap(path, dtype = RECORD, mode = 'r', shape = (size,)).view(np.recarray)
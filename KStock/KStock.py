@@ -14,54 +14,86 @@ rootLog.addHandler(consoleHandler)
 #logging.basicConfig(filename = 'TradeLogs.log', filemode = 'w', 
 #       format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s', level = logging.INFO)
 
-import os, datetime, pytz, holidays, json, requests, sys
-from PyQt5.QtWidgets import QApplication, QWidget, QMessageBox
+import os, datetime, pytz, json, requests, sys
+from PyQt5.QtWidgets import QApplication, QWidget, QMessageBox, QMainWindow
 from PyQt5.QtWidgets import QMenu, QTableWidget
-from PyQt5 import uic, QtCore, QtGui
+from PyQt5 import QtCore, QtGui
 from ObjList import ObjListTableModel, ObjListTable
 from Robinhood import Robinhood, exceptions
-import resources.gfc as gfc
 from resources.NASDAQ import tickCurrents
 from Helpers import *
+import ui
 import pyqtgraph as pg
-from Tick import Tick
+from Engine import Engine
+from resources.symbols import symbolIndex
+from Probes import PROBES
+from History import History
 from Worker import *
-import pandas as pd
+import numpy as np
 
 TESTING = True
-
-form, base = uic.loadUiType('ui/KStock.ui')
+#Keeps the state of every Tick in a Board and runs the rules on all of them at once
+BOARD = False
+#Records every quote fetched to data/journal/<day>.bin, see Journal.read()
+JOURNAL = True
+#Records every buy and sell to data/ledger.db, see Ledger
+LEDGER = True
+#Polls each ticker at its own pace instead of all of them every update, checking what's due every POLL ms
+SCHEDULE = True
+POLL = 250
+#Equity samples kept for the graph, a whole trading day of 5 second updates
+GRAPH_SAMPLES = 4680
+#Time labels shown under the graph
+GRAPH_LABELS = 8
+
+form, base = ui.formClass('KStock'), QMainWindow
 
 class MainWindow(base, form):
+    #Engine events, re-emitted so they're handled in the GUI thread whatever thread they came from
+    engineEvent = QtCore.pyqtSignal(str, object)
+
     def __init__(self):
         super(base, self).__init__()
         self.setupUi(self)
 
-        testWin = InitTest(self)
-        if not testWin.exec_(): 
-            self.close()
-            sys.exit()
-
-        self.currStrat = 'ST'
-        self.qTicks, self.hTicks = [], []
-        self.graphData = [[],[]]
+        self.graphData = History(GRAPH_SAMPLES)
         self.qModel, self.hModel = None, None
+        #Engine snapshot the tables show
+        self.shown = None
 
         #Sets the eastern timezone
         self.tz = pytz.timezone('US/Eastern')
 
-        #List of company names for use later
-        self.comps = pd.read_csv('./resources/companyList.csv', sep = ',')[['Symbol', 'Name']]
-
         #The pool where all the hard calculations and GETS take place
         self.pool = QtCore.QThreadPool()
         logging.info('Max threads: ' + str(self.pool.maxThreadCount()))
 
+        #Does all the trading, the window only shows it and passes the settings on
+        self.engine = Engine({
+            'purPrice' : self.purPrice.value(), 'purLimit' : self.purLimit.value(), 'margin' : self.marginSpin.value(),
+            'rebuy' : self.rebuy.isChecked(), 'testing' : TESTING, 'board' : BOARD, 'journal' : JOURNAL,
+            'ledger' : LEDGER, 'schedule' : SCHEDULE
+        })
+        self.engineEvent.connect(self.engineEvents)
+        self.engine.listeners.append(lambda event, *args : self.engineEvent.emit(event, args))
+
+        #Probes the connections while the window loads, trading stays off until they pass
+        self.engine.faults = set(PROBES)
+        self.startBut.setEnabled(False)
+        self.initTest = InitTest(self)
+        self.initTest.tested.connect(self.tested, QtCore.Qt.QueuedConnection)
+        self.initTest.show()
+        self.initTest.start()
+
         #Signal handling
         self.addQ.clicked.connect(self.addQueue)
         self.startBut.clicked.connect(self.tradeActs)
         self.pauseBut.clicked.connect(self.tradeActs)
         self.actionAPI.triggered.connect(self.api)
+        self.purPrice.valueChanged.connect(lambda value : setattr(self.engine, 'purPrice', value))
+        self.purLimit.valueChanged.connect(lambda value : setattr(self.engine, 'purLimit', value))
+        self.marginSpin.valueChanged.connect(lambda value : setattr(self.engine, 'margin', value))
+        self.rebuy.toggled.connect(lambda checked : setattr(self.engine, 'rebuy', checked))
 
         #Create Context Menu if right clicked
         self.queue.setContextMenuPolicy(
@@ -72,6 +104,10 @@ class MainWindow(base, form):
         #Graph options
         self.ePen = pg.mkPen(color = 'b', width = 2)
         self.graph.hideAxis('bottom')
+        #One curve for the whole day, fed new data every update
+        self.curve = self.graph.plot(pen = self.ePen)
+        self.curve.setDownsampling(auto = True, method = 'peak')
+        self.curve.setClipToView(True)
 
         #Sets up the Robinhood API from the config file if it exists and is correct
         if os.path.isfile('core.cfg'):
@@ -81,12 +117,16 @@ class MainWindow(base, form):
                     data = json.load(fileIn)
                     self.rUser = data['API']['User']
                     self.rPass = data['API']['Password']
-                    self.qTicks = [Tick(tick, self.purPrice.value()) for tick in data['Queue']]
+                    #The whole watchlist in one round trip
+                    quotes = self.engine.quotes.fetch(data['Queue'])
+                    for tick in data['Queue']:
+                        self.engine.add(tick, quotes[tick])
                         
                     try:
                         self.trader = Robinhood()
                         self.trader.login(username = self.rUser, password = self.rPass)
                         logging.info('Successfully Logged Into Robinhood')
+                        self.engine.setTrader(self.trader)
                         
                         self.startup()
                         self.update()
@@ -95,6 +135,10 @@ class MainWindow(base, form):
                         timer = TimeThread(self)
                         timer.update.connect(self.update)
                         timer.start()
+                        if self.engine.scheduler is not None:
+                            poller = TimeThread(self, POLL)
+                            poller.update.connect(self.poll)
+                            poller.start()
                         
 
                     except (requests.exceptions.HTTPError, exceptions.LoginFailed):
@@ -104,7 +148,7 @@ class MainWindow(base, form):
                 except json.decoder.JSONDecodeError as e:
                     logging.error(str(e))
                     self.warn('Corrupt')
-                    self.rUser, self.rPass, self.qTicks = [], [], []
+                    self.rUser, self.rPass = [], []
                     self.trader = None
         else:
             self.warn('No CFG')  
@@ -134,15 +178,19 @@ class MainWindow(base, form):
             {'attr' : 'SL', 'header' : 'Stop Loss'}
         ]
 
-        #These models are neat because they actually contain the Tick objects, not just data
-        #When adding to a table, you're adding the actual Tick to it
-        self.qModel = ObjListTableModel(self.qTicks, qproperties, isRowObjects = True, isDynamic = True)
-        self.hModel = ObjListTableModel(self.hTicks, hproperties, isRowObjects = True, isDynamic = True)
+        #The models show the Rows of the engine's latest snapshot, never the Ticks the cycles are changing
+        #A Row is replaced when its Tick changes, the symbol tells which one it replaces
+        snapshot = self.engine.snapshot
+        symbol = lambda row : row.T
+        self.qModel = ObjListTableModel(list(snapshot.queue), qproperties, isRowObjects = True, isDynamic = True, key = symbol)
+        self.hModel = ObjListTableModel(list(snapshot.holdings), hproperties, isRowObjects = True, isDynamic = True, key = symbol)
 
         self.holding.setModel(self.hModel)
         self.queue.setModel(self.qModel)
 
 
+
+
     def warn(self, warn):
         '''
         Calls a QDialog to warn about something
@@ -159,7 +207,8 @@ class MainWindow(base, form):
             'Corrupt' : 'The .cfg File Seems to be Corrupt, Re-Input API Info',
             'Near Thresh' : 'Inching Close to Minimum Non-Margin Amount of {}'.format(self.marginSpin.value()),
             'Below Thresh' : 'Non-Margin Fell Below Minimum, Stopping Trading',
-            'General' : 'Something Went Wrong With the Execution'
+            'General' : 'Something Went Wrong With the Execution',
+            'Order Failed' : 'The Broker Rejected an Order, See the Log'
         }
 
         QMessageBox.critical(None, warn, warnMessage[warn], QMessageBox.Ok)
@@ -184,6 +233,7 @@ class MainWindow(base, form):
             try:
                 self.trader.login(username = self.rUser, password = self.rPass)
                 logging.info('Successfully Logged Into Robinhood')
+                self.engine.setTrader(self.trader)
                 if not self.qModel:
                     self.startup()
                 self.update()
@@ -193,28 +243,84 @@ class MainWindow(base, form):
                 self.api()
 
 
-    def afterHours(self):
+
+    def engineEvents(self, event, args):
         '''
-        Determines whether the market is open (0930-1600, weekdays, non-federal holidays)
+        Shows what the engine did, in the GUI thread
 
         Args:
-            None
+            event (str): what happened, see Engine
+            args (tuple): its arguments
 
         Returns:
-            (bool): True if market closed, else False
+            None
         '''
-        us_holidays = holidays.US()
-        now = datetime.datetime.now(self.tz)
-        openTime = datetime.time(hour = 9, minute = 30, second = 0, tzinfo = self.tz)
-        closeTime = datetime.time(hour = 16, minute = 0, second = 0, tzinfo = self.tz)
-        return True if (now.strftime('%Y-%m-%d') in us_holidays or \
-            ((now.time() < openTime) or (now.time() > closeTime))) else False
+        if event == 'bought':
+            row, = args
+            self.transTable.bought(row)
+            self.refreshTables()
+
+        elif event == 'sold':
+            row, profit = args
+            self.transTable.sold(row)
+            self.refreshTables()
+
+        elif event == 'rejected':
+            self.refreshTables()
+            self.warn('Order Failed')
+
+        elif event in ('added', 'removed'):
+            self.refreshTables()
+
+        elif event == 'trading':
+            trading, = args
+            self.startBut.setEnabled(not trading and not self.engine.faults)
+            self.pauseBut.setEnabled(trading)
+
+        elif event == 'portfolio':
+            self.setPortfolio(*args)
+
+        elif event == 'warn':
+            self.warn(*args)
+
+
+    def refreshTables(self):
+        #Shows the engine's latest snapshot, only what changed since the last one shown gets repainted
+        snapshot = self.engine.snapshot
+        if self.qModel is None or snapshot is self.shown:
+            return
+        self.shown = snapshot
+        self.hModel.refresh(snapshot.holdings)
+        self.qModel.refresh(snapshot.queue)
+        self.profitLabel.setText('%.2f' % snapshot.profit)
+        self.totalCost.setText('%.2f' % snapshot.cost)
+
+
+    def tested(self, failed):
+        #Called once every connection probe is in, trading is only allowed if none failed
+        self.engine.faults = failed
+        if failed and self.engine.trading:
+            self.engine.setTrading(False)
+        self.startBut.setEnabled(not failed and not self.engine.trading)
+
+
+    def setPortfolio(self, snapshot):
+        #Called in the GUI thread with every new snapshot
+        if self.engine.afterHours():
+            self.holdLabel.setText('%.2f' % (float(snapshot['extended_hours_equity'])))
+        else:
+            self.holdLabel.setText('%.2f' % (float(snapshot['equity'])))
+
+            #Plt that stuff if it's during the trading day
+            self.graphData.append(snapshot['time'], float(snapshot['equity']))
+            self.plot()
+        self.marginLabel.setText('%.2f' % (float(snapshot['withdrawable_amount'])))
 
 
     def tradeActs(self):
         '''
-        Disables/Enables Trading Start/Stop buttons
-        Basically starts the whole trading process if `startBut` is disabled
+        Starts or pauses trading, depending on which of `startBut`/`pauseBut` was clicked
+        The buttons follow once the engine says whether it's trading
 
         Args:
             None
@@ -222,19 +328,7 @@ class MainWindow(base, form):
         Returns:
             None
         '''
-        if not TESTING:
-            if not self.afterHours():
-                self.startBut.setEnabled(True)
-            else:
-                self.startBut.setEnabled(False)
-        else:
-            self.startBut.setEnabled(not self.startBut.isEnabled())
-        self.pauseBut.setEnabled(not self.startBut.isEnabled())
-
-        if not self.startBut.isEnabled():
-            logging.info('----Started Trading----')
-        else:
-            logging.info('----Paused Trading----')
+        self.engine.setTrading(self.sender() is self.startBut)
 
 
 
@@ -254,103 +348,43 @@ class MainWindow(base, form):
             delX = menu.addAction('Remove From Queue')
 
             action = menu.exec_(self.queue.mapToGlobal(pos))
-            rowTick = self.qTicks[self.queue.rowAt(pos.y())]
+            row = self.qModel.getObject(self.queue.indexAt(pos))
+            if row is None:
+                return
+            rowTick = row.tick
 
             if action == delX:
                 #Removes row from table
-                logging.info('Removed {} From Queue'.format(rowTick.T))
-                self.qModel.removeRow(self.qTicks.index(rowTick))
-                self.qTicks.remove(rowTick)
+                self.engine.remove(rowTick)
 
 
             if action == buyX:
                 reply = QMessageBox.question(
                     None, 
                     'Purchase?', 
-                    'Purchase {} shares of {} for at {}'.format(rowTick.PQ, rowTick.T, rowTick.C),
+                    'Purchase {} shares of {} for at {}'.format(row.PQ, row.T, row.C),
                     QMessageBox.Yes, QMessageBox.No)
 
                 if reply == QMessageBox.Yes:
                     try:
-                        rowTick.purchase(purPrice = self.purPrice.value(), tradeStrat = self.currStrat, forced = True)
-                        self.totalCost.setText('%.2f' % (float(self.totalCost.text()) - float(rowTick.Q * rowTick.AP)))
-                        self.transTable.bought(rowTick)
-                        self.hTicks.append(rowTick)
-                        self.qTicks.remove(rowTick)
-
-                        self.hModel.layoutChanged.emit()
-                        self.queue.viewport().update()
+                        self.engine.purchase(rowTick, forced = True)
                     except TypeError:
                         self.warn('General')
 
 
-
-
-    def purchase(self, ticker):
-        '''
-        Purchases the stock by removing it from the Queue, placing it on the Holding table and 
-        making the Robninhood call
-
-        Args:
-            ticker (Tick): Tick object of ticker we're actually purchasing
-
-        Returns:
-            None
-        '''
-        if not TESTING:
-            self.trader.place_limit_buy_order(symbol = ticker.T, time_in_force = 'GFD', price = ticker.C, quantity = ticker.PQ)
-            
-        self.transTable.bought(ticker)
-        self.hTicks.append(ticker)
-        self.qTicks.remove(ticker)
-
-        self.totalCost.setText('%.2f' % (float(self.totalCost.text()) - float(ticker.Q * ticker.AP)))
-
-
-        return True
-
-
-    def sell(self, ticker):
-        '''
-        Sells the stock by removing it from the Holding, placing it on the Queue, if re-buy and 
-        making the Robninhood call
-
-        Args:
-            ticker (Tick): Tick object of ticker we're actually purchasing
-
-        Returns:
-            None
-        '''
-        if not TESTING:
-            #makes robinhood call ....
-            self.trader.place_limit_sell_order(symbol = ticker.T, time_in_force = 'GFD', price = ticker.C, quantity = ticker.PQ)
-
-        logging.info(
-            '----Sold {} shares of {} at {}----'.format(
-                ticker.Q, ticker.T, ticker.C
-        ))
-
-        indprofit = float(ticker.Q * ticker.C) - float(ticker.Q * ticker.AP)      
-        profitLabel = float(self.profitLabel.text()) + indprofit
-           
-        logging.info('----{} Profit: {}----'.format(ticker.T, round(indprofit, 2)))
-        self.profitLabel.setText('%.2f' % (profitLabel))
-        self.totalCost.setText('%.2f' % (float(self.totalCost.text()) + (ticker.Q * ticker.C)))
-
-        if self.rebuy.isChecked():
-            self.qTicks.append(ticker)
-            self.qModel.layoutChanged.emit()
-            #self.queue.viewport().update()
-
-        self.hTicks.remove(ticker)
-        self.hModel.layoutChanged.emit()
-        
-        return True
+    def poll(self):
+        #Polls the tickers that are due, gets called every POLL ms in scheduled mode
+        due = self.engine.scheduler.due()
+        if due:
+            pollWorker = Worker(self.engine.cycle, due)
+            pollWorker.signals.error.connect(lambda : logging.error('Error with the Poll'))
+            pollWorker.signals.finished.connect(self.refreshTables)
+            self.pool.start(pollWorker)
 
 
     def update(self):
         #The main update function, gets called every 5 seconds
-        #Contains the child call functions
+        #Polls every ticker unless the scheduler polls them at their own pace
 
         def _success(worker):
             #Called when one of the workers is successfully completed
@@ -361,195 +395,63 @@ class MainWindow(base, form):
             #Called if there was an error
             logging.error('Error with the {}'.format(worker))
 
+        #Strategy, after hours, end of day and margin checks, see Engine.update
+        ticks = self.engine.update()
 
-        def _holdCall():
-            '''
-            Performs all the necessaries for the Holdings table, is put in a worker
-            and executes in the background
-
-            Args:
-                None
-
-            Returns:
-                None
-            '''
-            #I'm not happy with this yet so I'm leaving it out
-            '''
-            if not TESTING: 
-                #Gathers all current Robinhood holdings, deems them untradable and is used just for visualization
-                #Can be set to tradeable if desired
-                for pos in self.trader.positions()['results']:
-                    inst = self.trader.instrument(pos['instrument'].split('/')[-2])
-                    if float(pos['quantity']) > 0:
-                        ticker = Tick(inst['symbol'], self.purPrice.value())
-                        ticker.purchase((pos['quantity'], pos['average_buy_price'], None))
-                        self.hTicks.append(ticker)
-                        self.hModel.layoutChanged.emit()
-                        #self.holding.viewport().update()
-            '''
-            if not self.startBut.isEnabled():
-                for tick in self.hTicks:
-                    if tick.tradeable:
-                        logging.info('Hold {}'.format(tick.T))
-                        if tick.sell(self.purPrice.value(), self.currStrat):
-                            self.sell(tick)
-            else:
-                for tick in self.qTicks:
-                    tick.update(self.purPrice.value())
-
-
-
-        def _queueCall():
-            '''
-            Performs all the necessaries for the Queue table, is put in a worker
-            and executes in the background
-
-            Args:
-                None
-
-            Returns:
-                None
-            '''
-            if not self.startBut.isEnabled():
-                for tick in self.qTicks:
-                    logging.info('Queue {}'.format(tick.T))
-                    if not TESTING:
-                        if float(self.marginLabel.text()) - (ticker.C * ticker.PQ) < self.purLimit.value():
-                            logging.info('====Purhcase of {} will exceed budget, cancelling purchase===='.format(ticker.T
-                            ))
-                            if tick.purchase(self.purPrice.value(), self.currStrat):
-                                if self.purchase(tick):
-                                    logging.info(
-                                        '----Bought {} shares of {} at {}, SL: {}----'.format(
-                                            tick.Q, tick.T, tick.AP, tick.SL
-                                    )) 
-                    else:
-                        if tick.purchase(self.purPrice.value(), self.currStrat):
-                            if self.purchase(tick):
-                                logging.info(
-                                    '----Bought {} shares of {} at {}, SL: {}----'.format(
-                                        tick.Q, tick.T, tick.AP, tick.SL
-                                ))
-            else:
-                for tick in self.qTicks:
-                    tick.update(self.purPrice.value())
-
-        #Determines the trading strategy, based on the time of day
-        now = datetime.datetime.now(self.tz).time()
-        opening = datetime.time(hour = 9, minute = 30, second = 0, tzinfo = self.tz)
-        ten_fifteen = datetime.time(hour = 10, minute = 15, second = 0, tzinfo = self.tz)
-        if opening < now < ten_fifteen:
-            #Price Swing Strategy
-            self.currStrat = 'PS'
-        else:
-            #Short Trading
-            self.currStrat = 'ST'
-
-        #Robinhood portfolio
-        self.portfolio = self.trader.portfolios()
+        #Only calls the update function if there's stuff in the tables, saves memory
+        if ticks:
+            cycleWorker = Worker(self.engine.cycle, ticks)
+            cycleWorker.signals.finished.connect(lambda : _success('Cycle'))
+            cycleWorker.signals.finished.connect(self.refreshTables)
+            cycleWorker.signals.error.connect(lambda : _error('Cycle'))
 
-        #Set the Equity to current value depending on if it's aH or not
-        if self.afterHours():
-            self.holdLabel.setText('%.2f' % (float(self.portfolio['extended_hours_equity'])))
+            self.pool.start(cycleWorker)
+        self.refreshTables()
 
-            #Disable Trading aH
-            if not self.startBut.isEnabled():
-                self.tradeActs()
 
-        else:
-            self.holdLabel.setText('%.2f' % (float(self.portfolio['equity'])))
+    def plot(self):
+        '''
+        Redraws the equity curve from graphData, only labelling a few of the samples
 
-            #Plt that stuff if it's during the trading day
-            self.graphData[0].append(now.strftime('%H:%M:%S'))
-            self.graphData[1].append(float(self.portfolio['equity']))
-            xdict = dict(enumerate(self.graphData[0]))
-            ax = self.graph.getAxis('bottom')
-            ax.setTicks([xdict.items()])
-            self.graph.plot(list(xdict.keys()), self.graphData[1], pen = self.ePen, clear = False)
-
-        self.marginLabel.setText('%.2f' % (float(self.portfolio['withdrawable_amount'])))
-        
-        if not self.startBut.isEnabled():
-            #If end of day approaching, close out all positions regardless of profit
-            #To keep them until tomorrow, just turn off trading before 1658 (03:58 PM)
-            if now > datetime.time(hour = 15, minute = 58, second = 0, tzinfo = self.tz):
-                if self.hModel.rowCount() > 0:
-                    logging.info('----Markets are about to close, selling all positions----')
-                    for ticker in self.hTicks:
-                        if ticker.tradeable:
-                            self.sell(ticker)
-
-        if not TESTING:
-            #Safety-net for SEC guideline of >25000 on Non-Margin for day trading
-            if self.marginSpin.value() < float(self.marginLabel.text()) < self.marginSpin.value() + 100:
-                self.warn('Near Thresh')
-            if float(self.marginLabel.text()) < self.marginSpin.value():
-                logging.info('#### Non-Margin Fell Below Threshold ####')
-                self.warn('Below Thresh')
-                self.tradeActs()
-        
+        Args:
+            None
 
-        holdWorker = Worker(_holdCall)
-        holdWorker.signals.finished.connect(lambda : _success('Hold'))
-        holdWorker.signals.error.connect(lambda : _error('Hold'))
+        Returns:
+            None
+        '''
+        stamps, equity, _ = self.graphData.last()
+        count = self.graphData.count
+        x = np.arange(count - len(equity), count)
+        self.curve.setData(x, equity)
 
-        self.pool.start(holdWorker)
-        self.hModel.layoutChanged.emit()
-        self.holding.viewport().update()
+        step = max(1, len(x) // GRAPH_LABELS)
+        labels = [(i, datetime.datetime.fromtimestamp(stamp, self.tz).strftime('%H:%M:%S'))
+            for i, stamp in zip(x[::step].tolist(), stamps[::step].tolist())]
+        self.graph.getAxis('bottom').setTicks([labels])
 
-        #Only calls the update function if there's stuff in the table, saves memory
-        if self.qModel.rowCount() > 0:
-            queueWorker = Worker(_queueCall)
-            queueWorker.signals.finished.connect(lambda : _success('Queue'))
-            queueWorker.signals.error.connect(lambda : _error('Queue'))
 
-            self.pool.start(queueWorker)
-            self.queue.viewport().update()
 
 
-    def addQueue(self, ticks = False):
+    def addQueue(self):
         '''
-        Adds a ticker to to the Queue, whether from the config file
-        or the dialog
+        Adds a ticker from the dialog to the Queue
 
         Args:
-            ticks (bool): whether adding ticks from the config file
+            None
 
         Returns:
             None
         '''
-
-        def _add(ticker):
-            '''
-            Actually adds the ticker obj to the queue
-
-            Args:
-                ticker (str): ticker name to be added
-
-            Returns:
-                None
-            '''
-            if ticker not in [tick.T for tick in self.qTicks + self.hTicks]:
-                self.qTicks.append(Tick(ticker, self.purPrice.value()))
-                self.qModel.layoutChanged.emit()
-                logging.info('Added ' + ticker + ' to Queue')
-
-
-        if not ticks:
-            tick = AddTick(self.comps['Symbol'].values, self)
-            if tick.exec_():
-                if tick.result() and tick.tickEdit.text():
+        tick = AddTick(symbolIndex, self)
+        if tick.exec_():
+            if tick.result() and tick.tickEdit.text():
+                withdrawable = self.engine.withdrawable()
+                if TESTING or (withdrawable is not None and withdrawable > self.engine.margin):
+                    self.engine.add(tick.tickEdit.text())
+
+                    #Autosaves...duh
                     if not TESTING:
-                        if float(self.marginLabel.text()) > 25000:
-                            _add(tick.tickEdit.text())
-
-                            #Autosaves...duh
-                            self.autosave()
-                    else: 
-                        _add(tick.tickEdit.text())
-        else:
-            for item in self.qTicks:
-                _add(item)
+                        self.autosave()
 
 
     def autosave(self, close = False):
@@ -567,12 +469,13 @@ class MainWindow(base, form):
             with open('core.cfg', 'w') as fileOut:
                 data = {
                     'API' : {'User' : self.rUser, 'Password' : self.rPass},
-                    'Queue' : [tick.T for tick in self.qTicks if self.qTicks]
+                    'Queue' : [row.T for row in self.engine.snapshot.queue]
                 }
 
                 json.dump(data, fileOut)
 
 
+
     def closeEvent(self, event):
         '''
         Handles the closing event, calls autosave()
@@ -588,6 +491,11 @@ class MainWindow(base, form):
             self.autosave(True)
         except AttributeError:
             pass
+        self.engine.close()
+        if self.engine.journal is not None:
+            self.engine.journal.close()
+        if self.engine.ledger is not None:
+            self.engine.ledger.close()
 
 
 
@@ -595,4 +503,4 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     ex = MainWindow()
     ex.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    sys.exit(app.exec_())
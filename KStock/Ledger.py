@@ -0,0 +1,195 @@
+import datetime, os, sqlite3, time
+import holidays, pytz
+import Paths
+from Batch import BatchWriter
+
+PATH = Paths.path('ledger.db')
+#Business days the day trades are counted over
+DAY_TRADE_DAYS = 5
+_EASTERN = pytz.timezone('US/Eastern')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS fills (
+    id INTEGER PRIMARY KEY,
+    t REAL NOT NULL,            --Seconds since the epoch
+    day TEXT NOT NULL,          --Trading day, YYYY-MM-DD eastern
+    sym TEXT NOT NULL,          --Ticker symbol
+    side TEXT NOT NULL,         --'B' bought, 'S' sold
+    qty INTEGER NOT NULL,
+    price REAL NOT NULL,        --Per share
+    profit REAL,                --Of the position, sells only
+    opened TEXT                 --Day the position was bought
+);
+--Finds the last buy of a symbol
+CREATE INDEX IF NOT EXISTS fills_sym ON fills (sym, side, t);
+--Cover the P&L and day trade queries, they never read the table itself
+CREATE INDEX IF NOT EXISTS sells_day ON fills (day, opened, profit) WHERE side = 'S';
+CREATE INDEX IF NOT EXISTS sells_sym ON fills (sym, day, profit) WHERE side = 'S';
+'''
+_BUY = 'INSERT INTO fills (t, day, sym, side, qty, price, opened) VALUES (?, ?, ?, \'B\', ?, ?, ?)'
+#The day the position was opened is the day of the symbol's last buy
+_SELL = '''INSERT INTO fills (t, day, sym, side, qty, price, profit, opened) VALUES (?, ?, ?, 'S', ?, ?, ?,
+    (SELECT day FROM fills WHERE sym = ? AND side = 'B' ORDER BY t DESC LIMIT 1))'''
+
+
+def _day(stamp):
+    return datetime.datetime.fromtimestamp(stamp, _EASTERN).strftime('%Y-%m-%d')
+
+
+class Ledger(BatchWriter):
+    '''
+    Keeps every buy and sell in a SQLite database, so the trades and their profit
+    outlive the app and can be queried
+
+    bought() and sold() only queue the fill, a background thread inserts whatever has
+    queued up in one transaction, at least every `interval` seconds. The database is in
+    WAL mode, the queries read it on their own connection while the writer commits, and
+    only see what's committed: flush() first to include the latest fills.
+
+    Args:
+        path (str): database file, created if it isn't there
+        interval (float): max seconds a fill waits before being written
+    '''
+    ITEMS = 'fills'
+
+    def __init__(self, path = PATH, interval = 1):
+        self.path = path
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+        db = self._connect()
+        try:
+            db.execute('PRAGMA journal_mode = WAL')
+            db.executescript(_SCHEMA)
+        finally:
+            db.close()
+        self._db = None
+        BatchWriter.__init__(self, 'Ledger', interval)
+
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, timeout = 10)
+        #Durable as of the last checkpoint, a commit doesn't wait on the disk
+        db.execute('PRAGMA synchronous = NORMAL')
+        return db
+
+
+    def bought(self, symbol, qty, price, stamp = None):
+        '''
+        Queues a buy to be written, never blocks
+
+        Args:
+            symbol (str): ticker symbol
+            qty (int): shares bought
+            price (float): price paid per share
+            stamp (float): seconds since the epoch, now if None
+
+        Returns:
+            None
+        '''
+        stamp = time.time() if stamp is None else stamp
+        day = _day(stamp)
+        self.put((_BUY, (stamp, day, symbol, qty, price, day)))
+
+
+    def sold(self, symbol, qty, price, profit, stamp = None):
+        '''
+        Queues a sell to be written, never blocks
+
+        Args:
+            symbol (str): ticker symbol
+            qty (int): shares sold
+            price (float): price sold at per share
+            profit (float): profit of the position
+            stamp (float): seconds since the epoch, now if None
+
+        Returns:
+            None
+        '''
+        stamp = time.time() if stamp is None else stamp
+        self.put((_SELL, (stamp, _day(stamp), symbol, qty, price, profit, symbol)))
+
+
+    def _open(self):
+        #The writer's connection, only used on its thread
+        self._db = self._connect()
+
+
+    def _close(self):
+        if self._db is not None:
+            self._db.close()
+
+
+    def _write(self, batch):
+        with self._db as db:
+            #Consecutive fills of a kind go in one executemany, in order
+            start = 0
+            for end in range(1, len(batch) + 1):
+                if end == len(batch) or batch[end][0] != batch[start][0]:
+                    db.executemany(batch[start][0], [args for _, args in batch[start:end]])
+                    start = end
+
+
+    def _query(self, sql, args = ()):
+        db = self._connect()
+        try:
+            return db.execute(sql, args).fetchall()
+        finally:
+            db.close()
+
+
+    def profitBySymbol(self, start = None, end = None):
+        '''
+        Profit made on each symbol
+
+        Args:
+            start (str): first day counted, 'YYYY-MM-DD', from the first trade if None
+            end (str): last day counted, up to today if None
+
+        Returns:
+            (dict): symbol to (profit, positions sold), in symbol order
+        '''
+        rows = self._query(
+            'SELECT sym, SUM(profit), COUNT(*) FROM fills WHERE side = \'S\' AND day BETWEEN ? AND ? '
+            'GROUP BY sym ORDER BY sym', (start or '', end or '9999'))
+        return {sym : (profit, sold) for sym, profit, sold in rows}
+
+
+    def profitByDay(self, start = None, end = None):
+        '''
+        Profit made on each trading day
+
+        Args:
+            start (str): first day, 'YYYY-MM-DD', from the first trade if None
+            end (str): last day, up to today if None
+
+        Returns:
+            (dict): day to (profit, positions sold), in day order
+        '''
+        rows = self._query(
+            'SELECT day, SUM(profit), COUNT(*) FROM fills WHERE side = \'S\' AND day BETWEEN ? AND ? '
+            'GROUP BY day ORDER BY day', (start or '', end or '9999'))
+        return {day : (profit, sold) for day, profit, sold in rows}
+
+
+    def dayTrades(self, day = None, days = DAY_TRADE_DAYS):
+        '''
+        Counts the day trades, positions bought and sold on the same day, over the last
+        `days` business days (weekends and US holidays don't count)
+
+        Args:
+            day (str): last day of the window, 'YYYY-MM-DD', today if None
+            days (int): business days in the window
+
+        Returns:
+            (int): day trades in the window
+        '''
+        current = datetime.datetime.strptime(day or _day(time.time()), '%Y-%m-%d').date()
+        usHolidays = holidays.US()
+        start, counted = current, 0
+        while counted < days:
+            if current.weekday() < 5 and current not in usHolidays:
+                start, counted = current, counted + 1
+            current -= datetime.timedelta(days = 1)
+        return self._query(
+            'SELECT COUNT(*) FROM fills WHERE day BETWEEN ? AND ? AND side = \'S\' AND opened = day',
+            (start.isoformat(), day or _day(time.time())))[0][0]
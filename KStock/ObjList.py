@@ -1,9 +1,11 @@
 import copy
 from datetime import datetime
+from operator import attrgetter
+import numpy as np
 from PyQt5 import QtGui
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, QT_VERSION_STR
 from PyQt5.QtWidgets import QTableView, QMenu, QInputDialog, QErrorMessage, QDialog, QDialogButtonBox, QVBoxLayout,\
-     QTableWidget, QTableWidgetItem
+     QHeaderView
 from table.CheckBoxDelegateQt import CheckBoxDelegateQt
 from table.FloatEditDelegateQt import FloatEditDelegateQt
 from table.DateTimeEditDelegateQt import DateTimeEditDelegateQt
@@ -11,16 +13,39 @@ from table.ComboBoxDelegateQt import ComboBoxDelegateQt
 from table.PushButtonDelegateQt import PushButtonDelegateQt
 from table.FileDialogDelegateQt import FileDialogDelegateQt
 
+#Made once, every cell of a direction shares its color and brush
+_COLORS = {
+    'red' : QtGui.QColor(214, 102, 102),
+    'green' : QtGui.QColor(102, 214, 102),
+    None : QtGui.QColor(144, 144, 144)          #Grey, for anything else
+}
+_BRUSHES = {move : QtGui.QBrush(value) for move, value in _COLORS.items()}
+#Roles data() answers, the view asks for about as many others per cell
+_ROLES = frozenset([Qt.DisplayRole, Qt.EditRole, Qt.BackgroundRole, Qt.TextAlignmentRole])
+
+
 def color(move):
-    if move == 'red':
-        #Red
-        return QtGui.QColor(214, 102, 102)
-    elif move == 'green':
-        #Green
-        return QtGui.QColor(102, 214, 102)
-    else:
-        #Grey
-        return QtGui.QColor(144, 144, 144)
+    return _COLORS.get(move, _COLORS[None])
+
+
+def brush(move):
+    return _BRUSHES.get(move, _BRUSHES[None])
+
+
+def _same(a, b):
+    #Whether a cell still shows the same value, nan included
+    return a is b or a == b or (a != a and b != b)
+
+
+def _runs(indices):
+    #Sorted indices grouped into (first, last) runs of consecutive ones
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return runs
 
 
 def getAttrRecursive(obj, attr):
@@ -83,14 +108,140 @@ class ObjListTableModel(QAbstractTableModel):
     :param isRowObjects (bool): If True, objects are rows and properties are columns, otherwise vice-versa.
     :param isDynamic (bool): If True, objects can be inserted/deleted, otherwise not.
     :param templateObject (object): Object that will be deep copied to create new objects when inserting into the list.
+    :param key (function): What identifies an object from one refresh() to the next, for lists of immutable
+        records that are replaced whenever they change. Only the replaced ones are read again. If None,
+        objects are told apart by identity and all of them are read on every refresh().
+
+    The views are shown a snapshot of the list and of the values of every cell, so the list and
+    its objects can change from any thread. Call refresh() from the GUI thread to bring the snapshot
+    up to date, it only signals the objects inserted or removed and the cells whose value changed.
     """
-    def __init__(self, objects=None, properties=None, isRowObjects=True, isDynamic=True, templateObject=None, parent=None):
+    def __init__(self, objects=None, properties=None, isRowObjects=True, isDynamic=True, templateObject=None, parent=None,
+            key=None):
         QAbstractTableModel.__init__(self, parent)
         self.objects = objects if (objects is not None) else []
-        self.properties = properties if (properties is not None) else []
+        self.key = key
+        self.properties = properties
         self.isRowObjects = isRowObjects
         self.isDynamic = isDynamic
         self.templateObject = templateObject
+        self._snapshot()
+
+
+    @property
+    def properties(self):
+        return self._properties
+
+
+    @properties.setter
+    def properties(self, properties):
+        #Each 'attr' path is compiled into a getter once, data() only calls it
+        self._properties = properties if (properties is not None) else []
+        self._getters = [attrgetter(prop['attr']) if 'attr' in prop else None for prop in self._properties]
+        if hasattr(self, '_shown'):
+            self.beginResetModel()
+            self._snapshot()
+            self.endResetModel()
+
+
+    def _read(self, obj):
+        #Values of the object's cells, then its direction for the background
+        values = []
+        for getter in self._getters:
+            try:
+                values.append(getter(obj))
+            except:
+                values.append(None)
+        values.append(getattr(obj, 'D', None))
+        return values
+
+
+    def _snapshot(self):
+        #Takes the list and every value as they are now, for models that were just reset
+        self._shown = list(self.objects)
+        self._values = [self._read(obj) for obj in self._shown]
+
+
+    def _cells(self, objects, properties):
+        #Top left and bottom right indexes of a range of objects and properties
+        if self.isRowObjects:
+            return self.index(objects[0], properties[0]), self.index(objects[1], properties[1])
+        return self.index(properties[0], objects[0]), self.index(properties[1], objects[1])
+
+
+    def refresh(self, objects = None):
+        '''
+        Updates the snapshot the views are shown to the current list and values
+
+        Removed objects are signalled with beginRemoveRows, new ones with beginInsertRows
+        (columns if objects are columns), each run of consecutive ones at once. Then only the
+        cells whose value changed are signalled, a range per object, the whole object if its
+        direction changed. Objects that moved around reset the model.
+
+        Args:
+            objects (sequence): the list to show from now on, self.objects if None
+
+        Returns:
+            (int): objects and cells that changed
+        '''
+        if objects is not None:
+            self.objects = list(objects)
+        objects = list(self.objects)
+        key = self.key or id
+        shown, values = self._shown, self._values
+        current = set(map(key, objects))
+        changes = 0
+
+        gone = [i for i, obj in enumerate(shown) if key(obj) not in current]
+        for first, last in reversed(_runs(gone)):
+            if self.isRowObjects:
+                self.beginRemoveRows(QModelIndex(), first, last)
+            else:
+                self.beginRemoveColumns(QModelIndex(), first, last)
+            del shown[first:last + 1], values[first:last + 1]
+            if self.isRowObjects:
+                self.endRemoveRows()
+            else:
+                self.endRemoveColumns()
+            changes += last - first + 1
+
+        kept = set(map(key, shown))
+        new = [i for i, obj in enumerate(objects) if key(obj) not in kept]
+        if [key(obj) for obj in objects if key(obj) in kept] != [key(obj) for obj in shown]:
+            self.beginResetModel()
+            self._snapshot()
+            self.endResetModel()
+            return changes + len(objects)
+        for first, last in _runs(new):
+            if self.isRowObjects:
+                self.beginInsertRows(QModelIndex(), first, last)
+            else:
+                self.beginInsertColumns(QModelIndex(), first, last)
+            shown[first:first] = objects[first:last + 1]
+            values[first:first] = [self._read(obj) for obj in objects[first:last + 1]]
+            if self.isRowObjects:
+                self.endInsertRows()
+            else:
+                self.endInsertColumns()
+            changes += last - first + 1
+
+        inserted = set(new)
+        full = (0, len(self._getters) - 1)
+        for i, obj in enumerate(objects):
+            #Records that weren't replaced can't have changed
+            if i in inserted or (self.key is not None and obj is shown[i]):
+                continue
+            shown[i] = obj
+            old, now = values[i], self._read(obj)
+            changed = [j for j, (a, b) in enumerate(zip(old, now)) if not _same(a, b)]
+            if not changed:
+                continue
+            values[i] = now
+            changes += len(changed)
+            span = full if changed[-1] == len(self._getters) else (changed[0], changed[-1])
+            if span[1] >= 0:
+                self.dataChanged.emit(*self._cells((i, i), span))
+        return changes
 
 
     def getObject(self, index):
@@ -98,7 +249,7 @@ class ObjListTableModel(QAbstractTableModel):
             return None
         objectIndex = index.row() if self.isRowObjects else index.column()
         try:
-            return self.objects[objectIndex]
+            return self._shown[objectIndex]
         except IndexError:
             return None
 
@@ -114,29 +265,35 @@ class ObjListTableModel(QAbstractTableModel):
 
 
     def rowCount(self, parent = None, *args, **kwargs):
-        return len(self.objects) if self.isRowObjects else len(self.properties)
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self._shown) if self.isRowObjects else len(self.properties)
 
 
     def columnCount(self, parent = None, *args, **kwargs):
-        return len(self.properties) if self.isRowObjects else len(self.objects)
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.properties) if self.isRowObjects else len(self._shown)
 
 
     def data(self, index, role = Qt.DisplayRole):
-        if not index.isValid():
+        #Called for every cell and role on each paint, the roles it doesn't handle don't get past the first line
+        if role not in _ROLES or not index.isValid():
             return None
-        obj = self.getObject(index)
-        prop = self.getProperty(index)
-        if role == Qt.BackgroundRole:
-            return color(obj.D)
         if role == Qt.TextAlignmentRole:
             return Qt.AlignCenter
-        if (obj is None) or (prop is None):
-            return None
+        if self.isRowObjects:
+            objectIndex, propertyIndex = index.row(), index.column()
+        else:
+            objectIndex, propertyIndex = index.column(), index.row()
         try:
-            if role in [Qt.DisplayRole, Qt.EditRole]:
-                return getAttrRecursive(obj, prop['attr'])
-        except:
+            values = self._values[objectIndex]
+        except IndexError:
             return None
+        if role == Qt.BackgroundRole:
+            return brush(values[-1])
+        if propertyIndex < len(self._getters):
+            return values[propertyIndex]
         return None
 
 
@@ -152,6 +309,7 @@ class ObjListTableModel(QAbstractTableModel):
             if action is not None:
                 if action == "button":
                     getAttrRecursive(obj, prop['attr'])()  # Call obj.attr()
+                    self.refresh()
                     return True
                 elif action == "fileDialog":
                     pass  # File loading handled via @property.setter obj.attr below. Otherwise just sets the file name text.
@@ -161,6 +319,7 @@ class ObjListTableModel(QAbstractTableModel):
                 if (QT_VERSION_STR[0] == '4') and (type(value) == QString):
                     value = str(value)
                 setAttrRecursive(obj, prop['attr'], value)
+                self.refresh()
                 return True
         except:
             return False
@@ -193,7 +352,7 @@ class ObjListTableModel(QAbstractTableModel):
                 return None
         else:
             # Display object indices (1-based).
-            return (section + 1) if (0 <= section < len(self.objects)) else None
+            return (section + 1) if (0 <= section < len(self._shown)) else None
 
 
     def insertObjects(self, i, num = 1):
@@ -210,6 +369,7 @@ class ObjListTableModel(QAbstractTableModel):
             elif len(self.objects):
                 copyIndex = min([max([0, objectIndex]), len(self.objects) - 1])  # Clamp objectIndex to a valid object index.
                 self.objects.insert(objectIndex, copy.deepcopy(self.objects[copyIndex]))
+        self._snapshot()
         if self.isRowObjects:
             self.endInsertRows()
         else:
@@ -229,10 +389,12 @@ class ObjListTableModel(QAbstractTableModel):
         if self.isRowObjects:
             self.beginRemoveRows(QModelIndex(), i, i + num - 1)
             del self.objects[i:i+num]
+            self._snapshot()
             self.endRemoveRows()
         else:
             self.beginRemoveColumns(QModelIndex(), i, i + num - 1)
             del self.objects[i:i+num]
+            self._snapshot()
             self.endRemoveColumns()
         return True
 
@@ -256,6 +418,7 @@ class ObjListTableModel(QAbstractTableModel):
                 j = moveToIndex + i
                 j = min([max([0, j]), len(self.objects)])  # Clamp j to within [0, # of objects].
                 self.objects.insert(j, obj)
+            self._snapshot()
             self.endResetModel()
             return True
         except:
@@ -268,6 +431,7 @@ class ObjListTableModel(QAbstractTableModel):
                 self.templateObject = self.objects[0]
             self.beginResetModel()
             del self.objects[:]
+            self._snapshot()
             self.endResetModel()
 
 
@@ -417,30 +581,176 @@ class ObjListTable(QTableView):
             pass
 
 
-class Transactions(QTableWidget):
-    #Custom QTableWidget 
+class TransactionStore():
+    '''
+    Every buy and its sell, one row per position, kept in columns
+
+    Each column is a numpy array that doubles when full, symbols are stored as codes into
+    `symbols`. The open positions are indexed by symbol, so recording a buy or its sell
+    takes the same time however many rows there are.
+
+    Args:
+        capacity (int): rows allocated up front
+    '''
+    def __init__(self, capacity = 1024):
+        self.capacity = capacity
+        self.count = 0
+        self.symbols = []
+        self.code = np.zeros(capacity, dtype = np.int32)
+        self.qty = np.zeros(capacity, dtype = np.int64)
+        self.buy = np.full(capacity, np.nan)
+        self.sell = np.full(capacity, np.nan)
+
+        self._codes = {}        #Symbol to its code
+        self._open = {}         #Symbol to the row of its open position
+
+
+    def __len__(self):
+        return self.count
+
+
+    def _grow(self):
+        self.capacity *= 2
+        for name, fill in (('code', 0), ('qty', 0), ('buy', np.nan), ('sell', np.nan)):
+            old = getattr(self, name)
+            grown = np.full(self.capacity, fill, dtype = old.dtype)
+            grown[:self.count] = old[:self.count]
+            setattr(self, name, grown)
+
+
+    def bought(self, symbol, qty, price):
+        '''
+        Records a buy, opening a position
+
+        Args:
+            symbol (str): ticker symbol
+            qty (int): shares bought
+            price (float): price paid per share
+
+        Returns:
+            (int): row of the position
+        '''
+        if self.count == self.capacity:
+            self._grow()
+        code = self._codes.get(symbol)
+        if code is None:
+            code = self._codes[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        row = self.count
+        self.code[row], self.qty[row], self.buy[row] = code, qty, price
+        self.count += 1
+        self._open[symbol] = row
+        return row
+
+
+    def sold(self, symbol, price):
+        '''
+        Records the sell of the open position of a ticker
+
+        Args:
+            symbol (str): ticker symbol
+            price (float): price sold at per share
+
+        Returns:
+            (int): row of the position, None if there's none open
+        '''
+        row = self._open.pop(symbol, None)
+        if row is not None:
+            self.sell[row] = price
+        return row
+
+
+    def profit(self, row):
+        #Profit of a closed position, nan while it's open
+        return self.qty[row] * (self.sell[row] - self.buy[row])
+
+
+class TransactionModel(QAbstractTableModel):
+    '''
+    Qt model over a TransactionStore, values are read from its columns only for the cells
+    the view paints. Closed positions are colored by whether they made money
+
+    Args:
+        store (TransactionStore): transactions shown, a new one if None
+    '''
+    HEADERS = ('Tick', 'Qty', 'Purchase', 'Sell')
+
+    def __init__(self, store = None, parent = None):
+        QAbstractTableModel.__init__(self, parent)
+        self.store = store if store is not None else TransactionStore()
+
+
+    def rowCount(self, parent = None, *args, **kwargs):
+        if parent is not None and parent.isValid():
+            return 0
+        return self.store.count
+
+
+    def columnCount(self, parent = None, *args, **kwargs):
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+
+    def data(self, index, role = Qt.DisplayRole):
+        if role not in _ROLES or not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        store, row, column = self.store, index.row(), index.column()
+        if role == Qt.BackgroundRole:
+            profit = store.profit(row)
+            if profit != profit:
+                return None
+            return brush('green' if profit > 0 else 'red')
+        if column == 0:
+            return store.symbols[store.code[row]]
+        if column == 1:
+            return int(store.qty[row])
+        price = float(store.buy[row] if column == 2 else store.sell[row])
+        return '%.2f' % price if price == price else ''
+
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.HEADERS[section] if 0 <= section < len(self.HEADERS) else None
+        return section + 1
+
+
+    def bought(self, symbol, qty, price):
+        row = self.store.count
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.bought(symbol, qty, price)
+        self.endInsertRows()
+
+
+    def sold(self, symbol, price):
+        row = self.store.sold(symbol, price)
+        if row is not None:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+
+class Transactions(QTableView):
+    '''
+    The transaction log, a view over a TransactionModel
+
+    Rows have a fixed height, so the view only ever lays out and paints the rows on
+    screen, whatever the number of transactions.
+    '''
     def __init__(self, parent = None):
-        QTableWidget.__init__(self, parent)
+        QTableView.__init__(self, parent)
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 6)
+        self.setModel(TransactionModel(parent = self))
 
 
     def bought(self, tick):
-        _row = self.rowCount()
-        self.insertRow(_row)
-        data = [tick.T, tick.PQ, tick.C, '']
-        for item in range(len(data)):
-            tItem = QTableWidgetItem(str(data[item]))
-            tItem.setTextAlignment(Qt.AlignCenter)
-            self.setItem(_row, item, tItem)
+        #Records the buy of a Tick, or of a Row of one
+        self.model().bought(tick.T, tick.Q, tick.AP)
 
 
     def sold(self, tick):
-        _row = self.findItems(tick.T, Qt.MatchExactly).row()
-        tItem = QTableWidgetItem(tick.C)
-        tItem.setTextAlignment(Qt.AlignCenter)
-        self.setItem(_row, 4, tItem)
-
-        for j in range(self.columnCount()):
-            if tick.prevProfit > 0:
-                self.item(_row, j).setBackground(color('green'))
-            else:
-                self.item(_row, j).setBackground(color('red'))
+        #Records the sell of a Tick, or of a Row of one, at its current price
+        self.model().sold(tick.T, tick.C)
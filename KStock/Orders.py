@@ -0,0 +1,218 @@
+import itertools, logging, queue, random, threading, time
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class Order(namedtuple('Order', ['id', 'side', 'symbol', 'quantity', 'price', 'submitted'])):
+    #An order intent, side is 'buy' or 'sell', submitted is the time.monotonic() it was made
+    __slots__ = ()
+
+
+class Ack(namedtuple('Ack', ['order', 'ok', 'response', 'latency'])):
+    #What the broker made of an order, response is its answer or the exception, latency in seconds
+    __slots__ = ()
+
+
+class RateLimiter():
+    '''
+    Token bucket, lets `rate` calls a second through with bursts of up to `burst`
+
+    Args:
+        rate (float): calls per second
+        burst (int): calls that can go through back to back
+    '''
+    def __init__(self, rate, burst = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def acquire(self):
+        #Blocks until a call is allowed through
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class OrderGateway():
+    '''
+    Takes order intents without blocking and sends them to the broker in the background
+
+    buy() and sell() queue the order and return a Future of its Ack straight away. A
+    dispatcher thread takes the orders in the order they came, waits on the rate limit
+    and hands them to a pool of `workers`, so a slow order only holds up its own worker.
+    Every Ack is also passed to `onAck`, from the worker thread.
+
+    Once closed, orders are refused: their Future already holds a failed Ack.
+
+    Args:
+        broker: anything with Robinhood's place_limit_buy_order/place_limit_sell_order
+        rate (float): max orders sent a second
+        burst (int): orders that can be sent back to back
+        workers (int): max orders in flight
+        onAck (function): called with every Ack
+    '''
+    def __init__(self, broker, rate = 5, burst = 5, workers = 8, onAck = None):
+        self.broker = broker
+        self.limiter = RateLimiter(rate, burst)
+        self.onAck = onAck
+        self.sent, self.failed = 0, 0
+        self._countLock = threading.Lock()
+
+        self._ids = itertools.count(1)
+        self._closed = False
+        #Set when close() gave up waiting, the orders still queued are failed instead of sent
+        self._cancel = threading.Event()
+        self._closeLock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._pool = ThreadPoolExecutor(max_workers = workers, thread_name_prefix = 'Order')
+        self._dispatcher = threading.Thread(target = self._dispatch, name = 'OrderGateway', daemon = True)
+        self._dispatcher.start()
+
+
+    def buy(self, symbol, quantity, price):
+        '''
+        Queues a limit buy, good for the day
+
+        Args:
+            symbol (str): ticker symbol
+            quantity (int): shares
+            price (float): limit price
+
+        Returns:
+            (Future): of the order's Ack
+        '''
+        return self._submit('buy', symbol, quantity, price)
+
+
+    def sell(self, symbol, quantity, price):
+        #Same as buy(), for a limit sell
+        return self._submit('sell', symbol, quantity, price)
+
+
+    def _submit(self, side, symbol, quantity, price):
+        order = Order(next(self._ids), side, symbol, quantity, price, time.monotonic())
+        future = Future()
+        with self._closeLock:
+            if not self._closed:
+                self._queue.put((order, future))
+                return future
+        self._fail(order, future, RuntimeError('order gateway is closed'))
+        return future
+
+
+    def _dispatch(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                #Whatever is in flight still finishes
+                self._pool.shutdown(wait = False)
+                return
+            if self._cancel.is_set():
+                self._fail(*item, RuntimeError('order gateway closed before it was sent'))
+                continue
+            self.limiter.acquire()
+            self._pool.submit(self._send, *item)
+
+
+    def _fail(self, order, future, error):
+        #Resolves an order that was never sent with a failed Ack
+        logging.error('Order {} {} {} at {} not sent: {}'.format(order.side, order.quantity, order.symbol, order.price, error))
+        self._acked(future, Ack(order, False, error, time.monotonic() - order.submitted))
+
+
+    def _send(self, order, future):
+        place = self.broker.place_limit_buy_order if order.side == 'buy' else self.broker.place_limit_sell_order
+        try:
+            response = place(symbol = order.symbol, time_in_force = 'GFD', price = order.price, quantity = order.quantity)
+            ack = Ack(order, True, response, time.monotonic() - order.submitted)
+        except Exception as e:
+            logging.error('Order {} {} {} at {} failed: {}'.format(
+                order.side, order.quantity, order.symbol, order.price, e))
+            ack = Ack(order, False, e, time.monotonic() - order.submitted)
+        self._acked(future, ack)
+
+
+    def _acked(self, future, ack):
+        with self._countLock:
+            if ack.ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+
+        future.set_result(ack)
+        if self.onAck is not None:
+            try:
+                self.onAck(ack)
+            except Exception:
+                logging.exception('Order acknowledgement handler failed')
+
+
+    def close(self, wait = True, timeout = None):
+        '''
+        Stops taking orders, the ones already queued are still sent. Only the first call
+        does anything
+
+        Args:
+            wait (bool): blocks until the queued orders are sent and acknowledged
+            timeout (float): max seconds to wait, the orders not sent by then are failed
+
+        Returns:
+            None
+        '''
+        with self._closeLock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if wait:
+            self._dispatcher.join(timeout)
+            if self._dispatcher.is_alive():
+                self._cancel.set()
+            else:
+                self._pool.shutdown(wait = timeout is None)
+
+
+class MockBroker():
+    '''
+    Stands in for Robinhood when placing orders, nothing leaves the process
+
+    Args:
+        latency (float): seconds each order takes, give or take half of it
+        failures (float): share of the orders that fail
+    '''
+    def __init__(self, latency = 0.2, failures = 0):
+        self.latency = latency
+        self.failures = failures
+        self.orders = []
+        self._lock = threading.Lock()
+
+
+    def _place(self, side, symbol, time_in_force, price, quantity):
+        time.sleep(self.latency * random.uniform(0.5, 1.5))
+        if random.random() < self.failures:
+            raise ConnectionError('mock broker rejected the order')
+        with self._lock:
+            order = {
+                'id' : len(self.orders) + 1, 'side' : side, 'symbol' : symbol, 'time_in_force' : time_in_force,
+                'price' : price, 'quantity' : quantity, 'state' : 'confirmed'
+            }
+            self.orders.append(order)
+        return order
+
+
+    def place_limit_buy_order(self, symbol, time_in_force, price, quantity):
+        return self._place('buy', symbol, time_in_force, price, quantity)
+
+
+    def place_limit_sell_order(self, symbol, time_in_force, price, quantity):
+        return self._place('sell', symbol, time_in_force, price, quantity)
@@ -0,0 +1,15 @@
+'''
+Where everything written at runtime goes, out of the source tree
+
+The bar store, the quote journal, the ledger, the probe cache and the symbol index
+all live in one directory, data/ next to the KStock package unless KSTOCK_DATA says
+otherwise. It's ignored by git, and created by whatever writes to it first.
+'''
+import os
+
+DIR = os.environ.get('KSTOCK_DATA') or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def path(name):
+    #Path of a runtime file in the data directory
+    return os.path.join(DIR, name)
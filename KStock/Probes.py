@@ -0,0 +1,159 @@
+import json, logging, os, threading, time
+from concurrent.futures import Future, TimeoutError
+import Paths
+
+#Seconds a probe gets before it counts as failed
+DEADLINE = 3
+#Seconds a pass is trusted for, restarts within it skip the probe
+TTL = 300
+CACHE = Paths.path('probes.json')
+
+
+def nasdaq():
+    #A quote can be scraped
+    from resources.NASDAQ import tickCurrents
+    quote = tickCurrents('NVDA')
+    return bool(quote and quote.LTP)
+
+
+def robinhood():
+    #The Robinhood client can be set up
+    from Robinhood import Robinhood
+    Robinhood()
+    return True
+
+
+PROBES = {'NASDAQ' : nasdaq, 'Robinhood' : robinhood}
+
+
+class SelfTest():
+    '''
+    Checks the connections trading depends on, every probe at once on its own thread
+
+    start() returns straight away. Every probe has until `deadline` seconds after it
+    was started to pass, one that raises, returns False or runs late has failed, and
+    its thread is left to finish on its own. `onResult` is called with the name and
+    outcome of each probe as soon as it's known, from the probe's thread.
+
+    Passes are kept in `cache` for `ttl` seconds, probes that passed within it aren't
+    run again and pass straight away.
+
+    Args:
+        probes (dict): name to a function returning whether it passed
+        onResult (function): called with every (name, passed)
+        deadline (float): seconds each probe gets
+        ttl (float): seconds a pass is trusted for, 0 to always probe
+        cache (str): file the passes are kept in, None to keep none
+    '''
+    def __init__(self, probes = None, onResult = None, deadline = DEADLINE, ttl = TTL, cache = CACHE):
+        self.probes = probes if probes is not None else PROBES
+        self.onResult = onResult
+        self.deadline = deadline
+        self.ttl = ttl
+        self.cache = cache
+        self.results = {}
+
+        self._futures = {}
+        self._lock = threading.Lock()
+
+
+    def _passes(self):
+        #Passes still trusted, by probe name
+        if not self.cache or not self.ttl or not os.path.isfile(self.cache):
+            return {}
+        try:
+            with open(self.cache, 'r') as fileIn:
+                passes = json.load(fileIn)
+        except (OSError, ValueError):
+            return {}
+        now = time.time()
+        return {name : stamp for name, stamp in passes.items() if 0 <= now - stamp < self.ttl}
+
+
+    def _save(self):
+        if not self.cache or not self.ttl:
+            return
+        with self._lock:
+            passes = dict(self._passes(), **{name : time.time() for name, ok in self.results.items() if ok})
+            for name, ok in self.results.items():
+                if not ok:
+                    passes.pop(name, None)
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.cache)), exist_ok = True)
+                with open(self.cache, 'w') as fileOut:
+                    json.dump(passes, fileOut)
+            except OSError as e:
+                logging.error('Probe results not cached: {}'.format(e))
+
+
+    def start(self, names = None):
+        '''
+        Starts the probes, the cached ones pass right away
+
+        Args:
+            names (list): probes to run, every one if None. A probe in it is run even
+                if it's cached, to retry it
+
+        Returns:
+            (dict): probe name to a Future of whether it passed
+        '''
+        cached = self._passes() if names is None else {}
+        futures = {}
+        for name in (names if names is not None else self.probes):
+            future = futures[name] = Future()
+            if name in cached:
+                logging.info('{} passed {:.0f}s ago, not probed'.format(name, time.time() - cached[name]))
+                self._finish(name, future, True, save = False)
+                continue
+            probe = threading.Thread(target = self._probe, args = (name, future), name = 'Probe ' + name, daemon = True)
+            probe.start()
+            #Fails it once the deadline is up, if the probe hasn't answered by then
+            timer = threading.Timer(self.deadline, self._finish, (name, future, False))
+            timer.daemon = True
+            timer.start()
+        self._futures.update(futures)
+        return futures
+
+
+    def _probe(self, name, future):
+        try:
+            ok = bool(self.probes[name]())
+        except Exception as e:
+            logging.error('{} probe failed: {}'.format(name, e))
+            ok = False
+        self._finish(name, future, ok)
+
+
+    def _finish(self, name, future, ok, save = True):
+        #Only the first of the probe and its deadline counts
+        with self._lock:
+            if future.done():
+                return
+            future.set_result(ok)
+            self.results[name] = ok
+        if not ok:
+            logging.error('{} probe failed'.format(name))
+        if save:
+            self._save()
+        if self.onResult is not None:
+            self.onResult(name, ok)
+
+
+    def wait(self):
+        '''
+        Blocks until every started probe passed or failed, at most the deadline
+
+        Returns:
+            (dict): probe name to whether it passed
+        '''
+        for future in list(self._futures.values()):
+            try:
+                future.result(self.deadline + 1)
+            except TimeoutError:
+                pass
+        return dict(self.results)
+
+
+    def failed(self):
+        #Names of the probes that failed
+        return {name for name, ok in self.results.items() if not ok}
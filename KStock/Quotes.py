@@ -0,0 +1,142 @@
+import threading, time
+from concurrent.futures import Future, ThreadPoolExecutor
+import resources.providers as providers
+
+
+class QuoteCache():
+    '''
+    Holds the latest quote of each ticker for `ttl` seconds
+
+    Callers asking for a ticker that is already being fetched wait on that fetch
+    instead of starting their own, so a ticker costs at most one request per `ttl`
+    no matter how many decisions read it. Failed fetches aren't kept, the others
+    are recorded in the journal if there is one.
+
+    Args:
+        fetch (function): gets the metrics of a ticker, False if it failed. Defaults to
+            the quote() of the current provider
+        ttl (float): seconds a quote stays fresh, keep it under the update cycle. Set it
+            to 0 when replaying so every read moves the recording forward
+        journal (Journal): where every fetched quote is recorded, nowhere if None
+    '''
+    def __init__(self, fetch = None, ttl = 4, journal = None):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.journal = journal
+        self.hits, self.misses, self.coalesced = 0, 0, 0
+
+        self._quotes = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+
+    def get(self, tick, fetch = None):
+        '''
+        Gets the metrics of the ticker, from the cache if fresh enough
+
+        Args:
+            tick (str): ticker symbol
+            fetch (function): used instead of `self.fetch` if the ticker has to be fetched
+
+        Returns:
+            (Quote): metrics of the tick, False if the fetch failed
+        '''
+        owner = False
+        with self._lock:
+            entry = self._quotes.get(tick)
+            if entry and time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+                return entry[1]
+
+            pending = self._inflight.get(tick)
+            if pending is not None:
+                self.coalesced += 1
+            else:
+                pending = self._inflight[tick] = Future()
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return pending.result()
+
+        quote = False
+        try:
+            quote = (fetch or self.fetch or providers.current().quote)(tick)
+        finally:
+            with self._lock:
+                if quote:
+                    self._quotes[tick] = (time.monotonic(), quote)
+                del self._inflight[tick]
+            pending.set_result(quote)
+
+        if quote and self.journal is not None:
+            self.journal.record(tick, quote)
+        return quote
+
+
+    def invalidate(self, tick = None):
+        #Drops the quote of the ticker, or every quote if None
+        with self._lock:
+            if tick is None:
+                self._quotes.clear()
+            else:
+                self._quotes.pop(tick, None)
+
+
+    def stats(self):
+        return {'hits' : self.hits, 'misses' : self.misses, 'coalesced' : self.coalesced}
+
+
+#Shared by every Tick and the QuoteEngine
+quoteCache = QuoteCache()
+
+
+class QuoteEngine():
+    '''
+    Fetches the current quotes of every ticker in one go
+
+    Each ticker is requested on a bounded pool of threads, which the live provider
+    serves over one keep-alive session, so a whole watchlist costs roughly one round
+    trip instead of one per ticker. Quotes go through the cache, so the Ticks reading
+    it later in the cycle don't refetch.
+
+    Args:
+        provider (Provider): where the quotes come from, the current provider if None
+        workers (int): max number of requests in flight
+        cache (QuoteCache): where the quotes are kept, the shared one if None
+    '''
+    def __init__(self, provider = None, workers = 16, cache = None):
+        self.provider = provider
+        self.cache = cache if cache is not None else quoteCache
+        self.pool = ThreadPoolExecutor(max_workers = workers)
+
+
+    def quote(self, tick):
+        '''
+        Gets the current metrics of a single ticker
+
+        Args:
+            tick (str): ticker symbol
+
+        Returns:
+            (Quote): metrics of the tick, False if the fetch failed
+        '''
+        return (self.provider or providers.current()).quote(tick)
+
+
+    def fetch(self, ticks):
+        '''
+        Gets the current metrics of every ticker concurrently
+
+        Args:
+            ticks (list): ticker symbols, duplicates are only fetched once
+
+        Returns:
+            (dict): ticker symbol to its Quote, False for the failed ones
+        '''
+        ticks = list(dict.fromkeys(ticks))
+        return dict(zip(ticks, self.pool.map(lambda tick : self.cache.get(tick, self.quote), ticks)))
+
+
+    def close(self):
+        self.pool.shutdown(wait = False)
@@ -0,0 +1,179 @@
+import heapq, itertools, logging, threading, time
+import numpy as np
+
+#Seconds between polls of a symbol, by what it's doing. Only NEAR_SL is sub-second, a
+#held symbol is checked every second until it gets near its stop loss or starts to reverse
+NEAR_SL = 0.5           #Held and within 2% of its stop loss, or about to reverse
+HELD = 1                #Held
+WARM = 3                #Queued with a buy reversal under way
+IDLE = 10               #Queued and nothing going on
+#Share of the budget kept for the queued symbols when the held ones want more
+QUEUED_SHARE = 0.1
+#Seconds between polls of every symbol under the fixed cycle, sets the default budget
+CYCLE = 5
+#How close to the stop loss counts as near
+SL_MARGIN = 0.02
+#Change between polls that counts as volatile, halves the interval
+VOLATILE = 0.002
+#Samples of history the volatility is measured on
+SAMPLES = 20
+
+
+class PollScheduler():
+    '''
+    Gives every symbol its own polling cadence and hands out the ones that are due
+
+    The cadence of a Tick depends on its position (held near the stop loss, held,
+    queued with a reversal under way, idle), shortened by how much its price has been
+    moving. The budget is never exceeded: when every symbol at its cadence would need
+    more than `budget` requests a second, the queued ones are slowed down to fit first.
+    The held ones are only slowed when they alone would take more than what's left
+    after QUEUED_SHARE of the budget, which is logged. Due symbols are kept in a heap.
+
+    A symbol handed out by due() isn't handed out again until done() reschedules it,
+    so a slow fetch never piles up polls of the same symbol.
+
+    Args:
+        budget (float): max requests per second over every symbol, if None as many as
+            polling every symbol once a CYCLE
+    '''
+    def __init__(self, budget = None):
+        self.budget = budget
+        self.scale = 1                  #What the queued intervals are stretched by to fit the budget
+        self.heldScale = 1              #Same for the held ones, 1 unless the budget is short of them
+
+        self._ticks = {}                #Symbol to its Tick, for the scheduled ones
+        self._due = {}                  #Symbol to when it's due, stale heap entries don't match
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+
+    def __len__(self):
+        return len(self._ticks)
+
+
+    def interval(self, tick):
+        '''
+        Seconds until a symbol should be polled again, before fitting the budget
+
+        Args:
+            tick (Tick): the symbol
+
+        Returns:
+            (float): interval
+        '''
+        if tick.Q:
+            near = tick.sellRev > 0 or (tick.SL and tick.C and tick.C <= tick.SL * (1 + SL_MARGIN))
+            base = NEAR_SL if near else HELD
+        else:
+            base = WARM if tick.buyRev > 0 else IDLE
+
+        history = tick.history
+        if history is not None and len(history) > 2:
+            prices = history.last(SAMPLES)[1]
+            with np.errstate(invalid = 'ignore', divide = 'ignore'):
+                moves = np.abs(np.diff(prices) / prices[:-1])
+            volatility = np.nanmean(moves) if np.isfinite(moves).any() else 0
+            base /= 1 + volatility / VOLATILE
+        return max(NEAR_SL, base)
+
+
+    def _fit(self):
+        #Stretches the intervals so every symbol at its cadence stays within the budget,
+        #the queued ones first
+        held = queued = 0
+        for tick in self._ticks.values():
+            if tick.Q:
+                held += 1 / self.interval(tick)
+            else:
+                queued += 1 / self.interval(tick)
+        budget = self.budget if self.budget is not None else len(self._ticks) / CYCLE
+        if not self._ticks or budget <= 0:
+            #Nothing to fit, or nothing to fit it in
+            self.scale = self.heldScale = 1
+            return
+        heldScale = max(1, held / (budget - min(queued, budget * QUEUED_SHARE)))
+        if heldScale > 1 and self.heldScale == 1:
+            logging.warning('Polling budget of {:.1f}/s is short of the {:.1f}/s the held symbols need, '
+                'slowing them {:.1f}x'.format(budget, held, heldScale))
+        self.heldScale = heldScale
+        self.scale = max(1, queued / (budget - held / heldScale)) if queued else 1
+
+
+    def _scaled(self, tick):
+        #Interval of a symbol once fitted to the budget
+        return self.interval(tick) * (self.heldScale if tick.Q else self.scale)
+
+
+    def _push(self, tick, when):
+        self._due[tick.T] = when
+        heapq.heappush(self._heap, (when, next(self._seq), tick.T))
+
+
+    def add(self, tick, now = None):
+        '''
+        Schedules a symbol, due right away
+
+        Args:
+            tick (Tick): the symbol
+
+        Returns:
+            None
+        '''
+        with self._lock:
+            self._ticks[tick.T] = tick
+            self._push(tick, time.monotonic() if now is None else now)
+
+
+    def remove(self, tick):
+        with self._lock:
+            self._ticks.pop(tick.T, None)
+            self._due.pop(tick.T, None)
+
+
+    def due(self, now = None):
+        '''
+        Takes every symbol whose time has come off the schedule
+
+        Args:
+            now (float): time.monotonic(), now if None
+
+        Returns:
+            (list): Ticks to poll, most overdue first
+        '''
+        now = time.monotonic() if now is None else now
+        ticks = []
+        with self._lock:
+            self._fit()
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                when, _, T = heapq.heappop(heap)
+                if self._due.get(T) == when:
+                    del self._due[T]
+                    ticks.append(self._ticks[T])
+        return ticks
+
+
+    def done(self, ticks, now = None):
+        '''
+        Puts polled symbols back on the schedule, at their current cadence
+
+        Args:
+            ticks (list): Ticks handed out by due(), the ones removed since are dropped
+            now (float): time.monotonic(), now if None
+
+        Returns:
+            None
+        '''
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for tick in ticks:
+                if self._ticks.get(tick.T) is tick and tick.T not in self._due:
+                    self._push(tick, now + self._scaled(tick))
+
+
+    def rate(self):
+        #Requests per second the current cadences add up to
+        with self._lock:
+            return sum(1 / self._scaled(tick) for tick in self._ticks.values())
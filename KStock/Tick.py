@@ -1,28 +1,43 @@
-import resources.gfc as gfc
-from resources.NASDAQ import tickCurrents
-import pandas as pd
-import logging, datetime, pytz
+from Quotes import quoteCache
+from Board import BoardField, stopLoss
+from History import History
+import logging, datetime, pytz, time
+
+#Samples of price history kept for a Tick that's traded, about 5 minutes of 5 second
+#updates, enough for the scheduler to measure its volatility. Ticks keep none by default,
+#a few thousand of them with histories would take more memory than everything else
+HISTORY = 64
 
 
 class Tick():
-    def __init__(self, tick, purPrice):
-
-        self.__dict__.update({
-            'T' : tick,                     #Ticker Symbol
-            'C' : '',                       #Current Price
-            'CP' : [],                      #Price Change [$,%]
-            'V' : '',                       #Volume
-            'AV' : '',                      #Average Volume
-            'D' : '',                       #Direction of change
-            'PQ' : 0,                       #Proposed quantity
-            'PC' : '',                      #Previous Close
-            'TD' : [],                      #Todays Data [Low, High]
-            'YD' : [],                      #Years Data [Low, High]
-            'Q' : None,                     #Quantity, once purchased
-            'AP' : None,                    #Average Price, once purchased
-            'SL' : None,                    #Stop Loss, once purchased
-            'tradeable' : True              #Whether we're going to day-trade
-        })
+    #Kept in the columns of a Board when the Tick is put on one
+    C = BoardField('C', '')         #Current Price
+    TH = BoardField('TH', '')       #Todays High
+    PQ = BoardField('PQ', 0, int)   #Proposed quantity
+    Q = BoardField('Q', None, int)  #Quantity, once purchased
+    AP = BoardField('AP')           #Average Price, once purchased
+    SL = BoardField('SL')           #Stop Loss, once purchased
+    pPrice = BoardField('pPrice', 0)
+    buyRev = BoardField('buyRev', 0, int)
+    sellRev = BoardField('sellRev', 0, int)
+    prevProfit = BoardField('prevProfit', 0)
+
+    _boardFields = ('C', 'TH', 'PQ', 'Q', 'AP', 'SL', 'pPrice', 'buyRev', 'sellRev', 'prevProfit')
+
+    #No __dict__, thousands of these are kept around
+    __slots__ = ('T', 'AV', 'tradeable', 'history', '_quote', '_board', '_row') + tuple('_' + name for name in _boardFields)
+
+    def __init__(self, tick, purPrice, history = 0, quote = None):
+        self.T = tick                       #Ticker Symbol
+        self.AV = ''                        #Average Volume
+        self.tradeable = True               #Whether we're going to day-trade
+        #Recent (time, price, volume) of every successful update, none kept if 0
+        self.history = History(history) if history else None
+        self._quote = None                  #Latest Quote, the rest of the metrics are read from it
+        self._board, self._row = None, None
+
+        self.C, self.TH, self.PQ = '', '', 0
+        self.Q, self.AP, self.SL = None, None, None
 
         #Price Reversal Sell Counter
         self.sellRev = 0
@@ -30,43 +45,76 @@ class Tick():
         self.buyRev = 0
         self.pPrice = 0
         self.prevProfit = 0 
-        self.update(purPrice)
+        self.update(purPrice, quote)
+
+
+    #Read straight off the latest Quote, so an update doesn't build any lists
+    @property
+    def CP(self):
+        #Price Change ($, %)
+        return (self._quote.C, self._quote.CP) if self._quote else ()
+
+    @property
+    def V(self):
+        #Volume
+        return self._quote.V if self._quote else ''
+
+    @property
+    def D(self):
+        #Direction of change
+        return self._quote.D if self._quote else ''
+
+    @property
+    def PC(self):
+        #Previous Close
+        return self._quote.PC if self._quote else ''
+
+    @property
+    def TD(self):
+        #Todays Data (Low, High)
+        return (self._quote.TL, self._quote.TH) if self._quote else ()
+
+    @property
+    def YD(self):
+        #Years Data (Low, High)
+        return (self._quote.YL, self._quote.YH) if self._quote else ()
 
 
-    def update(self, purPrice):
+    def update(self, purPrice, data = None):
         '''
         Updates the ticker to its current values
 
         Args:
-            None
+            purPrice (float): how much to spend on the ticker
+            data (Quote): metrics already fetched for the ticker, read from the quote cache if None
 
         Returns:
             (bool): whether the fetch to nasdaq was successful
         '''
-        data = tickCurrents(self.T)
-        if data and type(data['LTP']) == float:
-            self.__dict__.update({
-                'C' : data['LTP'],
-                'CP' : (data['C'], data['CP']),
-                'V' : data['V'],
-                'PC' : data['PC'],
-                'TD' : [data['TL'], data['TH']],
-                'YD' : [data['YL'], data['YH']],
-                'D' : data['D'],
-                'PQ' : int(purPrice / data['LTP'])
-            })
+        if data is None:
+            data = quoteCache.get(self.T)
+        if data and type(data.LTP) == float:
+            #The same Quote again, e.g. handed to purchase() right after update() took it, isn't a new sample
+            fresh = data is not self._quote
+            self._quote = data
+            self.C = data.LTP
+            self.TH = data.TH
+            self.PQ = int(purPrice / data.LTP)
+            if fresh and self.history is not None:
+                self.history.append(time.time(), data.LTP, data.V if type(data.V) == float else float('nan'))
 
             return True
         else: return False
 
 
-    def sell(self, purPrice, tradeStrat, forced = False):
+    def sell(self, purPrice, tradeStrat, forced = False, quote = None):
         '''
         Determines whether to sell the ticker based on the current strategy
 
         Args:
             record (list): tick current data
             tradeStrat (str): current trade strategy
+            quote (Quote): metrics already fetched this cycle, see update()
 
         Returns:
             (bool): determination of whether to sell or not
@@ -84,7 +132,7 @@ class Tick():
             self.Q, self.AP, self.SL = None, None, None
             self.sellRev = 0
         
-        if not self.update(purPrice):
+        if not self.update(purPrice, quote):
             logging.info('{} Fetch Empty'.format(self.T))
             return False
 
@@ -115,13 +163,14 @@ class Tick():
         return False
 
 
-    def purchase(self, purPrice, tradeStrat, forced = False, rhood = False):
+    def purchase(self, purPrice, tradeStrat, forced = False, rhood = False, quote = None):
         '''
         Determines whether to purchase the ticker based on the current strategy
 
         Args:
             record (list): tick current data
             tradeStrat (str): current trade strategy
+            quote (Quote): metrics already fetched this cycle, see update()
 
         Returns:
             (bool): determination of whether to buy or not
@@ -137,13 +186,13 @@ class Tick():
             ''' 
             self.buyRev = 0
             if not rhood:
-                self.Q, self.AP, self.SL = self.PQ, self.C, round(self.C - (self.C * 0.1), 2)
+                self.Q, self.AP, self.SL = self.PQ, self.C, stopLoss(self.C)
             else:
                 self.Q, self.AP, self.SL = rhood
                 self.tradeable = False
                 
 
-        if not self.update(purPrice):
+        if not self.update(purPrice, quote):
             logging.info('{} Fetch Empty'.format(self.T))
             return False
 
@@ -192,4 +241,4 @@ class Tick():
 if __name__ == '__main__':
     tick = 'NVDA'
     x = Tick(tick, 1000)
-    print(x.__dict__)
\ No newline at end of file
+    print({name : getattr(x, name) for name in ('T', 'C', 'CP', 'V', 'D', 'PQ', 'PC', 'TD', 'YD', 'Q', 'AP', 'SL')})
\ No newline at end of file
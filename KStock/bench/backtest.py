@@ -0,0 +1,49 @@
+'''
+Times the backtester on synthetic minute bars
+
+Builds a gfc.get_prices_time_data() shaped frame of random-walk minute bars and
+runs it through Backtest, then extrapolates to a year of trading days.
+
+Run from the KStock directory:
+    $ python -m bench.backtest [days] [symbols]
+'''
+import sys, time
+import numpy as np
+import pandas as pd
+from Backtest import Backtest
+
+
+def bars(days, symbols, seed = 0):
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range('2018-01-02', periods = days)
+    index = (sessions.values[:, None] + pd.timedelta_range('09:30:00', '15:59:00', freq = '1min').values[None, :]).ravel()
+
+    start = rng.uniform(5, 300, symbols)
+    close = start * np.exp(np.cumsum(rng.normal(0, 0.001, (len(index), symbols)), axis = 0))
+    spread = np.abs(rng.normal(0, 0.0005, close.shape)) * close
+
+    columns = {}
+    for i in range(symbols):
+        sym = 'S{}'.format(i)
+        columns[sym + '_Open'] = close[:, i]
+        columns[sym + '_High'] = close[:, i] + spread[:, i]
+        columns[sym + '_Low'] = close[:, i] - spread[:, i]
+        columns[sym + '_Close'] = close[:, i]
+        columns[sym + '_Volume'] = np.full(len(index), 1000)
+    return pd.DataFrame(columns, index = pd.DatetimeIndex(index))
+
+
+if __name__ == '__main__':
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 21
+    symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    frame = bars(days, symbols)
+    start = time.perf_counter()
+    test = Backtest(frame).run()
+    elapsed = time.perf_counter() - start
+
+    print('{} bars x {} symbols in {:.1f} s ({:.0f} bars/s)'.format(len(frame), symbols, elapsed, len(frame) / elapsed))
+    print('a year of minute bars would take about {:.1f} min'.format(elapsed * 252 / days / 60))
+    print('{} trades, total profit {:.2f}, worst drawdown {:.2f}'.format(
+        len(test.trades), test.summary['Profit'].sum(), test.summary['MaxDrawdown'].max()))
+    print(test.trades['Reason'].value_counts().to_string())
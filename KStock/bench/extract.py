@@ -0,0 +1,23 @@
+'''
+Compares the targeted extractor against the full html5lib tree on the saved pages
+
+Run from the KStock directory:
+    $ python -m bench.extract
+'''
+import glob, os, timeit
+from resources.NASDAQ import parseCurrents, soupCurrents
+
+ROUNDS = 20
+
+
+if __name__ == '__main__':
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(__file__), 'fixtures', '*.html'))):
+        with open(path, 'rb') as fileIn:
+            page = fileIn.read()
+
+        assert parseCurrents(page) == soupCurrents(page), 'extractors disagree on ' + path
+
+        soup = min(timeit.repeat(lambda : soupCurrents(page), number = ROUNDS, repeat = 3)) / ROUNDS
+        fast = min(timeit.repeat(lambda : parseCurrents(page), number = ROUNDS * 50, repeat = 3)) / (ROUNDS * 50)
+        print('{:<10} {:>6} KB  html5lib {:>8.2f} ms  extractor {:>8.3f} ms  {:>6.0f}x'.format(
+            os.path.basename(path), len(page) // 1024, soup * 1000, fast * 1000, soup / fast))
@@ -0,0 +1,76 @@
+'''
+Times parsing a year of minute bars out of a getprices payload
+
+Builds a payload the way Google Finance lays it out (a header, then one `a<timestamp>`
+row per session followed by minute offsets) and parses it with gfc._parse() and
+with a copy of the line by line loop that used to live in every gfc function.
+
+Run from the KStock directory:
+    $ python -m bench.gfc [days]
+'''
+import sys, time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from resources import gfc
+
+HEADER = 'EXCHANGE%3DNASDAQ\nMARKET_OPEN_MINUTE=570\nMARKET_CLOSE_MINUTE=960\nINTERVAL=60\nCOLUMNS=DATE,CLOSE,HIGH,LOW,OPEN,VOLUME\nDATA=\n'
+
+
+def payload(days, seed = 0):
+    rng = np.random.default_rng(seed)
+    lines = [HEADER + 'TIMEZONE_OFFSET=-300']
+    price = 100.0
+    for session in pd.bdate_range('2018-01-02', periods = days):
+        if session.month == 3 and session.day < 8:
+            lines.append('TIMEZONE_OFFSET=-240')
+        opening = int(session.tz_localize('US/Eastern').timestamp()) + 9 * 3600 + 30 * 60
+        for n in range(391):
+            price *= np.exp(rng.normal(0, 0.001))
+            date = 'a{}'.format(opening) if n == 0 else str(n)
+            lines.append('{},{:.4f},{:.4f},{:.4f},{:.4f},{}'.format(
+                date, price, price * 1.001, price * 0.999, price, int(rng.integers(100, 10000))))
+    return '\n'.join(lines) + '\n'
+
+
+def legacy(text, interval):
+    lines = text.splitlines()
+    data = []
+    index = []
+    basetime = 0
+    for price in lines:
+        cols = price.split(",")
+        if cols[0][0] == 'a':
+            basetime = int(cols[0][1:])
+            index.append(datetime.fromtimestamp(basetime))
+            data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
+        elif cols[0][0].isdigit():
+            date = basetime + (int(cols[0])*int(interval))
+            index.append(datetime.fromtimestamp(date))
+            data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
+    return pd.DataFrame(data, index = index, columns = ['Open', 'High', 'Low', 'Close', 'Volume'])
+
+
+def best(parse, text, runs = 3):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        frame = parse(text, 60)
+        times.append(time.perf_counter() - start)
+    return min(times), frame
+
+
+if __name__ == '__main__':
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 252
+    text = payload(days)
+
+    old, expected = best(legacy, text)
+    new, frame = best(gfc._parse, text)
+    pd.testing.assert_frame_equal(frame, expected, check_index_type = False)
+    assert (frame.index == pd.DatetimeIndex(expected.index)).all()
+
+    print('{} bars, {:.1f} MB payload'.format(len(frame), len(text) / 1e6))
+    print('{:<10} {:>10}'.format('', 'ms'))
+    print('{:<10} {:>10.1f}'.format('loop', old * 1000))
+    print('{:<10} {:>10.1f}'.format('_parse', new * 1000))
+    print('{:.0f}x faster'.format(old / new))
@@ -0,0 +1,49 @@
+'''
+Times the trade ledger: recording fills, writing them and querying them
+
+Records a buy and a sell per position, spread over the last month, then waits for the
+writer. Shows what recording costs the caller, the rate the writer committed at and
+how long the P&L and day trade queries take on the result.
+
+Run from the KStock directory:
+    $ python -m bench.ledger [positions]
+'''
+import os, sys, tempfile, time
+from Ledger import Ledger
+
+DAY = 86400
+
+
+def timed(fn, *args, repeat = 20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    path = os.path.join(tempfile.mkdtemp(), 'ledger.db')
+    ledger = Ledger(path)
+
+    now = time.time()
+    start = time.perf_counter()
+    for i in range(positions):
+        stamp = now - 30 * DAY + i * 30 * DAY / positions
+        symbol = 'S{}'.format(i % 500)
+        ledger.bought(symbol, 10, 50.0, stamp)
+        #One in ten is held overnight
+        ledger.sold(symbol, 10, 50.0 + i % 7 - 3, 10 * (i % 7 - 3), stamp + (DAY if i % 10 == 0 else 60))
+    recorded = time.perf_counter() - start
+    ledger.flush()
+    written = time.perf_counter() - start
+    print('{} fills: recording {:.1f} us each, written at {:.0f} fills/s'.format(
+        2 * positions, recorded / (2 * positions) * 1e6, 2 * positions / written))
+
+    bySymbol, took = timed(ledger.profitBySymbol)
+    print('profit by symbol  {:>8.1f} ms ({} symbols)'.format(took * 1000, len(bySymbol)))
+    byDay, took = timed(ledger.profitByDay)
+    print('profit by day     {:>8.1f} ms ({} days)'.format(took * 1000, len(byDay)))
+    trades, took = timed(ledger.dayTrades)
+    print('5 day day trades  {:>8.1f} ms ({} trades)'.format(took * 1000, trades))
+    ledger.close()
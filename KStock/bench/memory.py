@@ -0,0 +1,110 @@
+'''
+Measures the memory of 5,000 Ticks and what one update cycle allocates
+
+Compares the slotted Tick fed with Quote records against a copy of the previous
+Tick, which kept everything in its __dict__ and was fed ten-key metric dicts. The
+price history is left off for that comparison and measured on its own: it is
+allocated up front, so a cycle costs it nothing.
+
+Run from the KStock directory:
+    $ python -m bench.memory
+'''
+import gc, tracemalloc
+import Quotes
+from resources.NASDAQ import Quote
+from Tick import Tick, HISTORY
+
+SYMBOLS = 5000
+FIELDS = Quote._fields
+
+
+class DictTick():
+    #The previous Tick, only what its memory depends on
+    _quote = None
+
+    def __init__(self, tick, purPrice, data):
+        self.__dict__.update({
+            'T' : tick, 'C' : '', 'CP' : [], 'V' : '', 'AV' : '', 'D' : '', 'PQ' : 0, 'PC' : '',
+            'TD' : [], 'YD' : [], 'Q' : None, 'AP' : None, 'SL' : None, 'tradeable' : True
+        })
+        self.sellRev = 0
+        self.buyRev = 0
+        self.pPrice = 0
+        self.prevProfit = 0
+        self.update(purPrice, data)
+
+    def update(self, purPrice, data):
+        self.__dict__.update({
+            'C' : data['LTP'],
+            'CP' : (data['C'], data['CP']),
+            'V' : data['V'],
+            'PC' : data['PC'],
+            'TD' : [data['TL'], data['TH']],
+            'YD' : [data['YL'], data['YH']],
+            'D' : data['D'],
+            'PQ' : int(purPrice / data['LTP'])
+        })
+        return True
+
+
+def scraped(i):
+    #Strings as they come off the page, different for every symbol
+    price = 10 + i % 500
+    return ['{:.2f}'.format(price + k * 0.01) for k in range(9)] + ['green']
+
+
+def asDict(values):
+    metrics = {met : float(value) for met, value in zip(FIELDS[:-1], values)}
+    metrics['D'] = values[-1]
+    return metrics
+
+
+def asQuote(values):
+    return Quote._make([float(value) for value in values[:-1]] + [values[-1]])
+
+
+def measure(make, build):
+    raw = [scraped(i) for i in range(SYMBOLS)]
+    gc.collect()
+    tracemalloc.start()
+
+    base = tracemalloc.take_snapshot()
+    ticks = [make('S{}'.format(i), build(raw[i])) for i in range(SYMBOLS)]
+    gc.collect()
+    footprint = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(base, 'filename'))
+
+    #One cycle: every tick gets a freshly scraped quote. The old state is kept alive, so whatever
+    #the snapshot gained is what the cycle allocated and the next one will have to free
+    keep = [[getattr(tick, name) for name in ('_quote', 'C', 'CP', 'V', 'PC', 'TD', 'YD', 'D', 'PQ')] for tick in ticks]
+    before = tracemalloc.take_snapshot()
+    for tick, values in zip(ticks, raw):
+        tick.update(1000, build(values))
+    gc.collect()
+    stats = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+
+    tracemalloc.stop()
+    del keep
+    return footprint / SYMBOLS, blocks / SYMBOLS, size / SYMBOLS
+
+
+if __name__ == '__main__':
+    Quotes.quoteCache.fetch = lambda tick : False
+
+    def slotted(history):
+        def make(tick, quote):
+            tick = Tick(tick, 1000, history)
+            tick.update(1000, quote)
+            return tick
+        return make
+
+    rows = [
+        ('dict Tick + dict', measure(lambda tick, data : DictTick(tick, 1000, data), asDict)),
+        ('slotted Tick + Quote', measure(slotted(0), asQuote)),
+        ('  + {} history'.format(HISTORY), measure(slotted(HISTORY), asQuote)),
+    ]
+    print('{} symbols'.format(SYMBOLS))
+    print('{:<22} {:>16} {:>26} {:>24}'.format('', 'bytes per symbol', 'allocations per symbol-cycle', 'bytes per symbol-cycle'))
+    for name, (size, blocks, peak) in rows:
+        print('{:<22} {:>16.0f} {:>26.1f} {:>24.0f}'.format(name, size, blocks, peak))
@@ -0,0 +1,113 @@
+'''
+Times ObjListTableModel.data() over a 5,000 row Holdings table
+
+Asks for every cell the roles a QTableView asks for when painting it, through the
+model and through a copy of the previous data(), which walked the 'attr' path with
+getAttrRecursive and made a new QColor for every background.
+
+Then times refresh() after a cycle that moved a few prices, and counts the cells it
+signalled, which is what the view repaints. layoutChanged, emitted every update
+before, repainted all of them.
+
+Run from the KStock directory:
+    $ python -m bench.model [rows]
+'''
+import sys, time
+from PyQt5 import QtGui
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+import Quotes
+from ObjList import ObjListTableModel, getAttrRecursive
+from resources.NASDAQ import Quote
+from Tick import Tick
+
+PROPERTIES = [
+    {'attr' : 'T', 'header' : 'Ticker'},
+    {'attr' : 'C', 'header' : 'Price'},
+    {'attr' : 'Q', 'header' : 'Quantity'},
+    {'attr' : 'AP', 'header' : 'Avg Price'},
+    {'attr' : 'SL', 'header' : 'Stop Loss'}
+]
+#What QStyledItemDelegate asks for per cell, then the size hint
+ROLES = [Qt.FontRole, Qt.TextAlignmentRole, Qt.ForegroundRole, Qt.CheckStateRole, Qt.DecorationRole,
+    Qt.DisplayRole, Qt.BackgroundRole, Qt.SizeHintRole]
+
+
+def oldColor(move):
+    if move == 'red':
+        return QtGui.QColor(214, 102, 102)
+    elif move == 'green':
+        return QtGui.QColor(102, 214, 102)
+    else:
+        return QtGui.QColor(144, 144, 144)
+
+
+class OldModel(ObjListTableModel):
+    def data(self, index, role = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        obj = self.getObject(index)
+        prop = self.getProperty(index)
+        if role == Qt.BackgroundRole:
+            return oldColor(obj.D)
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if (obj is None) or (prop is None):
+            return None
+        try:
+            if role in [Qt.DisplayRole, Qt.EditRole]:
+                return getAttrRecursive(obj, prop['attr'])
+        except:
+            return None
+        return None
+
+
+def ticks(rows):
+    Quotes.quoteCache.fetch = lambda tick : False
+    made = []
+    for i in range(rows):
+        price = 10.0 + i % 500
+        quote = Quote(LTP = price, C = 0.1, CP = 0.01, PC = price - 1, TH = price + 1, TL = price - 1,
+            YH = price + 5, YL = price - 5, V = 1e6, D = 'green' if i % 3 else 'red')
+        tick = Tick('S{}'.format(i), 1000, history = 0)
+        tick.update(1000, quote)
+        tick.Q, tick.AP, tick.SL = 10, price, price * 0.9
+        made.append(tick)
+    return made
+
+
+def paint(model):
+    #One paint of every cell
+    data, index = model.data, model.index
+    cells = [index(row, column) for row in range(model.rowCount()) for column in range(model.columnCount())]
+    start = time.perf_counter()
+    for cell in cells:
+        for role in ROLES:
+            data(cell, role)
+    return time.perf_counter() - start, len(cells) * len(ROLES)
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    app = QApplication(sys.argv[:1])
+    objects = ticks(rows)
+
+    print('{} rows x {} columns, {} roles per cell'.format(rows, len(PROPERTIES), len(ROLES)))
+    for name, model in (('previous', OldModel(objects, PROPERTIES)), ('current', ObjListTableModel(objects, PROPERTIES))):
+        elapsed, calls = min(paint(model) for _ in range(3))
+        print('{:<9} {:>7.0f} ms a paint {:>10.0f} data() calls/s'.format(name, elapsed * 1000, calls / elapsed))
+
+    model = ObjListTableModel(objects, PROPERTIES)
+    cells = []
+    model.dataChanged.connect(lambda first, last : cells.append(
+        (last.row() - first.row() + 1) * (last.column() - first.column() + 1)))
+    print('refresh() after a cycle:')
+    for moved in (0, 10, 100, 1000):
+        for tick in objects[:moved]:
+            tick.C += 0.01
+        del cells[:]
+        start = time.perf_counter()
+        model.refresh()
+        elapsed = time.perf_counter() - start
+        print('{:>5} prices moved {:>7.1f} ms {:>6} cells to repaint, of {}'.format(
+            moved, elapsed * 1000, sum(cells), rows * len(PROPERTIES)))
@@ -0,0 +1,38 @@
+'''
+Load-tests the order gateway against the mock broker
+
+Fires orders at the gateway as fast as a cycle could, then waits for every Ack.
+Shows what placing an order costs the caller (inline, it was the broker latency),
+the rate orders actually went out at and how long they took to be acknowledged,
+waiting on the rate limit included.
+
+Run from the KStock directory:
+    $ python -m bench.orders [orders] [rate]
+'''
+import sys, time
+import numpy as np
+from Orders import OrderGateway, MockBroker
+
+LATENCY = 0.2
+
+
+if __name__ == '__main__':
+    orders = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    broker = MockBroker(latency = LATENCY, failures = 0.01)
+    gateway = OrderGateway(broker, rate = rate, burst = 10, workers = 16)
+
+    start = time.perf_counter()
+    futures = [(gateway.buy if i % 2 else gateway.sell)('S{}'.format(i % 100), 10, 50.0) for i in range(orders)]
+    queued = time.perf_counter() - start
+    acks = [future.result() for future in futures]
+    elapsed = time.perf_counter() - start
+    gateway.close()
+
+    latency = np.array([ack.latency for ack in acks])
+    print('{} orders, limit {:.0f}/s, broker latency {:.0f} ms'.format(orders, rate, LATENCY * 1000))
+    print('queueing took {:.1f} us per order'.format(queued / orders * 1e6))
+    print('sent {:.0f} orders/min ({} ok, {} failed) in {:.1f} s'.format(
+        orders / elapsed * 60, gateway.sent, gateway.failed, elapsed))
+    print('ack latency p50 {:.2f} s, p99 {:.2f} s'.format(*np.percentile(latency, [50, 99])))
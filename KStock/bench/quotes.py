@@ -0,0 +1,68 @@
+'''
+Times a full quote cycle against a local stand-in for NASDAQ
+
+Serves the saved real-time page from a local server that answers after a fixed
+delay, then fetches growing watchlists one ticker at a time and with QuoteEngine.
+
+Run from the KStock directory:
+    $ python -m bench.quotes
+'''
+import os, sys, threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from Quotes import QuoteCache, QuoteEngine
+from resources.providers import NASDAQProvider
+
+LATENCY = 0.2
+PAGE = open(os.path.join(os.path.dirname(__file__), 'fixtures', 'NVDA.html'), 'rb').read()
+
+
+class StandIn(BaseHTTPRequestHandler):
+    #Answers every /symbol/<tick>/real-time with the saved page, after LATENCY seconds
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    server.daemon_threads = True
+    threading.Thread(target = server.serve_forever, daemon = True).start()
+    return server
+
+
+def timeCycle(engine, ticks):
+    start = time.perf_counter()
+    quotes = engine.fetch(ticks)
+    assert all(quotes.values()), 'stand-in returned an empty quote'
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    server = serve()
+    url = 'http://127.0.0.1:{}/symbol/{{}}/real-time'.format(server.server_port)
+
+    provider = NASDAQProvider(url, timeout = 5)
+    #No caching, every cycle has to go over the wire
+    serial = QuoteEngine(provider, workers = 1, cache = QuoteCache(ttl = 0))
+    engine = QuoteEngine(provider, cache = QuoteCache(ttl = 0))
+
+    print('latency per request: {:.0f} ms'.format(LATENCY * 1000))
+    print('{:>8} {:>12} {:>12}'.format('symbols', 'serial (s)', 'engine (s)'))
+    for n in (5, 10, 20, 40):
+        ticks = ['T{}'.format(i) for i in range(n)]
+        print('{:>8} {:>12.2f} {:>12.2f}'.format(n, timeCycle(serial, ticks), timeCycle(engine, ticks)))
+
+    serial.close()
+    engine.close()
+    provider.session.close()
+    server.shutdown()
+    sys.exit(0)
@@ -0,0 +1,56 @@
+'''
+Runs the Tick decision pipeline over a recorded session as fast as it can go
+
+Records a synthetic session of random-walk quotes, replays it through the quote
+cache into Tick.purchase/Tick.sell and reports the quote throughput.
+
+Run from the KStock directory:
+    $ python -m bench.replay
+'''
+import json, os, random, tempfile, time
+import resources.providers as providers
+from Quotes import quoteCache
+from Tick import Tick, HISTORY
+
+SYMBOLS = 50
+ROUNDS = 400
+
+
+def record(path):
+    prices = {'S{}'.format(i) : random.uniform(5, 300) for i in range(SYMBOLS)}
+    with open(path, 'w') as fileOut:
+        for r in range(ROUNDS + 1):
+            for tick, price in prices.items():
+                price = prices[tick] = max(0.5, price * (1 + random.gauss(0, 0.002)))
+                metrics = {
+                    'LTP' : round(price, 2), 'C' : 0.0, 'CP' : 0.0, 'PC' : price, 'TH' : price * 1.02, 
+                    'TL' : price * 0.98, 'YH' : price * 1.5, 'YL' : price * 0.5, 'V' : 1e6, 'D' : 'green'
+                }
+                fileOut.write(json.dumps(dict(metrics, t = r * 5, T = tick)) + '\n')
+    return list(prices)
+
+
+if __name__ == '__main__':
+    random.seed(1)
+    path = os.path.join(tempfile.mkdtemp(), 'session.jsonl')
+    symbols = record(path)
+
+    providers.setProvider(providers.ReplayProvider(path))
+    #Every read has to move the recording forward
+    quoteCache.ttl = 0
+
+    ticks = [Tick(tick, 1000, HISTORY) for tick in symbols]
+    trades = 0
+    start = time.perf_counter()
+    for r in range(ROUNDS):
+        strat = 'PS' if r < ROUNDS // 10 else 'ST'
+        for tick in ticks:
+            if tick.Q:
+                trades += tick.sell(1000, strat)
+            else:
+                trades += tick.purchase(1000, strat)
+    elapsed = time.perf_counter() - start
+
+    quotes = SYMBOLS * ROUNDS
+    print('{} quotes in {:.2f} s, {:.0f} quotes/s, {} decisions fired'.format(
+        quotes, elapsed, quotes / elapsed, trades))
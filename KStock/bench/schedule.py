@@ -0,0 +1,73 @@
+'''
+Simulates a session of polling under the fixed cycle and under PollScheduler
+
+100 symbols, 5 of them held by default, random-walk prices. Counts the requests each
+approach makes and how often the held symbols get checked, on a simulated clock. The
+scheduler's budget is what the fixed cycle makes, with mostly held symbols it has to
+slow them down to stay within it.
+
+Run from the KStock directory:
+    $ python -m bench.schedule [minutes] [symbols] [held]
+'''
+import sys
+import numpy as np
+import Quotes
+from resources.NASDAQ import Quote
+from Scheduler import PollScheduler, CYCLE
+from Tick import Tick, HISTORY
+
+SYMBOLS = 100
+HELD = 5
+STEP = 0.25
+
+
+def ticks(seed = 0):
+    rng = np.random.default_rng(seed)
+    ticks = [Tick('S{}'.format(i), 1000, HISTORY) for i in range(SYMBOLS)]
+    for tick in ticks[:HELD]:
+        tick.update(1000, quote(50.0))
+        tick.Q, tick.AP, tick.SL = tick.PQ, 50.0, 45.0
+    return ticks, rng
+
+
+def quote(price):
+    return Quote(price, 0.0, 0.0, price, price, price, price, price, 1000.0, 'green')
+
+
+def simulate(minutes, scheduled):
+    tickList, rng = ticks()
+    prices = np.full(SYMBOLS, 50.0)
+    #A few symbols move a lot more than the rest
+    sigma = np.where(np.arange(SYMBOLS) % 10 == 0, 0.003, 0.0003)
+    scheduler = PollScheduler()
+    for tick in tickList:
+        scheduler.add(tick, 0)
+
+    requests, heldChecks, now, nextCycle = 0, 0, 0.0, 0.0
+    while now < minutes * 60:
+        prices *= np.exp(rng.normal(0, sigma * np.sqrt(STEP / CYCLE)))
+        if scheduled:
+            due = scheduler.due(now)
+        else:
+            due = tickList if now >= nextCycle else []
+            nextCycle += CYCLE if due else 0
+        for tick in due:
+            i = int(tick.T[1:])
+            tick.update(1000, quote(float(prices[i])))
+            heldChecks += i < HELD
+        requests += len(due)
+        scheduler.done(due, now)
+        now += STEP
+    return requests / (minutes * 60), heldChecks / HELD / (minutes * 60)
+
+
+if __name__ == '__main__':
+    Quotes.quoteCache.fetch = lambda tick : False
+    minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    SYMBOLS = int(sys.argv[2]) if len(sys.argv) > 2 else SYMBOLS
+    HELD = int(sys.argv[3]) if len(sys.argv) > 3 else HELD
+
+    print('{} symbols, {} held, {} simulated minutes'.format(SYMBOLS, HELD, minutes))
+    print('{:<12} {:>14} {:>26}'.format('', 'requests/s', 'checks/s per held symbol'))
+    for name, scheduled in (('fixed 5 s', False), ('scheduled', True)):
+        print('{:<12} {:>14.1f} {:>26.2f}'.format(name, *simulate(minutes, scheduled)))
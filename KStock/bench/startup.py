@@ -0,0 +1,72 @@
+'''
+Measures how long the app takes from launch to the first paint of the main window
+
+Each run is a fresh interpreter that imports what KStock.py imports for the window
+(PyQt5, pyqtgraph, ObjList, Helpers) and paints the main form, offscreen. Compared:
+    runtime     every form parsed from its .ui at import, like before
+    compiled    the compiled main form, the dialogs loaded when first opened
+
+Robinhood, the InitTest probes and the config aren't part of it, they don't
+depend on the forms.
+
+Run from the KStock directory:
+    $ python -m bench.startup [runs]
+'''
+import os, statistics, subprocess, sys, time
+
+CHILD = r'''
+import time
+start = time.perf_counter()
+import sys
+from PyQt5 import QtCore, QtWidgets
+import pyqtgraph, ObjList
+if sys.argv[1] == 'runtime':
+    from PyQt5 import uic
+    dialogs = [uic.loadUiType('ui/{}.ui'.format(name)) for name in ('addtick', 'InitTest', 'api')]
+    form, base = uic.loadUiType('ui/KStock.ui')
+else:
+    import Helpers, ui
+    form, base = ui.formClass('KStock'), QtWidgets.QMainWindow
+imported = time.perf_counter()
+
+class Window(base, form):
+    def __init__(self):
+        base.__init__(self)
+        self.setupUi(self)
+
+class Painted(QtCore.QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            print(imported - start, time.perf_counter() - start)
+            sys.stdout.flush()
+            app.quit()
+        return False
+
+app = QtWidgets.QApplication(sys.argv)
+window = Window()
+painted = Painted()
+window.installEventFilter(painted)
+window.show()
+app.exec_()
+'''
+
+
+def launch(mode):
+    env = dict(os.environ, QT_QPA_PLATFORM = 'offscreen')
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, '-c', CHILD, mode], env = env, stdout = subprocess.PIPE,
+        stderr = subprocess.DEVNULL, universal_newlines = True, check = True).stdout
+    total = time.perf_counter() - start
+    imported, painted = map(float, out.split())
+    return imported, painted, total
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print('median of {} launches, ms'.format(runs))
+    print('{:<10} {:>10} {:>14} {:>16}'.format('', 'imports', 'first paint', 'launch to paint'))
+    for mode in ('runtime', 'compiled'):
+        results = [launch(mode) for _ in range(runs)]
+        print('{:<10} {:>10.0f} {:>14.0f} {:>16.0f}'.format(mode,
+            *(statistics.median(column) * 1000 for column in zip(*results))))
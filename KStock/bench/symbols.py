@@ -0,0 +1,58 @@
+'''
+Times what it takes to get the company list ready for AddTick, and to search it
+
+Compared:
+    pandas      what MainWindow used to do at launch, read companyList.csv with pandas
+                (its import included), symbols only, no search
+    build       the first SymbolIndex load, parses the csv and saves the index
+    load        every later SymbolIndex load, reads the saved index back
+
+Each is timed in a fresh interpreter. Searches are timed on a loaded index, one per
+prefix a user could type.
+
+Run from the KStock directory:
+    $ python -m bench.symbols
+'''
+import os, string, subprocess, sys, tempfile, time
+from resources.symbols import SymbolIndex
+
+CHILD = {
+    'pandas' : '''
+import pandas as pd
+comps = pd.read_csv('./resources/companyList.csv', sep = ',')[['Symbol', 'Name']]
+symbols = comps['Symbol'].values
+''',
+    'build' : '''
+from resources.symbols import SymbolIndex
+SymbolIndex(index = sys.argv[1]).load()
+''',
+}
+CHILD['load'] = CHILD['build']
+TIMED = '''
+import sys, time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+'''
+
+
+def launch(mode, index):
+    out = subprocess.run([sys.executable, '-c', TIMED.format(CHILD[mode]), index], stdout = subprocess.PIPE,
+        stderr = subprocess.DEVNULL, universal_newlines = True, check = True).stdout
+    return float(out)
+
+
+if __name__ == '__main__':
+    index = os.path.join(tempfile.mkdtemp(), 'symbols.json')
+    for mode in ('pandas', 'build', 'load'):
+        print('{:<8} {:>8.1f} ms'.format(mode, launch(mode, index) * 1000))
+
+    symbols = SymbolIndex(index = index)
+    symbols.load()
+    prefixes = [a + b for a in string.ascii_lowercase for b in ' ' + string.ascii_lowercase]
+    start = time.perf_counter()
+    found = sum(len(symbols.search(prefix)) for prefix in prefixes)
+    elapsed = time.perf_counter() - start
+    print('{} searches, {:.0f} us each, {:.1f} matches each'.format(
+        len(prefixes), elapsed / len(prefixes) * 1e6, found / len(prefixes)))
+    os.remove(index)
@@ -0,0 +1,67 @@
+'''
+Times recording trades in the transaction log and painting it
+
+Records buys and their sells through the Transactions view, then scrolls it to the
+bottom and paints it, offscreen. The previous log, a QTableWidget making an item per
+cell, is timed on its buys only: its sells never worked.
+
+Run from the KStock directory:
+    $ python -m bench.transactions [trades]
+'''
+import sys, time
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from ObjList import Transactions
+
+
+class Row():
+    __slots__ = ('T', 'Q', 'AP', 'C', 'PQ')
+
+    def __init__(self, i):
+        self.T, self.Q, self.PQ, self.AP, self.C = 'S{}'.format(i % 5000), 10, 10, 10.0 + i % 7, 10.0 + i % 5
+
+
+def oldBought(table, tick):
+    _row = table.rowCount()
+    table.insertRow(_row)
+    data = [tick.T, tick.PQ, tick.C, '']
+    for item in range(len(data)):
+        tItem = QTableWidgetItem(str(data[item]))
+        tItem.setTextAlignment(Qt.AlignCenter)
+        table.setItem(_row, item, tItem)
+
+
+def paint(view):
+    view.resize(400, 600)
+    view.show()
+    start = time.perf_counter()
+    view.scrollToBottom()
+    view.viewport().repaint()
+    QApplication.processEvents()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    trades = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QApplication(sys.argv[:1])
+    rows = [Row(i) for i in range(trades)]
+
+    view = Transactions()
+    start = time.perf_counter()
+    for i, row in enumerate(rows):
+        #A symbol is sold before it's bought again
+        if i >= 5000:
+            view.sold(rows[i - 5000])
+        view.bought(row)
+    recorded = time.perf_counter() - start
+    print('model      {:>7} trades {:>6.1f} us a buy or sell, paint {:>6.1f} ms'.format(
+        trades, recorded / (2 * trades - 5000) * 1e6, paint(view) * 1000))
+
+    old = min(trades, 20000)
+    table = QTableWidget(0, 4)
+    start = time.perf_counter()
+    for row in rows[:old]:
+        oldBought(table, row)
+    recorded = time.perf_counter() - start
+    print('widget     {:>7} trades {:>6.1f} us a buy,         paint {:>6.1f} ms'.format(
+        old, recorded / old * 1e6, paint(table) * 1000))
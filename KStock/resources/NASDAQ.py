@@ -1,44 +1,124 @@
-from bs4 import BeautifulSoup
 from urllib.request import urlopen
-import re
+from urllib.error import HTTPError, URLError
+import re, logging
+from collections import namedtuple
+from html import unescape
 from socket import timeout
 
+URL = 'http://www.nasdaq.com/symbol/{}/real-time'
+
 def clean(s):
     s = re.sub(r'[^0-9a-zA-Z. ]', '', s)
     return s
     
 
-def tickCurrents(tick):
-    url = 'http://www.nasdaq.com/symbol/{}/real-time'.format(tick)
-
-    tickMetrics = {
-            'LTP' : '',
-            'C' : '',
-            'CP' : '',
-            'PC' : '',
-            'TH' : '',
-            'TL' : '',
-            'YH' : '',
-            'YL' : '',
-            'V' : '',
-            'D' : ''
-        }
-    #print(BeautifulSoup(urlopen(url, timeout = 10).read(), 'html5lib').encode('utf-8'))
+class Quote(namedtuple('Quote', ['LTP', 'C', 'CP', 'PC', 'TH', 'TL', 'YH', 'YL', 'V', 'D'])):
+    '''
+    Metrics of a tick at one point in time, immutable and without a __dict__
+
+    LTP (Last Trade Price), C (Change), CP (Change %), PC (Previous Close), TH/TL (Today's
+    High/Low), YH/YL (52 Week High/Low), V (Volume) and D (Direction). Every metric that 
+    could be read is a float, '' otherwise, D is the class of the arrow ('green', 'red').
+    '''
+    __slots__ = ()
+
+
+_tag2met = {
+    'quotes_content_left__LastSale': 'LTP', 
+    'quotes_content_left__NetChange': 'C', 
+    '_updownImage': 'D', 
+    'quotes_content_left__PctChange': 'CP', 
+    'quotes_content_left__Volume': 'V', 
+    'quotes_content_left__PreviousClose': 'PC', 
+    'quotes_content_left__TodaysHigh': 'TH', 
+    'quotes_content_left__TodaysLow': 'TL', 
+    'quotes_content_left__52WeekHigh': 'YH', 
+    'quotes_content_left__52WeekLow': 'YL'
+}
+
+#Only the spans we care about, the rest of the page is skipped over by the regex engine
+_genTable = re.compile(rb'<div[^>]*?\bclass=["\'][^"\']*\bgenTable\b', re.I)
+_spans = re.compile(
+    rb'<span\b([^>]*?\bid=["\'](' + '|'.join(_tag2met).encode() + rb')["\'][^>]*)>(.*?)</span>', 
+    re.I | re.S)
+_classAttr = re.compile(rb'\bclass=["\']\s*([^"\'\s]*)', re.I)
+_tags = re.compile(r'<[^>]*>')
+
+
+#Position of each span's metric in a Quote
+_tag2pos = {tagId : Quote._fields.index(met) for tagId, met in _tag2met.items()}
+_D = Quote._fields.index('D')
+
+
+def _quote(values):
+    #Quote out of the scraped strings, False if there's no last sale price
+    for pos, value in enumerate(values):
+        if pos != _D:
+            try:
+                values[pos] = float(value)
+            except ValueError:
+                pass
+    return Quote._make(values) if values[0] else False
+
+
+def parseCurrents(page):
+    '''
+    Pulls the current metrics out of a NASDAQ real-time page
+
+    Makes a single pass over the raw bytes with precompiled patterns, only looking at
+    the `_tag2met` spans after the genTable div, rather than building a tree of the page
+
+    Args:
+        page (bytes): raw html of the page
+
+    Returns:
+        (Quote): metrics of the tick, False if there's no last sale price
+    '''
+    values = [''] * len(Quote._fields)
+    table = _genTable.search(page)
+    if not table:
+        return False
+
+    found = 0
+    for match in _spans.finditer(page, table.end()):
+        attrs, tagId, content = match.groups()
+        tagId = tagId.decode()
+        if tagId == '_updownImage':
+            cls = _classAttr.search(attrs)
+            if cls:
+                values[_D] = cls.group(1).decode()
+        else:
+            text = content.decode('utf-8', 'ignore')
+            if '<' in text:
+                text = _tags.sub('', text)
+            if '&' in text:
+                text = unescape(text)
+            values[_tag2pos[tagId]] = clean(text)
+
+        #Every id is unique, no need to scan the rest of the page
+        found += 1
+        if found == len(_tag2met):
+            break
+
+    return _quote(values)
+
+
+def soupCurrents(page):
+    '''
+    Same as parseCurrents() but through a full html5lib tree, kept as the reference 
+    for the benchmark
+
+    Args:
+        page (bytes): raw html of the page
+
+    Returns:
+        (Quote): metrics of the tick, False if there's no last sale price
+    '''
+    from bs4 import BeautifulSoup
+
+    tickMetrics = dict.fromkeys(Quote._fields, '')
     try:
-        soup = BeautifulSoup(urlopen(url, timeout = 1).read(), 'html5lib')
-        #soup = BeautifulSoup(requests.get(url, headers = headers, timeout = 5))
-        _tag2met = {
-            'quotes_content_left__LastSale': 'LTP', 
-            'quotes_content_left__NetChange': 'C', 
-            '_updownImage': 'D', 
-            'quotes_content_left__PctChange': 'CP', 
-            'quotes_content_left__Volume': 'V', 
-            'quotes_content_left__PreviousClose': 'PC', 
-            'quotes_content_left__TodaysHigh': 'TH', 
-            'quotes_content_left__TodaysLow': 'TL', 
-            'quotes_content_left__52WeekHigh': 'YH', 
-            'quotes_content_left__52WeekLow': 'YL'
-        }
+        soup = BeautifulSoup(page, 'html5lib')
         if soup:
             for content in soup.find('div', {'class' : 'genTable'}).findAll('span'):
                 if content.has_attr('id'):
@@ -48,23 +128,28 @@ def tickCurrents(tick):
                             tickMetrics['D'] = content.get('class')[0]
                         else:
                             tickMetrics[_tag2met[tagId]] = clean(content.text.encode('ascii', 'ignore').decode())
-        
-    
+
+        #FIX CHANGES FROM unch TO SOMETHING ELSE
+    finally:
+        return _quote([tickMetrics[met] for met in Quote._fields])
+
+
+def tickCurrents(tick):
+    url = URL.format(tick)
+
+    try:
+        return parseCurrents(urlopen(url, timeout = 1).read())
 
     except (HTTPError, URLError) as error:
-        logging.error('Data of %s not retrieved because %s\nURL: %s', name, error, url)
+        logging.error('Data of %s not retrieved because %s\nURL: %s', tick, error, url)
 
     except timeout:
         logging.error('socket timed out - URL %s', url)
 
-        #FIX CHANGES FROM unch TO SOMETHING ELSE
-    finally:
-        for item in tickMetrics:
-            try:
-                tickMetrics[item] = float(tickMetrics[item])
-            except ValueError:
-                pass
-        return tickMetrics if tickMetrics['LTP'] else False
+    except OSError as error:
+        logging.error('Connection to %s dropped because %s', url, error)
+
+    return False
 
          
 def tickRating(self):
@@ -78,4 +163,4 @@ def tickRating(self):
 
 
 if __name__ == '__main__':
-    print(tickCurrents('nvda'))
\ No newline at end of file
+    print(tickCurrents('nvda'))
@@ -0,0 +1,151 @@
+import bisect, os, threading
+import numpy as np
+import h5py
+import Paths
+
+FILE = Paths.path('bars.h5')
+COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+#Rows per chunk, a chunk of a column is about 32KB before compression
+CHUNK = 4096
+
+
+class BarStore():
+    '''
+    Historical bars on disk, in an HDF5 file grouped by /<symbol>/<interval>
+
+    Each group holds one resizable dataset per column plus `t`, the timestamps in
+    seconds since the epoch, always increasing. The datasets are chunked and compressed,
+    so reading a range only decompresses the chunks it spans. Bars are only ever appended
+    after the last stored one.
+
+    A range is found by bisecting `t` on disk, through the first timestamp of each chunk.
+    Those are read once per group and kept, a read then only loads the chunks of `t`
+    at the two ends of the range.
+
+    Args:
+        path (str): HDF5 file, created on the first append
+    '''
+    def __init__(self, path = FILE):
+        self.path = path
+        #HDF5 itself isn't safe to use from several threads
+        self._lock = threading.RLock()
+        #(symbol, interval) to the first timestamp of each chunk of `t`
+        self._firsts = {}
+
+
+    def _group(self, f, symbol, interval):
+        return f.get('{}/{}'.format(symbol, int(interval)))
+
+
+    def bounds(self, symbol, interval):
+        '''
+        Timestamps of the first and last bars stored
+
+        Args:
+            symbol (str): ticker symbol
+            interval (int): seconds between bars
+
+        Returns:
+            (tuple): seconds since the epoch of both, None if nothing is stored
+        '''
+        with self._lock:
+            if not os.path.isfile(self.path):
+                return None
+            with h5py.File(self.path, 'r') as f:
+                group = self._group(f, symbol, interval)
+                if group is None or not len(group['t']):
+                    return None
+                t = group['t']
+                return int(t[0]), int(t[-1])
+
+
+    def append(self, symbol, interval, stamps, columns):
+        '''
+        Stores the bars that come after the last one stored, the rest are already there
+
+        Args:
+            symbol (str): ticker symbol
+            interval (int): seconds between bars
+            stamps (numpy.ndarray): seconds since the epoch of each bar, increasing
+            columns (dict): array of each of COLUMNS, same length as stamps
+
+        Returns:
+            (int): number of bars added
+        '''
+        stamps = np.asarray(stamps, dtype = np.int64)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok = True)
+            with h5py.File(self.path, 'a') as f:
+                group = self._group(f, symbol, interval)
+                if group is None:
+                    group = f.create_group('{}/{}'.format(symbol, int(interval)))
+                    for name in ('t',) + COLUMNS:
+                        group.create_dataset(name, shape = (0,), maxshape = (None,), chunks = (CHUNK,),
+                            dtype = np.int64 if name in ('t', 'Volume') else np.float64,
+                            compression = 'gzip', compression_opts = 4, shuffle = True)
+
+                t = group['t']
+                new = stamps > t[-1] if len(t) else np.ones(len(stamps), dtype = bool)
+                added = int(new.sum())
+                if added:
+                    size = len(t)
+                    for name, values in [('t', stamps)] + [(name, np.asarray(columns[name])) for name in COLUMNS]:
+                        dataset = group[name]
+                        dataset.resize((size + added,))
+                        dataset[size:] = values[new]
+                return added
+
+
+    def read(self, symbol, interval, start = None, end = None):
+        '''
+        Reads the bars of a time range, only touching the chunks that hold it
+
+        Args:
+            symbol (str): ticker symbol
+            interval (int): seconds between bars
+            start (float): seconds since the epoch of the first bar, from the first stored if None
+            end (float): seconds since the epoch the bars come before, to the last stored if None
+
+        Returns:
+            (tuple): timestamps (numpy.ndarray) and the array of each column (dict)
+        '''
+        empty = np.array([], dtype = np.int64), {name : np.array([]) for name in COLUMNS}
+        with self._lock:
+            if not os.path.isfile(self.path):
+                return empty
+            with h5py.File(self.path, 'r') as f:
+                group = self._group(f, symbol, interval)
+                if group is None:
+                    return empty
+                t = group['t']
+                i = 0 if start is None else self._search(symbol, interval, t, start)
+                j = len(t) if end is None else self._search(symbol, interval, t, end)
+                return t[i:j], {name : group[name][i:j] for name in COLUMNS}
+
+
+    def _search(self, symbol, interval, t, stamp):
+        #Index of the first bar at or after `stamp`, reading one chunk of `t`
+        key = (symbol, int(interval))
+        chunks = -(-len(t) // CHUNK)
+        firsts = self._firsts.get(key, [])
+        if len(firsts) > chunks:
+            #The file was replaced since
+            firsts = []
+        if len(firsts) < chunks:
+            #Appends never change the first bar of a chunk, only the new chunks are read
+            firsts = firsts + [int(first) for first in t[len(firsts) * CHUNK::CHUNK]]
+            self._firsts[key] = firsts
+        chunk = max(0, bisect.bisect_right(firsts, stamp) - 1)
+        #The bar is in that chunk, or is the first of the next one
+        begin = chunk * CHUNK
+        values = t[begin:min(len(t), begin + CHUNK)]
+        return begin + int(np.searchsorted(values, stamp, 'left'))
+
+
+    def symbols(self):
+        #Every (symbol, interval) stored
+        with self._lock:
+            if not os.path.isfile(self.path):
+                return []
+            with h5py.File(self.path, 'r') as f:
+                return [(symbol, int(interval)) for symbol in f for interval in f[symbol]]
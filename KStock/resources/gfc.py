@@ -1,126 +1,214 @@
 # coding: utf-8
-import requests, time, json, demjson
+import time, json, io, re, threading, pytz, holidays
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from urllib.request import Request, urlopen
 from html.parser import unescape
+import resources.providers as providers
+from resources.bars import BarStore
+
+COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+#Order of the columns in a getprices payload
+_FIELDS = ['D', 'Close', 'High', 'Low', 'Open', 'Volume']
+#Every UTC offset is a whole number of quarter hours, and so is every change of offset
+_QUARTER = 900
+#Max number of symbols fetched at once
+WORKERS = 16
+
+_pool = None
+_poolLock = threading.Lock()
+
+#Where closed days are kept so they're only fetched once, None to always fetch everything
+barStore = BarStore()
+#getprices periods, a number of trading days, months or years
+_PERIOD = re.compile(r'^(\d+)([dMY])$')
+_EASTERN = pytz.timezone('US/Eastern')
+
+
+def _localize(stamps):
+    '''
+    Same as datetime.fromtimestamp() on every element, without calling it on every element
+
+    Args:
+        stamps (numpy.ndarray): seconds since the epoch
+
+    Returns:
+        (pandas.DatetimeIndex): naive local times
+    '''
+    quarters, inverse = np.unique(stamps // _QUARTER, return_inverse = True)
+    offsets = np.array([time.localtime(q * _QUARTER).tm_gmtoff for q in quarters.tolist()], dtype = np.int64)
+    return pd.DatetimeIndex(pd.to_datetime(stamps + offsets[inverse.ravel()], unit = 's'))
+
+
+def _rows(text, interval):
+    '''
+    Turns a getprices payload into bars, all rows at once
+
+    The rows are either `a<timestamp>,...`, which sets the base time, or `<n>,...`,
+    which is n intervals after the last base time. Everything up to `DATA=` is header.
+
+    Args:
+        text (str): payload, as returned by the provider
+        interval (int): seconds between bars
+
+    Returns:
+        (tuple): seconds since the epoch of each bar (numpy.ndarray) and the array of each column (dict)
+    '''
+    #Skips the header, the rest are rows and TIMEZONE_OFFSET lines. Base times are made
+    #negative so the whole first column parses as integers
+    start = text.find('DATA=')
+    body = '\n' + (text[text.find('\n', start) + 1:] if start != -1 else text)
+    body = body.replace('\na', '\n-')
+
+    try:
+        raw = pd.read_csv(io.StringIO(body), header = None, names = _FIELDS, comment = 'T',
+            dtype = {'D' : np.int64, 'Volume' : np.int64})
+    except pd.errors.EmptyDataError:
+        raw = pd.DataFrame({col : np.array([], dtype = np.int64) for col in _FIELDS})
+
+    dates = raw['D'].to_numpy()
+    base = dates < 0
+    values = np.abs(dates)
+    #Position of the last base time, -1 before the first one
+    last = np.maximum.accumulate(np.where(base, np.arange(len(base)), -1)) if len(base) else dates
+    basetime = np.where(last >= 0, values[last], 0)
+    stamps = np.where(base, values, basetime + values * interval)
+
+    return stamps, {col : raw[col].to_numpy(dtype = np.int64 if col == 'Volume' else float) for col in COLUMNS}
+
+
+def _frame(stamps, columns):
+    #Bars as a frame indexed by local time
+    return pd.DataFrame({col : columns[col] for col in COLUMNS}, index = _localize(stamps))
+
+
+def _parse(text, interval):
+    '''
+    Turns a getprices payload into bars
+
+    Args:
+        text (str): payload, as returned by the provider
+        interval (int): seconds between bars
+
+    Returns:
+        (pandas.DataFrame): Open, High, Low, Close and Volume indexed by local time
+    '''
+    return _frame(*_rows(text, interval))
+
+
+def _history(query):
+    '''
+    Bars of a query, reading the days already closed from barStore and only fetching the rest
+
+    Fetches everything when nothing is stored, when the stored bars don't reach back to
+    the start of the period or when the period isn't one of `<n>d`, `<n>M` or `<n>Y`.
+    Whatever days have closed are stored on the way.
+
+    Args:
+        query (dict): getprices parameters
+
+    Returns:
+        (pandas.DataFrame): Open, High, Low, Close and Volume indexed by local time
+    '''
+    interval = int(query['i'])
+    match = _PERIOD.match(str(query.get('p', '')))
+    if barStore is None or not match:
+        return _parse(providers.current().prices(query), interval)
+
+    symbol, n, unit = query['q'], int(match.group(1)), match.group(2)
+    today = datetime.now(_EASTERN).date()
+    midnight = _EASTERN.localize(datetime.combine(today, datetime.min.time())).timestamp()
+    years = n // 200 + 1 if unit == 'd' else n // 12 + 1 if unit == 'M' else n + 1
+    closedDays = sorted(holidays.NYSE(years = range(today.year - years, today.year + 1)))
+    if unit == 'd':
+        #Trading days, a week more is read to be safe
+        start = _EASTERN.localize(datetime.combine(
+            np.busday_offset(today, -(n - 1), roll = 'backward', holidays = closedDays).item(),
+            datetime.min.time())).timestamp()
+        lowest = start - 7 * 86400
+    else:
+        anchor = pd.Timestamp(midnight, unit = 's') - pd.DateOffset(**{'months' if unit == 'M' else 'years' : n})
+        lowest = anchor.timestamp()
+        #The first bar is on the first session from the anchor, which can be a weekend or holiday
+        start = _EASTERN.localize(datetime.combine(
+            np.busday_offset(anchor.date(), 0, roll = 'forward', holidays = closedDays).item(),
+            datetime.min.time())).timestamp()
+
+    bounds = barStore.bounds(symbol, interval)
+    #Stored from the first day of the period on, and not so long ago it's all over
+    tail = bounds is not None and bounds[0] < start + 86400 and start <= bounds[1]
+    if tail:
+        #Only the days since the last bar stored, the overlap is dropped when appending
+        query = dict(query, p = '{}d'.format(int((midnight - bounds[1]) // 86400) + 2))
+    stamps, columns = _rows(providers.current().prices(query), interval)
+
+    closed = stamps < midnight
+    barStore.append(symbol, interval, stamps[closed], {col : column[closed] for col, column in columns.items()})
+    if not tail:
+        return _frame(stamps, columns)
+
+    stored, kept = barStore.read(symbol, interval, lowest)
+    fresh = stamps > stored[-1] if len(stored) else np.ones(len(stamps), dtype = bool)
+    frame = _frame(np.concatenate([stored, stamps[fresh]]),
+        {col : np.concatenate([kept[col], columns[col][fresh]]) for col in COLUMNS})
+    if unit == 'd':
+        #The last n trading days there are bars of
+        days = frame.index.normalize()
+        frame = frame[days >= days.unique()[-n]] if len(frame) else frame
+    return frame
+
+
+def _bars(query, columns, daily):
+    #One symbol's bars, named after it, one row per timestamp (per day if daily)
+    df = _history(query)[columns]
+    if daily:
+        df.index = df.index.date
+    df.columns = [query['q'] + '_' + col for col in columns]
+    return df[~df.index.duplicated(keep = 'last')]
+
 
 def get_price_data(query):
-    r = requests.get("https://finance.google.com/finance/getprices", params=query)
-    lines = r.text.splitlines()
-    data = []
-    index = []
-    basetime = 0
-    for price in lines:
-        cols = price.split(",")
-        if cols[0][0] == 'a':
-            basetime = int(cols[0][1:])
-            index.append(datetime.fromtimestamp(basetime))
-            data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-        elif cols[0][0].isdigit():
-            date = basetime + (int(cols[0])*int(query['i']))
-            index.append(datetime.fromtimestamp(date))
-            data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-    return pd.DataFrame(data, index = index, columns = ['Open', 'High', 'Low', 'Close', 'Volume'])
+    return _history(query)
+
+
+def _fetch(queries, columns, daily, **params):
+    '''
+    Fetches the bars of every query at once over a shared pool and joins them in one go
+
+    Args:
+        queries (list): getprices parameters of each symbol, left untouched
+        columns (list): bar columns to keep
+        daily (bool): whether the rows are days rather than timestamps
+        params: parameters set on every query, i.e. interval and period
+
+    Returns:
+        (pandas.DataFrame): `SYM_<column>` columns of every symbol, in query order
+    '''
+    global _pool
+    with _poolLock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers = WORKERS, thread_name_prefix = 'gfc')
+
+    queries = [dict(query, **params) for query in queries]
+    frames = list(_pool.map(lambda query : _bars(query, columns, daily), queries))
+    return pd.concat(frames, axis = 1) if frames else pd.DataFrame()
 
 
 def get_closing_data(queries, period):
-    closing_data = []
-    for query in queries:
-        query['i'] = 86400
-        query['p'] = period
-        r = requests.get("https://www.google.com/finance/getprices", params=query)
-        lines = r.text.splitlines()
-        data = []
-        index = []
-        basetime = 0
-        for price in lines:
-            cols = price.split(",")
-            if cols[0][0] == 'a':
-                basetime = int(cols[0][1:])
-                date = basetime
-                data.append(float(cols[1]))
-                index.append(datetime.fromtimestamp(date).date())
-            elif cols[0][0].isdigit():
-                date = basetime + (int(cols[0])*int(query['i']))
-                data.append(float(cols[1]))
-                index.append(datetime.fromtimestamp(date).date())
-        s = pd.Series(data,index=index,name=query['q'])
-        closing_data.append(s[~s.index.duplicated(keep='last')])
-    return pd.concat(closing_data, axis=1)
+    closing_data = _fetch(queries, ['Close'], True, i = 86400, p = period)
+    closing_data.columns = [query['q'] for query in queries]
+    return closing_data
 
 def get_open_close_data(queries, period):
-    open_close_data = pd.DataFrame()
-    for query in queries:
-        query['i'] = 86400
-        query['p'] = period
-        r = requests.get("https://www.google.com/finance/getprices", params=query)
-        lines = r.text.splitlines()
-        data = []
-        index = []
-        basetime = 0
-        for price in lines:
-            cols = price.split(",")
-            if cols[0][0] == 'a':
-                basetime = int(cols[0][1:])
-                date = basetime
-                data.append([float(cols[4]), float(cols[1])])
-                index.append(datetime.fromtimestamp(date).date())
-            elif cols[0][0].isdigit():
-                date = basetime + (int(cols[0])*int(query['i']))
-                data.append([float(cols[4]), float(cols[1])])
-                index.append(datetime.fromtimestamp(date).date())
-        df = pd.DataFrame(data, index=index, columns=[query['q']+'_Open',query['q']+'_Close'])
-        open_close_data = pd.concat([open_close_data, df[~df.index.duplicated(keep='last')]], axis=1)
-    return open_close_data
+    return _fetch(queries, ['Open', 'Close'], True, i = 86400, p = period)
 
 def get_prices_data(queries):
-    prices_data = pd.DataFrame()
-    for query in queries:
-        r = requests.get("https://www.google.com/finance/getprices", params=query)
-        lines = r.text.splitlines()
-        data = []
-        index = []
-        basetime = 0
-        for price in lines:
-            cols = price.split(",")
-            if cols[0][0] == 'a':
-                basetime = int(cols[0][1:])
-                date = basetime
-                data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-                index.append(datetime.fromtimestamp(date).date())
-            elif cols[0][0].isdigit():
-                date = basetime + (int(cols[0])*int(query['i']))
-                data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-                index.append(datetime.fromtimestamp(date).date())
-        df = pd.DataFrame(data, index=index, columns=[query['q']+'_Open',query['q']+'_High',query['q']+'_Low',query['q']+'_Close',query['q']+'_Volume'])
-        prices_data = pd.concat([prices_data, df[~df.index.duplicated(keep='last')]], axis=1)
-    return prices_data
+    return _fetch(queries, COLUMNS, True)
 
 def get_prices_time_data(queries, period, interval):
-    prices_time_data = pd.DataFrame()
-    for query in queries:
-        query['i'] = interval
-        query['p'] = period
-        r = requests.get("https://www.google.com/finance/getprices", params=query)
-        lines = r.text.splitlines()
-        data = []
-        index = []
-        basetime = 0
-        for price in lines:
-            cols = price.split(",")
-            if cols[0][0] == 'a':
-                basetime = int(cols[0][1:])
-                date = basetime
-                data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-                index.append(datetime.fromtimestamp(date))
-            elif cols[0][0].isdigit():
-                date = basetime + (int(cols[0])*int(query['i']))
-                data.append([float(cols[4]), float(cols[2]), float(cols[3]), float(cols[1]), int(cols[5])])
-                index.append(datetime.fromtimestamp(date))
-        df = pd.DataFrame(data, index=index, columns=[query['q']+'_Open',query['q']+'_High',query['q']+'_Low',query['q']+'_Close',query['q']+'_Volume'])
-        prices_time_data = pd.concat([prices_time_data, df[~df.index.duplicated(keep='last')]], axis=1)
-    return prices_time_data
+    return _fetch(queries, COLUMNS, False, i = interval, p = period)
 
 
 def buildNewsUrl(symbol, qs='&start=0&num=5'):
@@ -138,6 +226,7 @@ def request(symbols):
  
  
 def getNews(symbol):
+    import demjson
     url = buildNewsUrl(symbol)
  
     content = urlopen(url).read().decode('utf-8')
@@ -0,0 +1,233 @@
+import abc, json, logging, os, requests, threading, time
+from collections import defaultdict
+from requests.adapters import HTTPAdapter
+from resources.NASDAQ import URL, Quote, parseCurrents
+
+GETPRICES = 'https://www.google.com/finance/getprices'
+
+
+class Provider(abc.ABC):
+    '''
+    Where the market data comes from
+
+    quote() feeds the Ticks through the quote cache, prices() feeds the gfc helpers
+    with raw getprices payloads. Providers that have none of one return False or an
+    empty payload, same as when a fetch fails.
+    '''
+    @abc.abstractmethod
+    def quote(self, tick):
+        '''
+        Args:
+            tick (str): ticker symbol
+
+        Returns:
+            (Quote): current metrics of the tick, False if there are none
+        '''
+
+
+    @abc.abstractmethod
+    def prices(self, query):
+        '''
+        Args:
+            query (dict): getprices parameters, 'q' symbol, 'i' interval, 'p' period...
+
+        Returns:
+            (str): getprices payload, '' if there's none
+        '''
+
+
+class NASDAQProvider(Provider):
+    '''
+    Live quotes scraped from the NASDAQ real-time page over a keep-alive session
+
+    Args:
+        url (str): page to scrape, `{}` is replaced by the ticker
+        timeout (float): seconds to wait on each request
+        connections (int): max number of pooled connections
+    '''
+    def __init__(self, url = URL, timeout = 1, connections = 16):
+        self.url = url
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections = 4, pool_maxsize = connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+
+    def quote(self, tick):
+        url = self.url.format(tick)
+        try:
+            r = self.session.get(url, timeout = self.timeout)
+            r.raise_for_status()
+        except requests.exceptions.RequestException as error:
+            logging.error('Data of %s not retrieved because %s\nURL: %s', tick, error, url)
+            return False
+
+        return parseCurrents(r.content)
+
+
+    def prices(self, query):
+        #NASDAQ has no history
+        return ''
+
+
+class GFCProvider(Provider):
+    '''
+    Historical bars from the Google Finance getprices endpoint
+
+    Args:
+        url (str): getprices endpoint
+        connections (int): max number of pooled connections
+    '''
+    def __init__(self, url = GETPRICES, connections = 16):
+        self.pricesUrl = url
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections = 4, pool_maxsize = connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+
+    def quote(self, tick):
+        #getprices has no live quotes
+        return False
+
+
+    def prices(self, query):
+        r = self.session.get(self.pricesUrl, params = query)
+        return r.text
+
+
+class LiveProvider(NASDAQProvider, GFCProvider):
+    #Quotes from NASDAQ and prices from Google Finance over the same session, the default
+    def __init__(self):
+        NASDAQProvider.__init__(self)
+        self.pricesUrl = GETPRICES
+
+
+    def quote(self, tick):
+        return NASDAQProvider.quote(self, tick)
+
+
+    def prices(self, query):
+        return GFCProvider.prices(self, query)
+
+
+def _pricesFile(query):
+    #File name a getprices payload is recorded under
+    return '{}_{}_{}.txt'.format(query['q'], query.get('i', ''), query.get('p', ''))
+
+
+class ReplayProvider(Provider):
+    '''
+    Plays back data recorded by RecordingProvider, as fast as it's asked for
+
+    Each call to quote() returns the next recorded quote of that ticker, False once
+    its recording runs out. prices() returns the recorded payload of the query, an
+    empty one if it wasn't recorded. stream() goes through every quote in recorded order.
+
+    Args:
+        quotes (str): JSON lines file of recorded quotes
+        prices (str): directory of recorded getprices payloads
+    '''
+    def __init__(self, quotes = None, prices = None):
+        self.quotesPath = quotes
+        self.pricesPath = prices
+        self._lock = threading.Lock()
+        self._quotes = defaultdict(list)
+        self._cursor = defaultdict(int)
+
+        if quotes:
+            for stamp, tick, metrics in self.stream():
+                self._quotes[tick].append(metrics)
+
+
+    def stream(self):
+        '''
+        Yields every recorded quote in order
+
+        Yields:
+            (tuple): (timestamp, ticker symbol, Quote)
+        '''
+        with open(self.quotesPath, 'r') as fileIn:
+            for line in fileIn:
+                record = json.loads(line)
+                yield record.pop('t'), record.pop('T'), Quote(**record)
+
+
+    def quote(self, tick):
+        with self._lock:
+            cursor = self._cursor[tick]
+            recorded = self._quotes.get(tick)
+            if not recorded or cursor >= len(recorded):
+                return False
+            self._cursor[tick] = cursor + 1
+        return recorded[cursor]
+
+
+    def rewind(self):
+        with self._lock:
+            self._cursor.clear()
+
+
+    def prices(self, query):
+        path = os.path.join(self.pricesPath, _pricesFile(query)) if self.pricesPath else None
+        if path is None or not os.path.isfile(path):
+            logging.warning('No prices recorded for {}'.format(_pricesFile(query)))
+            return ''
+        with open(path, 'r') as fileIn:
+            return fileIn.read()
+
+
+class RecordingProvider(Provider):
+    '''
+    Passes everything through to another provider and records it for ReplayProvider
+
+    Args:
+        provider (Provider): where the data actually comes from
+        quotes (str): JSON lines file the quotes are appended to
+        prices (str): directory the getprices payloads are saved in
+    '''
+    def __init__(self, provider, quotes = None, prices = None):
+        self.provider = provider
+        self.quotesPath = quotes
+        self.pricesPath = prices
+        self._lock = threading.Lock()
+
+
+    def quote(self, tick):
+        metrics = self.provider.quote(tick)
+        if metrics and self.quotesPath:
+            line = json.dumps(dict(metrics._asdict(), t = time.time(), T = tick)) + '\n'
+            with self._lock, open(self.quotesPath, 'a') as fileOut:
+                fileOut.write(line)
+        return metrics
+
+
+    def prices(self, query):
+        payload = self.provider.prices(query)
+        if self.pricesPath:
+            with open(os.path.join(self.pricesPath, _pricesFile(query)), 'w') as fileOut:
+                fileOut.write(payload)
+        return payload
+
+
+_provider = None
+_providerLock = threading.Lock()
+
+def current():
+    #The provider everything reads from, live data unless set otherwise
+    global _provider
+    if _provider is None:
+        #Worker threads can all ask for it first, only one builds it
+        with _providerLock:
+            if _provider is None:
+                _provider = LiveProvider()
+    return _provider
+
+
+def setProvider(provider):
+    global _provider
+    with _providerLock:
+        _provider = provider
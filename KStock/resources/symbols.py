@@ -0,0 +1,133 @@
+import bisect, csv, hashlib, json, logging, os
+import Paths
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+COMPANIES = os.path.join(DIR, 'companyList.csv')
+INDEX = Paths.path('symbols.json')
+
+
+def _hash(path):
+    with open(path, 'rb') as fileIn:
+        return hashlib.sha1(fileIn.read()).hexdigest()
+
+
+class SymbolIndex():
+    '''
+    Prefix search over every listed company, by symbol or by name
+
+    The symbols and the names (cleaned with Helpers.cleanComp, lower case, one key per
+    word so "sys" finds "3D Systems") are kept in sorted lists, a search is a bisect
+    on each. The lists are built from companyList.csv the first time and saved to
+    `index`, later loads only read that back, until the csv changes. Nothing is read
+    before the first search.
+
+    Args:
+        companies (str): csv of the companies, with Symbol and Name columns
+        index (str): where the built index is kept, None to keep it in memory only
+    '''
+    def __init__(self, companies = COMPANIES, index = INDEX):
+        self.companies = companies
+        self.index = index
+        self._data = None
+
+
+    def _build(self, digest):
+        from Helpers import cleanComp
+        with open(self.companies, 'r', newline = '') as fileIn:
+            rows = [(row['Symbol'].strip(), row['Name'].strip()) for row in csv.DictReader(fileIn) if row['Symbol']]
+        symbols = [symbol for symbol, _ in rows]
+        names = [cleanComp(name) or name for _, name in rows]
+
+        symbolKeys = sorted((symbol.upper(), i) for i, symbol in enumerate(symbols))
+        words = []
+        for i, name in enumerate(names):
+            parts = name.lower().split()
+            words.extend((' '.join(parts[k:]), i) for k in range(len(parts)))
+        nameKeys = sorted(words)
+        return {
+            'hash' : digest, 'symbols' : symbols, 'names' : names,
+            'symbolKeys' : [key for key, _ in symbolKeys], 'symbolRows' : [i for _, i in symbolKeys],
+            'nameKeys' : [key for key, _ in nameKeys], 'nameRows' : [i for _, i in nameKeys]
+        }
+
+
+    def load(self):
+        '''
+        Reads the index, building it if it isn't there or the csv changed since
+
+        Returns:
+            (dict): the sorted keys and the rows they belong to
+        '''
+        if self._data is not None:
+            return self._data
+
+        digest = _hash(self.companies)
+        data = None
+        if self.index and os.path.isfile(self.index):
+            try:
+                with open(self.index, 'r') as fileIn:
+                    data = json.load(fileIn)
+            except ValueError:
+                data = None
+        if data is None or data.get('hash') != digest:
+            data = self._build(digest)
+            if self.index:
+                try:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.index)), exist_ok = True)
+                    with open(self.index, 'w') as fileOut:
+                        json.dump(data, fileOut, separators = (',', ':'))
+                except OSError as e:
+                    logging.error('Symbol index not saved: {}'.format(e))
+        self._data = data
+        return data
+
+
+    @property
+    def symbols(self):
+        return self.load()['symbols']
+
+
+    def name(self, symbol):
+        #Company name of the symbol, None if it isn't listed
+        data = self.load()
+        keys = data['symbolKeys']
+        at = bisect.bisect_left(keys, symbol.upper())
+        if at < len(keys) and keys[at] == symbol.upper():
+            return data['names'][data['symbolRows'][at]]
+        return None
+
+
+    def _prefixed(self, keys, rows, prefix):
+        #Rows of the keys starting with prefix, in key order
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        return rows[start:end]
+
+
+    def search(self, text, limit = 20):
+        '''
+        Companies whose symbol or a word of whose name starts with `text`
+
+        Args:
+            text (str): what was typed, case doesn't matter
+            limit (int): max matches
+
+        Returns:
+            (list): (symbol, name) of the matches, symbols matching first, shortest first
+        '''
+        text = text.strip()
+        if not text:
+            return []
+        data = self.load()
+        symbols, names = data['symbols'], data['names']
+
+        bySymbol = self._prefixed(data['symbolKeys'], data['symbolRows'], text.upper())
+        bySymbol = sorted(bySymbol, key = lambda i : len(symbols[i]))
+        byName = self._prefixed(data['nameKeys'], data['nameRows'], text.lower())
+
+        matches = list(dict.fromkeys(bySymbol + byName))[:limit]
+        return [(symbols[i], names[i]) for i in matches]
+
+
+#Shared by every AddTick
+symbolIndex = SymbolIndex()
@@ -0,0 +1,61 @@
+'''
+A batch writer keeps going whatever a batch does, flush() and close() always return
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import os, tempfile, threading
+from Batch import BatchWriter
+from Journal import Journal, read
+from Ledger import Ledger
+from resources.NASDAQ import Quote
+
+
+class Picky(BatchWriter):
+    #Fails on any batch with a negative item
+    def __init__(self):
+        self.items = []
+        BatchWriter.__init__(self, 'Picky', interval = 0.05)
+
+    def _write(self, batch):
+        if min(batch) < 0:
+            raise ValueError('negative')
+        self.items.extend(batch)
+
+
+def returns(fn, timeout = 5):
+    thread = threading.Thread(target = fn, daemon = True)
+    thread.start()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+
+def test_failed_batch_is_dropped_and_writing_goes_on():
+    writer = Picky()
+    writer.put(-1)
+    assert returns(writer.flush)
+    writer.put(1)
+    writer.put(2)
+    assert returns(writer.flush)
+    assert writer.items == [1, 2] and writer.written == 2
+    assert returns(writer.close)
+
+
+def test_journal_survives_a_bad_quote():
+    directory = tempfile.mkdtemp()
+    journal = Journal(directory, interval = 0.05)
+    journal.record('NVDA', None, 0)
+    assert returns(journal.flush)
+    journal.record('NVDA', Quote(50.0, 0.0, 0.0, 50.0, 51.0, 49.0, 60.0, 40.0, 1e6, 'green'), 86400 * 365.5)
+    assert returns(journal.close)
+    assert len(read('1971-01-01', directory)) == 1
+
+
+def test_ledger_survives_a_bad_fill():
+    ledger = Ledger(os.path.join(tempfile.mkdtemp(), 'ledger.db'), interval = 0.05)
+    ledger.bought('NVDA', object(), 50.0)
+    assert returns(ledger.flush)
+    ledger.bought('NVDA', 10, 50.0)
+    ledger.sold('NVDA', 10, 51.0, 10.0)
+    assert returns(ledger.close)
+    assert ledger.profitBySymbol() == {'NVDA' : (10.0, 1)}
@@ -0,0 +1,53 @@
+'''
+The Board has to trade exactly like the Ticks it holds
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import numpy as np
+import resources.providers as providers
+from resources.NASDAQ import Quote
+from Board import Board, stopLoss
+from Tick import Tick
+
+#Prices where rounding price * 100 and rounding the exact value disagree on the cent
+PRICES = [119.55, 0.15, 1.35, 10.05, 33.45, 250.65]
+
+
+def quote(price):
+    return Quote(price, 0.0, 0.0, price, price, price, price, price, 1e6, '')
+
+
+def setup_module(module):
+    #Nothing recorded, a Tick built without a quote doesn't go to the network
+    providers.setProvider(providers.ReplayProvider())
+
+
+def test_stopLoss_rounds_like_round():
+    prices = np.round(np.arange(1, 50000) * 0.01, 2)
+    assert stopLoss(prices).tolist() == [round(p - (p * 0.1), 2) for p in prices.tolist()]
+    assert stopLoss(119.55) == 107.59
+
+
+def test_board_buys_at_the_tick_stop_loss():
+    board = Board()
+    ticks, boarded = [], []
+    for i, price in enumerate(PRICES):
+        tick = Tick('S{}'.format(i), 1000)
+        tick.purchase(1000, 'ST', forced = True, quote = quote(price))
+        ticks.append(tick)
+
+        row = Tick('B{}'.format(i), 1000)
+        board.add(row)
+        row.update(1000, quote(price))
+        boarded.append(row)
+
+    #Two rises in a row buy on ST
+    held = np.zeros(board.capacity, dtype = bool)
+    fresh = board.mask(boarded)
+    board.pPrice[fresh] = board.C[fresh] - 0.02
+    board.buyRev[fresh] = 1
+    buys, _ = board.step('ST', held, fresh)
+
+    assert buys[fresh].all()
+    assert [row.SL for row in boarded] == [tick.SL for tick in ticks]
@@ -0,0 +1,105 @@
+'''
+An order the broker rejects has to be undone, the engine can't keep a position it
+doesn't have
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import resources.providers as providers
+from resources.NASDAQ import Quote
+from Engine import Engine
+from Orders import OrderGateway, MockBroker
+from Quotes import quoteCache
+
+SETTINGS = {'journal' : False, 'ledger' : False, 'schedule' : False}
+
+
+def quote(price):
+    return Quote(price, 0.0, 0.0, price, price, price, price, price, 1e6, '')
+
+
+def setup_module(module):
+    #Nothing recorded, a Tick built without a quote doesn't go to the network
+    providers.setProvider(providers.ReplayProvider())
+
+
+def trading(failures):
+    engine = Engine(SETTINGS)
+    engine.orders = OrderGateway(MockBroker(latency = 0, failures = failures), onAck = engine.orderAck)
+    events = []
+    engine.listeners.append(lambda event, *args: events.append((event,) + args))
+    return engine, events
+
+
+def held(engine, symbol, price = 50.0):
+    tick = engine.add(symbol)
+    tick.update(engine.purPrice, quote(price))
+    tick.Q, tick.AP, tick.SL = tick.PQ, price, price * 0.9
+    assert engine.purchase(tick)
+    return tick
+
+
+def test_rejected_buy_goes_back_to_the_queue():
+    engine, events = trading(failures = 1)
+    tick = held(engine, 'NVDA')
+    engine.orders.close()
+
+    assert tick in engine.qTicks and tick not in engine.hTicks
+    assert (tick.Q, tick.AP, tick.SL) == (None, None, None)
+    assert engine.cost == 0
+    assert [event[0] for event in events][-1] == 'rejected' and events[-1][2] == 'buy'
+    assert [row.T for row in engine.snapshot.queue] == ['NVDA'] and not engine.snapshot.holdings
+
+
+def test_rejected_sell_keeps_the_position():
+    engine, events = trading(failures = 0)
+    tick = held(engine, 'NVDA')
+    engine.orders.close()
+    engine.orders = OrderGateway(MockBroker(latency = 0, failures = 1), onAck = engine.orderAck)
+    tick.update(engine.purPrice, quote(55.0))
+    assert engine.sell(tick)
+    engine.orders.close()
+
+    assert tick in engine.hTicks and tick not in engine.qTicks
+    assert (tick.Q, tick.AP, tick.SL) == (20, 50.0, 45.0)
+    assert not tick.tradeable
+    assert (engine.profit, engine.cost) == (0, -1000)
+    assert events[-1][0] == 'rejected' and events[-1][2] == 'sell'
+
+
+def test_accepted_orders_stand():
+    engine, events = trading(failures = 0)
+    tick = held(engine, 'NVDA')
+    tick.update(engine.purPrice, quote(55.0))
+    assert engine.sell(tick)
+    engine.orders.close()
+
+    assert tick in engine.qTicks and tick.tradeable
+    assert (engine.profit, engine.cost) == (100, 100)
+    assert 'rejected' not in [event[0] for event in events]
+
+
+class Provider():
+    #Serves a fixed price, counting what's asked of it
+    def __init__(self, price):
+        self.price = price
+        self.asked = []
+
+    def quote(self, tick):
+        self.asked.append(tick)
+        return quote(self.price)
+
+
+def test_quotes_go_through_the_engines_cache():
+    engine = Engine(dict(SETTINGS, schedule = True))
+    engine.quotes.provider = Provider(50.0)
+    shared = quoteCache.stats()
+
+    tick = engine.add('NVDA')
+    assert tick.C == 50.0 and tick.PQ == 20
+    assert engine.purchase(tick, forced = True)
+    assert (tick.Q, tick.AP) == (20, 50.0)
+
+    #The forced purchase read the quote add() fetched
+    assert engine.quotes.provider.asked == ['NVDA']
+    assert quoteCache.stats() == shared
@@ -0,0 +1,41 @@
+'''
+The order gateway has to resolve every order it was given, whatever happens to it
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import time
+from Orders import OrderGateway, MockBroker
+
+
+def test_submit_after_close_fails_right_away():
+    acks = []
+    gateway = OrderGateway(MockBroker(latency = 0), onAck = acks.append)
+    gateway.close()
+    future = gateway.buy('NVDA', 10, 50.0)
+
+    assert future.done()
+    ack = future.result()
+    assert not ack.ok and isinstance(ack.response, RuntimeError)
+    assert acks == [ack]
+    assert (gateway.sent, gateway.failed) == (0, 1)
+
+
+def test_close_twice():
+    gateway = OrderGateway(MockBroker(latency = 0))
+    assert gateway.sell('NVDA', 10, 50.0).result(1).ok
+    gateway.close()
+    gateway.close()
+    gateway.close(wait = False)
+
+
+def test_close_timeout_fails_what_wasnt_sent():
+    gateway = OrderGateway(MockBroker(latency = 0), rate = 10, burst = 1)
+    futures = [gateway.buy('S{}'.format(i), 1, 10.0) for i in range(50)]
+    start = time.monotonic()
+    gateway.close(timeout = 0.3)
+    assert time.monotonic() - start < 1
+
+    acks = [future.result(2) for future in futures]
+    assert acks[0].ok and not acks[-1].ok
+    assert gateway.sent + gateway.failed == len(futures)
@@ -0,0 +1,48 @@
+'''
+The poll scheduler has to stay within its budget, whatever is scheduled
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import resources.providers as providers
+from resources.NASDAQ import Quote
+from Scheduler import PollScheduler
+from Tick import Tick
+
+
+def setup_module(module):
+    providers.setProvider(providers.ReplayProvider())
+
+
+def ticks(n, held):
+    ticks = [Tick('S{}'.format(i), 1000) for i in range(n)]
+    for tick in ticks[:held]:
+        tick.update(1000, Quote(50.0, 0.0, 0.0, 50.0, 50.0, 50.0, 50.0, 50.0, 1e6, ''))
+        tick.Q, tick.AP, tick.SL = tick.PQ, 50.0, 45.0
+    return ticks
+
+
+def test_empty_schedule():
+    scheduler = PollScheduler()
+    assert scheduler.due(0) == []
+    assert scheduler.rate() == 0
+    assert PollScheduler(budget = 0).due(0) == []
+
+
+def test_held_using_up_the_budget():
+    scheduler = PollScheduler()
+    for tick in ticks(10, 10):
+        scheduler.add(tick, 0)
+    scheduler.due(0)
+    assert scheduler.heldScale > 1
+    assert scheduler.rate() <= 10 / 5 + 1e-9
+
+
+def test_held_crowding_out_the_queue():
+    scheduler = PollScheduler()
+    for tick in ticks(10, 5):
+        scheduler.add(tick, 0)
+    scheduler.due(0)
+    #The queued symbols keep their share
+    assert scheduler.rate() <= 10 / 5 + 1e-9
+    assert scheduler.scale < float('inf') and scheduler.heldScale > 1
@@ -0,0 +1,26 @@
+'''
+A Tick's price history gets one sample per quote
+
+Run from the KStock directory:
+    $ python -m pytest tests
+'''
+import resources.providers as providers
+from resources.NASDAQ import Quote
+from Tick import Tick, HISTORY
+
+
+def quote(price):
+    return Quote(price, 0.0, 0.0, price, price, price, price, price, 1e6, '')
+
+
+def setup_module(module):
+    providers.setProvider(providers.ReplayProvider())
+
+
+def test_update_then_purchase_samples_once():
+    tick = Tick('NVDA', 1000, HISTORY)
+    for i, price in enumerate((50.0, 50.5, 51.0)):
+        tick.update(1000, quote(price))
+        tick.purchase(1000, 'ST', quote = tick._quote)
+        assert len(tick.history) == i + 1
+    assert tick.history.prices.tolist() == [50.0, 50.5, 51.0]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/InitTest.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(239, 120)
+        self.gridLayout = QtWidgets.QGridLayout(Dialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setStyleSheet("font: 75 10pt \"MS Shell Dlg 2\";")
+        self.label.setAlignment(QtCore.Qt.AlignCenter)
+        self.label.setObjectName("label")
+        self.gridLayout.addWidget(self.label, 0, 0, 1, 1)
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setStyleSheet("font: 75 10pt \"MS Shell Dlg 2\";")
+        self.label_3.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout.addWidget(self.label_3, 1, 0, 1, 1)
+        self.nState = QtWidgets.QPushButton(Dialog)
+        self.nState.setEnabled(False)
+        self.nState.setObjectName("nState")
+        self.gridLayout.addWidget(self.nState, 0, 1, 1, 1)
+        self.rState = QtWidgets.QPushButton(Dialog)
+        self.rState.setEnabled(False)
+        self.rState.setObjectName("rState")
+        self.gridLayout.addWidget(self.rState, 1, 1, 1, 1)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.label.setText(_translate("Dialog", "NASDAQ"))
+        self.label_3.setText(_translate("Dialog", "Robinhood"))
+        self.nState.setText(_translate("Dialog", "Testing..."))
+        self.rState.setText(_translate("Dialog", "Testing..."))
+
+
+UI_HASH = '2e30244bc0878e10d2d840e421b839fe5a9d3f75'
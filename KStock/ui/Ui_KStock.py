@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/KStock.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_MainWindow(object):
+    def setupUi(self, MainWindow):
+        MainWindow.setObjectName("MainWindow")
+        MainWindow.resize(1000, 608)
+        self.centralwidget = QtWidgets.QWidget(MainWindow)
+        self.centralwidget.setObjectName("centralwidget")
+        self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
+        self.gridLayout.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout.setHorizontalSpacing(0)
+        self.gridLayout.setVerticalSpacing(5)
+        self.gridLayout.setObjectName("gridLayout")
+        self.tabWidget = QtWidgets.QTabWidget(self.centralwidget)
+        self.tabWidget.setObjectName("tabWidget")
+        self.liveTab = QtWidgets.QWidget()
+        self.liveTab.setObjectName("liveTab")
+        self.gridLayout_3 = QtWidgets.QGridLayout(self.liveTab)
+        self.gridLayout_3.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout_3.setSpacing(0)
+        self.gridLayout_3.setObjectName("gridLayout_3")
+        self.frame = QtWidgets.QFrame(self.liveTab)
+        self.frame.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.gridLayout_2 = QtWidgets.QGridLayout(self.frame)
+        self.gridLayout_2.setContentsMargins(5, -1, 5, -1)
+        self.gridLayout_2.setObjectName("gridLayout_2")
+        self.holdLabel = QtWidgets.QLabel(self.frame)
+        self.holdLabel.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.holdLabel.setObjectName("holdLabel")
+        self.gridLayout_2.addWidget(self.holdLabel, 5, 1, 1, 1)
+        self.label_4 = QtWidgets.QLabel(self.frame)
+        self.label_4.setObjectName("label_4")
+        self.gridLayout_2.addWidget(self.label_4, 0, 0, 1, 1)
+        self.label_3 = QtWidgets.QLabel(self.frame)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout_2.addWidget(self.label_3, 5, 0, 1, 1)
+        self.label_6 = QtWidgets.QLabel(self.frame)
+        self.label_6.setObjectName("label_6")
+        self.gridLayout_2.addWidget(self.label_6, 2, 0, 1, 1)
+        self.marginSpin = QtWidgets.QDoubleSpinBox(self.frame)
+        self.marginSpin.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.marginSpin.setMinimum(25000.0)
+        self.marginSpin.setMaximum(99999.99)
+        self.marginSpin.setSingleStep(0.01)
+        self.marginSpin.setProperty("value", 25000.0)
+        self.marginSpin.setObjectName("marginSpin")
+        self.gridLayout_2.addWidget(self.marginSpin, 1, 1, 1, 1)
+        self.label_2 = QtWidgets.QLabel(self.frame)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout_2.addWidget(self.label_2, 1, 0, 1, 1)
+        self.purPrice = QtWidgets.QDoubleSpinBox(self.frame)
+        self.purPrice.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.purPrice.setMaximum(999999.99)
+        self.purPrice.setSingleStep(0.1)
+        self.purPrice.setProperty("value", 1000.0)
+        self.purPrice.setObjectName("purPrice")
+        self.gridLayout_2.addWidget(self.purPrice, 2, 1, 1, 1)
+        self.label_9 = QtWidgets.QLabel(self.frame)
+        self.label_9.setObjectName("label_9")
+        self.gridLayout_2.addWidget(self.label_9, 4, 0, 1, 1)
+        self.marginLabel = QtWidgets.QLabel(self.frame)
+        self.marginLabel.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.marginLabel.setObjectName("marginLabel")
+        self.gridLayout_2.addWidget(self.marginLabel, 0, 1, 1, 1)
+        self.rebuy = QtWidgets.QCheckBox(self.frame)
+        self.rebuy.setLayoutDirection(QtCore.Qt.RightToLeft)
+        self.rebuy.setText("")
+        self.rebuy.setChecked(True)
+        self.rebuy.setObjectName("rebuy")
+        self.gridLayout_2.addWidget(self.rebuy, 4, 1, 1, 1)
+        self.frame_4 = QtWidgets.QFrame(self.frame)
+        self.frame_4.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_4.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_4.setObjectName("frame_4")
+        self.gridLayout_6 = QtWidgets.QGridLayout(self.frame_4)
+        self.gridLayout_6.setObjectName("gridLayout_6")
+        self.label_12 = QtWidgets.QLabel(self.frame_4)
+        self.label_12.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_12.setObjectName("label_12")
+        self.gridLayout_6.addWidget(self.label_12, 0, 0, 1, 1)
+        self.label_8 = QtWidgets.QLabel(self.frame_4)
+        self.label_8.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_8.setObjectName("label_8")
+        self.gridLayout_6.addWidget(self.label_8, 2, 0, 1, 1)
+        self.profitLabel = QtWidgets.QLabel(self.frame_4)
+        self.profitLabel.setAlignment(QtCore.Qt.AlignCenter)
+        self.profitLabel.setObjectName("profitLabel")
+        self.gridLayout_6.addWidget(self.profitLabel, 3, 0, 1, 1)
+        self.totalCost = QtWidgets.QLabel(self.frame_4)
+        self.totalCost.setAlignment(QtCore.Qt.AlignCenter)
+        self.totalCost.setObjectName("totalCost")
+        self.gridLayout_6.addWidget(self.totalCost, 1, 0, 1, 1)
+        self.gridLayout_2.addWidget(self.frame_4, 7, 0, 1, 2)
+        self.frame_3 = QtWidgets.QFrame(self.frame)
+        self.frame_3.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_3.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_3.setObjectName("frame_3")
+        self.gridLayout_5 = QtWidgets.QGridLayout(self.frame_3)
+        self.gridLayout_5.setContentsMargins(0, 0, 0, 0)
+        self.gridLayout_5.setVerticalSpacing(0)
+        self.gridLayout_5.setObjectName("gridLayout_5")
+        self.label_7 = QtWidgets.QLabel(self.frame_3)
+        self.label_7.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_7.setObjectName("label_7")
+        self.gridLayout_5.addWidget(self.label_7, 0, 0, 1, 2)
+        self.startBut = QtWidgets.QPushButton(self.frame_3)
+        self.startBut.setObjectName("startBut")
+        self.gridLayout_5.addWidget(self.startBut, 1, 0, 1, 1)
+        self.pauseBut = QtWidgets.QPushButton(self.frame_3)
+        self.pauseBut.setEnabled(False)
+        self.pauseBut.setObjectName("pauseBut")
+        self.gridLayout_5.addWidget(self.pauseBut, 1, 1, 1, 1)
+        self.gridLayout_2.addWidget(self.frame_3, 6, 0, 1, 2)
+        self.label = QtWidgets.QLabel(self.frame)
+        self.label.setObjectName("label")
+        self.gridLayout_2.addWidget(self.label, 3, 0, 1, 1)
+        self.purLimit = QtWidgets.QDoubleSpinBox(self.frame)
+        self.purLimit.setAlignment(QtCore.Qt.AlignRight|QtCore.Qt.AlignTrailing|QtCore.Qt.AlignVCenter)
+        self.purLimit.setMaximum(99999.0)
+        self.purLimit.setObjectName("purLimit")
+        self.gridLayout_2.addWidget(self.purLimit, 3, 1, 1, 1)
+        self.gridLayout_3.addWidget(self.frame, 2, 1, 1, 1)
+        self.graph = PlotWidget(self.liveTab)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Preferred, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.graph.sizePolicy().hasHeightForWidth())
+        self.graph.setSizePolicy(sizePolicy)
+        self.graph.setMinimumSize(QtCore.QSize(500, 200))
+        self.graph.setFrameShape(QtWidgets.QFrame.StyledPanel)
+        self.graph.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.graph.setObjectName("graph")
+        self.gridLayout_3.addWidget(self.graph, 3, 0, 1, 2)
+        self.label_5 = QtWidgets.QLabel(self.liveTab)
+        self.label_5.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_5.setObjectName("label_5")
+        self.gridLayout_3.addWidget(self.label_5, 1, 0, 1, 1)
+        self.holding = ObjListTable(self.liveTab)
+        self.holding.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.holding.setTabKeyNavigation(False)
+        self.holding.setProperty("showDropIndicator", False)
+        self.holding.setDragDropOverwriteMode(False)
+        self.holding.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.holding.setObjectName("holding")
+        self.holding.horizontalHeader().setMinimumSectionSize(130)
+        self.holding.horizontalHeader().setStretchLastSection(True)
+        self.holding.verticalHeader().setCascadingSectionResizes(True)
+        self.gridLayout_3.addWidget(self.holding, 2, 0, 1, 1)
+        self.tabWidget.addTab(self.liveTab, "")
+        self.backTab = QtWidgets.QWidget()
+        self.backTab.setObjectName("backTab")
+        self.gridLayout_4 = QtWidgets.QGridLayout(self.backTab)
+        self.gridLayout_4.setObjectName("gridLayout_4")
+        self.transTable = Transactions(self.backTab)
+        self.transTable.setMinimumSize(QtCore.QSize(200, 0))
+        self.transTable.setMaximumSize(QtCore.QSize(400, 16777215))
+        self.transTable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.transTable.setObjectName("transTable")
+        self.transTable.horizontalHeader().setDefaultSectionSize(85)
+        self.transTable.horizontalHeader().setStretchLastSection(True)
+        self.gridLayout_4.addWidget(self.transTable, 1, 0, 1, 1)
+        self.frame_2 = QtWidgets.QFrame(self.backTab)
+        self.frame_2.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame_2.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame_2.setObjectName("frame_2")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.frame_2)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.label_10 = QtWidgets.QLabel(self.frame_2)
+        self.label_10.setObjectName("label_10")
+        self.horizontalLayout.addWidget(self.label_10)
+        self.addQ = QtWidgets.QPushButton(self.frame_2)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Preferred)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.addQ.sizePolicy().hasHeightForWidth())
+        self.addQ.setSizePolicy(sizePolicy)
+        self.addQ.setMaximumSize(QtCore.QSize(75, 25))
+        self.addQ.setObjectName("addQ")
+        self.horizontalLayout.addWidget(self.addQ)
+        self.gridLayout_4.addWidget(self.frame_2, 0, 1, 1, 1)
+        self.label_11 = QtWidgets.QLabel(self.backTab)
+        self.label_11.setObjectName("label_11")
+        self.gridLayout_4.addWidget(self.label_11, 0, 0, 1, 1)
+        self.queue = ObjListTable(self.backTab)
+        self.queue.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.queue.setTabKeyNavigation(False)
+        self.queue.setProperty("showDropIndicator", False)
+        self.queue.setDragDropOverwriteMode(False)
+        self.queue.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        self.queue.setObjectName("queue")
+        self.queue.horizontalHeader().setMinimumSectionSize(130)
+        self.queue.horizontalHeader().setStretchLastSection(True)
+        self.queue.verticalHeader().setCascadingSectionResizes(True)
+        self.gridLayout_4.addWidget(self.queue, 1, 1, 1, 1)
+        self.tabWidget.addTab(self.backTab, "")
+        self.gridLayout.addWidget(self.tabWidget, 0, 0, 1, 1)
+        MainWindow.setCentralWidget(self.centralwidget)
+        self.menubar = QtWidgets.QMenuBar(MainWindow)
+        self.menubar.setGeometry(QtCore.QRect(0, 0, 1000, 26))
+        self.menubar.setObjectName("menubar")
+        self.menuSettings = QtWidgets.QMenu(self.menubar)
+        self.menuSettings.setObjectName("menuSettings")
+        MainWindow.setMenuBar(self.menubar)
+        self.actionAPI = QtWidgets.QAction(MainWindow)
+        self.actionAPI.setObjectName("actionAPI")
+        self.menuSettings.addAction(self.actionAPI)
+        self.menubar.addAction(self.menuSettings.menuAction())
+
+        self.retranslateUi(MainWindow)
+        self.tabWidget.setCurrentIndex(0)
+        QtCore.QMetaObject.connectSlotsByName(MainWindow)
+
+    def retranslateUi(self, MainWindow):
+        _translate = QtCore.QCoreApplication.translate
+        MainWindow.setWindowTitle(_translate("MainWindow", "MainWindow"))
+        self.holdLabel.setWhatsThis(_translate("MainWindow", "How much you\'re worth"))
+        self.holdLabel.setText(_translate("MainWindow", "0"))
+        self.label_4.setText(_translate("MainWindow", "Non-Margin ($)"))
+        self.label_3.setText(_translate("MainWindow", "Equity ($):"))
+        self.label_6.setText(_translate("MainWindow", "Purchase ($):"))
+        self.marginSpin.setWhatsThis(_translate("MainWindow", "Min 25k for SEC day trading"))
+        self.label_2.setText(_translate("MainWindow", "NM Limit ($):"))
+        self.purPrice.setWhatsThis(_translate("MainWindow", "How much you want to spend on each purchase"))
+        self.label_9.setText(_translate("MainWindow", "Re-Buy?:"))
+        self.marginLabel.setWhatsThis(_translate("MainWindow", "How much cash ya have on hand"))
+        self.marginLabel.setText(_translate("MainWindow", "0"))
+        self.rebuy.setWhatsThis(_translate("MainWindow", "If checked, a Tick will placed back on the Queue once sold"))
+        self.label_12.setText(_translate("MainWindow", "Total Cost"))
+        self.label_8.setText(_translate("MainWindow", "Today\'s Profit"))
+        self.profitLabel.setWhatsThis(_translate("MainWindow", "How much you\'ve made today"))
+        self.profitLabel.setText(_translate("MainWindow", "0"))
+        self.totalCost.setWhatsThis(_translate("MainWindow", "How much you\'ve spent today"))
+        self.totalCost.setText(_translate("MainWindow", "0"))
+        self.label_7.setText(_translate("MainWindow", "Trading Control"))
+        self.startBut.setText(_translate("MainWindow", "Start"))
+        self.pauseBut.setText(_translate("MainWindow", "Pause"))
+        self.label.setText(_translate("MainWindow", "Purchase Limit($):"))
+        self.purLimit.setWhatsThis(_translate("MainWindow", "How much of the Non-Margin you want to spend"))
+        self.label_5.setText(_translate("MainWindow", "Current Holdings"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.liveTab), _translate("MainWindow", "Live"))
+        self.label_10.setText(_translate("MainWindow", "Queue"))
+        self.addQ.setText(_translate("MainWindow", "Add Tick"))
+        self.label_11.setText(_translate("MainWindow", "Transactions"))
+        self.tabWidget.setTabText(self.tabWidget.indexOf(self.backTab), _translate("MainWindow", "Backend"))
+        self.menuSettings.setTitle(_translate("MainWindow", "Settings"))
+        self.actionAPI.setText(_translate("MainWindow", "API"))
+from ObjList import ObjListTable, Transactions
+from pyqtgraph import PlotWidget
+
+
+UI_HASH = 'abfdb18b8504c4affaa65b462ceb6e97ee9c9211'
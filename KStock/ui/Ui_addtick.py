@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/addtick.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(400, 67)
+        self.gridLayout = QtWidgets.QGridLayout(Dialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.okBut = QtWidgets.QPushButton(Dialog)
+        self.okBut.setObjectName("okBut")
+        self.gridLayout.addWidget(self.okBut, 1, 0, 1, 1)
+        self.cancelBut = QtWidgets.QPushButton(Dialog)
+        self.cancelBut.setObjectName("cancelBut")
+        self.gridLayout.addWidget(self.cancelBut, 1, 1, 1, 1)
+        self.tickEdit = QtWidgets.QLineEdit(Dialog)
+        self.tickEdit.setObjectName("tickEdit")
+        self.gridLayout.addWidget(self.tickEdit, 0, 0, 1, 2)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.okBut.setText(_translate("Dialog", "Ok"))
+        self.cancelBut.setText(_translate("Dialog", "Cancel"))
+
+
+UI_HASH = 'd6ffeb4c51790404833bd3d35146d0ced5910229'
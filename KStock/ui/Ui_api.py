@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/api.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_Dialog(object):
+    def setupUi(self, Dialog):
+        Dialog.setObjectName("Dialog")
+        Dialog.resize(400, 300)
+        self.gridLayout = QtWidgets.QGridLayout(Dialog)
+        self.gridLayout.setObjectName("gridLayout")
+        self.label_3 = QtWidgets.QLabel(Dialog)
+        self.label_3.setAlignment(QtCore.Qt.AlignCenter)
+        self.label_3.setObjectName("label_3")
+        self.gridLayout.addWidget(self.label_3, 0, 0, 1, 2)
+        self.label_2 = QtWidgets.QLabel(Dialog)
+        self.label_2.setObjectName("label_2")
+        self.gridLayout.addWidget(self.label_2, 2, 0, 1, 1)
+        self.label = QtWidgets.QLabel(Dialog)
+        self.label.setObjectName("label")
+        self.gridLayout.addWidget(self.label, 1, 0, 1, 1)
+        spacerItem = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.gridLayout.addItem(spacerItem, 3, 1, 1, 1)
+        self.userEdit = QtWidgets.QLineEdit(Dialog)
+        self.userEdit.setObjectName("userEdit")
+        self.gridLayout.addWidget(self.userEdit, 1, 1, 1, 1)
+        self.passEdit = QtWidgets.QLineEdit(Dialog)
+        self.passEdit.setText("")
+        self.passEdit.setEchoMode(QtWidgets.QLineEdit.Password)
+        self.passEdit.setObjectName("passEdit")
+        self.gridLayout.addWidget(self.passEdit, 2, 1, 1, 1)
+        self.frame = QtWidgets.QFrame(Dialog)
+        self.frame.setFrameShape(QtWidgets.QFrame.NoFrame)
+        self.frame.setFrameShadow(QtWidgets.QFrame.Raised)
+        self.frame.setObjectName("frame")
+        self.horizontalLayout = QtWidgets.QHBoxLayout(self.frame)
+        self.horizontalLayout.setObjectName("horizontalLayout")
+        self.okBut = QtWidgets.QPushButton(self.frame)
+        self.okBut.setObjectName("okBut")
+        self.horizontalLayout.addWidget(self.okBut)
+        self.cancelBut = QtWidgets.QPushButton(self.frame)
+        self.cancelBut.setObjectName("cancelBut")
+        self.horizontalLayout.addWidget(self.cancelBut)
+        self.gridLayout.addWidget(self.frame, 4, 0, 1, 2)
+
+        self.retranslateUi(Dialog)
+        QtCore.QMetaObject.connectSlotsByName(Dialog)
+
+    def retranslateUi(self, Dialog):
+        _translate = QtCore.QCoreApplication.translate
+        Dialog.setWindowTitle(_translate("Dialog", "Dialog"))
+        self.label_3.setText(_translate("Dialog", "RobinHood Access"))
+        self.label_2.setText(_translate("Dialog", "Password:"))
+        self.label.setText(_translate("Dialog", "UserName:"))
+        self.okBut.setText(_translate("Dialog", "Ok"))
+        self.cancelBut.setText(_translate("Dialog", "Cancel"))
+
+
+UI_HASH = 'bd61b62afcb1d5e27b7c666c44879031760352f2'
@@ -0,0 +1,78 @@
+'''
+The forms of the windows, compiled ahead of time into ui/Ui_<name>.py
+
+Parsing a .ui file and generating its class takes longer than the rest of the
+startup put together, so the forms are compiled once, after any change to them:
+    $ python -m ui
+
+Each compiled module keeps the hash of the .ui it came from. If it's missing or the
+.ui changed since, the form is built from the .ui at runtime like before.
+'''
+import hashlib, importlib, logging, os
+from PyQt5 import uic
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+FORMS = ('KStock', 'addtick', 'InitTest', 'api')
+
+_forms = {}
+
+
+def _path(name):
+    return os.path.join(DIR, name + '.ui')
+
+
+def _hash(name):
+    with open(_path(name), 'rb') as fileIn:
+        return hashlib.sha1(fileIn.read()).hexdigest()
+
+
+def formClass(name):
+    '''
+    Gets the class generated for a form, imported the first time it's needed
+
+    Args:
+        name (str): form, the name of its .ui file in ui/
+
+    Returns:
+        (type): the Ui_ class, its setupUi() builds the form on a widget
+    '''
+    form = _forms.get(name)
+    if form is None:
+        try:
+            module = importlib.import_module('ui.Ui_' + name)
+            if module.UI_HASH != _hash(name):
+                raise ImportError('ui/Ui_{}.py is out of date'.format(name))
+            form = next(value for key, value in vars(module).items() if key.startswith('Ui_'))
+        except (ImportError, AttributeError) as e:
+            logging.warning('{}, loading ui/{}.ui instead'.format(e, name))
+            form = uic.loadUiType(_path(name))[0]
+        _forms[name] = form
+    return form
+
+
+def setupUi(widget, name):
+    '''
+    Builds a form on a widget that's already there, so a dialog only loads its form
+    when it's first opened
+
+    Args:
+        widget (QWidget): widget of the same class the form was drawn on
+        name (str): form, the name of its .ui file in ui/
+
+    Returns:
+        None
+    '''
+    form = formClass(name)()
+    form.setupUi(widget)
+    #The child widgets are found on the widget itself, as with loadUiType
+    vars(widget).update(vars(form))
+
+
+def compile():
+    #Compiles every form into ui/Ui_<name>.py
+    for name in FORMS:
+        target = os.path.join(DIR, 'Ui_' + name + '.py')
+        with open(os.path.relpath(_path(name)), 'r') as fileIn, open(target, 'w') as fileOut:
+            uic.compileUi(fileIn, fileOut)
+            fileOut.write('\n\nUI_HASH = {!r}\n'.format(_hash(name)))
+        print('ui/{}.ui -> {}'.format(name, os.path.relpath(target)))